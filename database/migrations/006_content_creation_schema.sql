@@ -0,0 +1,76 @@
+-- Content Creation Service Schema Migration
+-- This migration creates tables for generated content and content templates
+
+-- Create content_templates table for reusable content templates
+CREATE TABLE IF NOT EXISTS content_templates (
+    id VARCHAR(64) PRIMARY KEY,
+    client_id UUID REFERENCES clients(id) ON DELETE CASCADE NOT NULL,
+    created_by UUID REFERENCES users(id) ON DELETE SET NULL,
+    name VARCHAR(100) NOT NULL,
+    content_type VARCHAR(20) NOT NULL CHECK (content_type IN (
+        'article', 'blog', 'social', 'email', 'report', 'summary'
+    )),
+    template_content TEXT NOT NULL,
+    variables TEXT[] NOT NULL DEFAULT '{}',
+    description TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+-- Create content_pieces table for AI-generated content
+CREATE TABLE IF NOT EXISTS content_pieces (
+    id VARCHAR(64) PRIMARY KEY,
+    client_id UUID REFERENCES clients(id) ON DELETE CASCADE NOT NULL,
+    created_by UUID REFERENCES users(id) ON DELETE SET NULL,
+    meeting_id UUID REFERENCES meetings(id) ON DELETE SET NULL,
+    template_id VARCHAR(64) REFERENCES content_templates(id) ON DELETE SET NULL,
+    title VARCHAR(200) NOT NULL,
+    content_type VARCHAR(20) NOT NULL CHECK (content_type IN (
+        'article', 'blog', 'social', 'email', 'report', 'summary'
+    )),
+    topic VARCHAR(100) NOT NULL,
+    target_audience VARCHAR(100) NOT NULL,
+    tone VARCHAR(20) NOT NULL CHECK (tone IN (
+        'professional', 'casual', 'friendly', 'formal', 'creative'
+    )),
+    length VARCHAR(10) NOT NULL CHECK (length IN ('short', 'medium', 'long')),
+    keywords TEXT[] NOT NULL DEFAULT '{}',
+    content TEXT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'draft' CHECK (status IN (
+        'draft', 'review', 'approved', 'published', 'archived'
+    )),
+    metadata JSONB,
+    version INTEGER NOT NULL DEFAULT 1,
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+-- Create indexes for the list endpoints' filters and (created_at, id) keyset order
+CREATE INDEX IF NOT EXISTS idx_content_pieces_client_created_at
+    ON content_pieces(client_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_content_pieces_client_type_status_created_at
+    ON content_pieces(client_id, content_type, status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_content_pieces_client_status_created_at
+    ON content_pieces(client_id, status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_content_pieces_meeting_id ON content_pieces(meeting_id);
+
+CREATE INDEX IF NOT EXISTS idx_content_templates_client_created_at
+    ON content_templates(client_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_content_templates_client_type_created_at
+    ON content_templates(client_id, content_type, created_at DESC, id DESC);
+
+-- Create an index for reading a transcript's segments in keyset pages
+CREATE INDEX IF NOT EXISTS idx_transcription_segments_transcription_sequence
+    ON transcription_segments(transcription_id, segment_sequence);
+
+-- Create triggers for updated_at
+CREATE TRIGGER update_content_templates_updated_at BEFORE UPDATE ON content_templates
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+CREATE TRIGGER update_content_pieces_updated_at BEFORE UPDATE ON content_pieces
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Add comments for documentation
+COMMENT ON TABLE content_templates IS 'Reusable content templates with {variable} placeholders';
+COMMENT ON TABLE content_pieces IS 'AI-generated content managed by the content creation service';
+COMMENT ON COLUMN content_pieces.version IS 'Incremented on every update of the content row';
@@ -0,0 +1,49 @@
+-- Content Creation Service RLS Policies
+-- Content piece policies are defined in 002_rls_policies.sql
+
+ALTER TABLE content_templates ENABLE ROW LEVEL SECURITY;
+
+-- Content templates policies
+CREATE POLICY "Users can view own client templates" ON content_templates
+    FOR SELECT USING (
+        EXISTS (
+            SELECT 1 FROM clients
+            WHERE id = content_templates.client_id AND user_id = auth.uid()
+        )
+    );
+
+CREATE POLICY "Users can create templates for own clients" ON content_templates
+    FOR INSERT WITH CHECK (
+        EXISTS (
+            SELECT 1 FROM clients
+            WHERE id = content_templates.client_id AND user_id = auth.uid()
+        )
+    );
+
+CREATE POLICY "Users can update own client templates" ON content_templates
+    FOR UPDATE USING (
+        EXISTS (
+            SELECT 1 FROM clients
+            WHERE id = content_templates.client_id AND user_id = auth.uid()
+        )
+    );
+
+CREATE POLICY "Users can delete own client templates" ON content_templates
+    FOR DELETE USING (
+        EXISTS (
+            SELECT 1 FROM clients
+            WHERE id = content_templates.client_id AND user_id = auth.uid()
+        )
+    );
+
+CREATE POLICY "Service role can manage content templates" ON content_templates
+    FOR ALL USING (auth.role() = 'service_role');
+
+CREATE POLICY "Service role can manage content pieces" ON content_pieces
+    FOR ALL USING (auth.role() = 'service_role');
+
+-- Grant permissions
+GRANT SELECT, INSERT, UPDATE, DELETE ON content_templates TO authenticated;
+GRANT SELECT, INSERT, UPDATE, DELETE ON content_pieces TO authenticated;
+GRANT ALL ON content_templates TO service_role;
+GRANT ALL ON content_pieces TO service_role;
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+Load benchmark suite for the Content Creation Service.
+
+Drives the service with a fake LLM provider of configurable latency, either
+in-process through httpx's ASGI transport or over HTTP against real uvicorn
+workers, and reports throughput, p50/p95/p99 latency and memory for each
+scenario:
+
+    single_create    POST /content, one generation per request
+    batch_create     POST /content/batch
+    list_pagination  GET /content, walking cursor pages over seeded rows
+    template_render  POST /templates/{id}/render, bulk mail-merge
+
+Results are written as JSON, named after the current commit, so runs can be
+compared between commits. Run from services/content-creation:
+
+    python benchmarks/load_benchmark.py --mode asgi
+    python benchmarks/load_benchmark.py --mode uvicorn --workers 4
+    python benchmarks/load_benchmark.py --baseline benchmarks/results/<old>.json
+
+With several uvicorn workers each process has its own in-memory store, so the
+list and render scenarios need DATABASE_URL and are skipped without it. With
+DATABASE_URL set, the benchmark user and client rows the requests refer to
+are created first. A batch with any failed item stops the run, so a
+misconfigured database cannot leave the scenarios measuring empty results.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - only needed for uvicorn memory
+    psutil = None
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCHMARKS_DIR, "..", "src")
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, "results")
+
+SCENARIOS = ("single_create", "batch_create", "list_pagination", "template_render")
+HEADERS = {"Authorization": "Bearer benchmark"}
+# Content rows reference real clients and users when backed by Postgres
+CLIENT_ID = "6f1c2b9e-0b8a-4a53-9d2e-5b0c8e7a1d42"
+USER_ID = "00000000-0000-4000-8000-000000000123"  # The service's mock user
+
+
+def content_request(index: int, length: str = "medium") -> Dict[str, Any]:
+    return {
+        "title": f"Benchmark article {index}",
+        "content_type": "article",
+        "topic": f"Capacity planning topic {index}",
+        "target_audience": "engineering managers",
+        "tone": "professional",
+        "length": length,
+        "keywords": ["capacity", "latency"],
+        "client_id": CLIENT_ID,
+    }
+
+
+def service_environment(args: argparse.Namespace) -> Dict[str, str]:
+    """Settings that make the service generate with the fake provider, unthrottled"""
+    return {
+        "LLM_PROVIDER": "fake",
+        "LLM_FAKE_LATENCY_MS": str(args.llm_latency_ms),
+        "LLM_FAKE_TOKENS_PER_SECOND": str(args.llm_tokens_per_second),
+        "LLM_MAX_CONCURRENCY": str(args.generation_concurrency),
+        "GENERATION_MAX_CONCURRENCY": str(args.generation_concurrency),
+        "GENERATION_QUEUE_SIZE": "100000",
+        "GENERATION_RATE_PER_CLIENT": "1000000",
+        "GENERATION_BURST_PER_CLIENT": "1000000",
+        "CONTENT_BATCH_MAX_ITEMS": str(max(100, args.batch_size)),
+    }
+
+
+def database_url() -> Optional[str]:
+    return os.getenv("DATABASE_URL") or os.getenv("CONTENT_CREATION_DATABASE_URL")
+
+
+async def seed_client(url: str) -> None:
+    """Create the benchmark's user and client rows unless they exist"""
+    import asyncpg
+
+    connection = await asyncpg.connect(url)
+    try:
+        await connection.execute(
+            """
+            INSERT INTO users (id, email, password_hash, full_name, company_name,
+                               industry, company_size)
+            VALUES ($1, 'benchmark@example.com', '', 'Benchmark', 'Benchmark',
+                    'technology', '1-10')
+            ON CONFLICT (id) DO NOTHING
+            """,
+            USER_ID,
+        )
+        await connection.execute(
+            """
+            INSERT INTO clients (id, user_id, name, contact_email, industry,
+                                 company_size, primary_goals, budget, timeline)
+            VALUES ($1, $2, 'Benchmark client', 'benchmark@example.com',
+                    'technology', '1-10', ARRAY['benchmark'], 'under_5k',
+                    'immediate')
+            ON CONFLICT (id) DO NOTHING
+            """,
+            CLIENT_ID,
+            USER_ID,
+        )
+    finally:
+        await connection.close()
+
+
+def check_batch(response: httpx.Response) -> httpx.Response:
+    """Stop the run when a batch request or any of its items failed"""
+    response.raise_for_status()
+    body = response.json()
+    if body["failed"]:
+        errors = {
+            result["error"] for result in body["results"] if not result["success"]
+        }
+        raise RuntimeError(
+            f"{body['failed']} of {len(body['results'])} batch items failed: "
+            + "; ".join(sorted(errors))
+        )
+    return response
+
+
+def current_commit() -> str:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=BENCHMARKS_DIR,
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def self_rss_mb() -> float:
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def tree_rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of a server process and all its workers"""
+    if psutil is None:
+        return None
+    process = psutil.Process(pid)
+    processes = [process] + process.children(recursive=True)
+    return sum(p.memory_info().rss for p in processes) / 1024 / 1024
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(
+        len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1)
+    )
+    return sorted_values[index]
+
+
+async def run_load(
+    name: str,
+    requests: int,
+    concurrency: int,
+    operation: Callable[[int], Awaitable[httpx.Response]],
+    memory_mb: Callable[[], Optional[float]],
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(index: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await operation(index)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    memory_before = memory_mb()
+    started = time.perf_counter()
+    await asyncio.gather(*(timed(index) for index in range(requests)))
+    elapsed = time.perf_counter() - started
+    memory_after = memory_mb()
+
+    latencies.sort()
+    result = {
+        "scenario": name,
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+        "memory_before_mb": round(memory_before, 1) if memory_before else None,
+        "memory_after_mb": round(memory_after, 1) if memory_after else None,
+    }
+    print(
+        f"{name:<16} {result['throughput_rps']:>9.1f} req/s  "
+        f"p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+        f"p99 {result['p99_ms']:>8.2f} ms  errors {errors}"
+        + (f"  rss {result['memory_after_mb']} MB" if memory_after else "")
+    )
+    return result
+
+
+async def run_scenarios(
+    client: httpx.AsyncClient,
+    args: argparse.Namespace,
+    memory_mb: Callable[[], Optional[float]],
+    shared_store: bool,
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    started = int(time.time() * 1000)
+
+    async def post_batch(index: int) -> httpx.Response:
+        response = await client.post(
+            "/content/batch",
+            json={
+                "items": [
+                    content_request(offset + index * args.batch_size + item)
+                    for item in range(args.batch_size)
+                ]
+            },
+        )
+        return check_batch(response)
+
+    for number, scenario in enumerate(args.scenarios):
+        # Unique topics per scenario and run, so no request hits the generation cache
+        offset = started + number * 100_000_000
+        if scenario in ("list_pagination", "template_render") and not shared_store:
+            print(f"{scenario:<16} skipped: workers do not share an in-memory store")
+            results.append({"scenario": scenario, "skipped": "no shared store"})
+            continue
+
+        if scenario == "single_create":
+            result = await run_load(
+                scenario,
+                args.requests,
+                args.concurrency,
+                lambda index: client.post(
+                    "/content", json=content_request(offset + index)
+                ),
+                memory_mb,
+            )
+
+        elif scenario == "batch_create":
+            result = await run_load(
+                scenario,
+                max(1, args.requests // args.batch_size),
+                args.concurrency,
+                post_batch,
+                memory_mb,
+            )
+            result["items_per_request"] = args.batch_size
+
+        elif scenario == "list_pagination":
+            cursors = await seed_and_walk(client, args, offset)
+            result = await run_load(
+                scenario,
+                args.requests,
+                args.concurrency,
+                lambda index: client.get(
+                    "/content",
+                    params={
+                        "client_id": CLIENT_ID,
+                        "pagination": "cursor",
+                        "limit": args.page_size,
+                        **(
+                            {"cursor": cursors[index % len(cursors)]}
+                            if cursors[index % len(cursors)]
+                            else {}
+                        ),
+                    },
+                ),
+                memory_mb,
+            )
+            result["page_size"] = args.page_size
+            result["pages"] = len(cursors)
+
+        else:
+            template = await client.post(
+                "/templates",
+                json={
+                    "name": "Benchmark email",
+                    "content_type": "email",
+                    "template_content": "Hi {first_name}, your {plan} plan renews on "
+                    "{renewal_date}. " * 20,
+                    "variables": ["first_name", "plan", "renewal_date"],
+                    "client_id": CLIENT_ID,
+                },
+            )
+            template.raise_for_status()
+            template_id = template.json()["id"]
+            items = [
+                {"first_name": f"User {i}", "plan": "Pro", "renewal_date": "2025-01-01"}
+                for i in range(args.render_items)
+            ]
+            result = await run_load(
+                scenario,
+                args.requests,
+                args.concurrency,
+                lambda index: client.post(
+                    f"/templates/{template_id}/render", json={"items": items}
+                ),
+                memory_mb,
+            )
+            result["items_per_request"] = args.render_items
+
+        results.append(result)
+    return results
+
+
+async def seed_and_walk(
+    client: httpx.AsyncClient, args: argparse.Namespace, offset: int
+) -> List[Optional[str]]:
+    """Seed rows for listing and collect the cursor of every page"""
+    for start in range(0, args.seed_rows, 100):
+        response = await client.post(
+            "/content/batch",
+            json={
+                "items": [
+                    content_request(offset + start + item, "short")
+                    for item in range(min(100, args.seed_rows - start))
+                ]
+            },
+        )
+        check_batch(response)
+
+    cursors: List[Optional[str]] = [None]
+    while True:
+        params = {
+            "client_id": CLIENT_ID,
+            "pagination": "cursor",
+            "limit": args.page_size,
+        }
+        if cursors[-1]:
+            params["cursor"] = cursors[-1]
+        page = (await client.get("/content", params=params)).json()
+        if not page["next_cursor"]:
+            return cursors
+        cursors.append(page["next_cursor"])
+
+
+async def run_asgi(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    os.environ.update(service_environment(args))
+    url = database_url()
+    if url:
+        await seed_client(url)
+    sys.path.insert(0, SRC_DIR)
+    import index
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark", headers=HEADERS, timeout=None
+    ) as client:
+        results = await run_scenarios(client, args, self_rss_mb, shared_store=True)
+    await index.close_llm_provider()
+    return results
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_uvicorn(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    port = free_port()
+    env = {**os.environ, **service_environment(args)}
+    url = database_url()
+    if url:
+        await seed_client(url)
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "index:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(args.workers),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        cwd=SRC_DIR,
+        env=env,
+        stderr=None if args.verbose else subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+    try:
+        async with httpx.AsyncClient(
+            base_url=base_url, headers=HEADERS, timeout=None, limits=limits
+        ) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise RuntimeError("uvicorn did not start")
+                await asyncio.sleep(0.2)
+
+            return await run_scenarios(
+                client,
+                args,
+                lambda: tree_rss_mb(server.pid),
+                shared_store=args.workers == 1 or bool(url),
+            )
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def compare(results: Dict[str, Any], baseline_path: str) -> None:
+    with open(baseline_path) as baseline_file:
+        baseline = {
+            result["scenario"]: result
+            for result in json.load(baseline_file)["results"]
+            if "skipped" not in result
+        }
+
+    print(f"\nCompared with {baseline_path}")
+    for result in results["results"]:
+        before = baseline.get(result["scenario"])
+        if before is None or "skipped" in result:
+            continue
+        throughput = result["throughput_rps"] / before["throughput_rps"] - 1
+        p95 = result["p95_ms"] / before["p95_ms"] - 1
+        print(
+            f"{result['scenario']:<16} throughput {throughput:+7.1%}  "
+            f"p95 {p95:+7.1%}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--seed-rows", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--render-items", type=int, default=100)
+    parser.add_argument("--llm-latency-ms", type=float, default=50)
+    parser.add_argument("--llm-tokens-per-second", type=float, default=20000)
+    parser.add_argument("--generation-concurrency", type=int, default=64)
+    parser.add_argument("--verbose", action="store_true", help="Show service logs")
+    parser.add_argument("--output", help="Results file, by default named after HEAD")
+    parser.add_argument("--baseline", help="Earlier results file to compare with")
+    args = parser.parse_args()
+
+    commit = current_commit()
+    print(
+        f"Commit {commit}, {args.mode} mode"
+        + (f" with {args.workers} workers" if args.mode == "uvicorn" else "")
+        + f", fake LLM {args.llm_latency_ms} ms + "
+        f"{args.llm_tokens_per_second} tokens/s\n"
+    )
+    runner = run_asgi if args.mode == "asgi" else run_uvicorn
+    results = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "mode": args.mode,
+        "workers": args.workers if args.mode == "uvicorn" else None,
+        "python": sys.version.split()[0],
+        "settings": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("output", "baseline", "scenarios", "verbose")
+        },
+        "results": asyncio.run(runner(args)),
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}-{args.mode}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for the Content Creation Service list endpoints.
+
+Compares encoding a page of content rows through FastAPI's response_model
+path (a model per row, validation, dump and stdlib JSON) with the trusted
+orjson path the list endpoints use, and checks both produce the same bytes.
+
+Run from services/content-creation:
+
+    python benchmarks/serialization_benchmark.py --rows 500 --content-kb 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from index import ContentResponse  # noqa: E402
+from serialization import encode_json, project_rows  # noqa: E402
+
+
+def make_rows(count: int, content_kb: int) -> List[Dict[str, Any]]:
+    now = datetime.now(timezone.utc)
+    body = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 18)[:1024]
+    return [
+        {
+            "id": f"content_{index:08d}",
+            "client_id": "8f14e45f-ceea-4671-9a1b-5e7a5b6c1e2d",
+            "created_by": "c9f0f895-fb98-4b91-9f5e-1a3c2d4e5f60",
+            "meeting_id": None,
+            "template_id": None,
+            "title": f"Benchmark article {index}",
+            "content_type": "article",
+            "topic": "AI in Business",
+            "target_audience": "business professionals",
+            "tone": "professional",
+            "length": "long",
+            "keywords": ["AI", "business"],
+            "content": body * content_kb,
+            "status": "published",
+            "metadata": {"source": "benchmark", "score": 0.87},
+            "version": 1,
+            "created_at": now - timedelta(seconds=index),
+            "updated_at": now - timedelta(seconds=index),
+        }
+        for index in range(count)
+    ]
+
+
+def measure(fn: Callable[[], bytes], iterations: int) -> Dict[str, float]:
+    fn()  # warm up
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return {
+        "mean_ms": round(statistics.mean(timings) * 1000, 3),
+        "p50_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--content-kb", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, args.content_kb)
+    field = create_response_field(name="Response", type_=List[ContentResponse])
+    loop = asyncio.new_event_loop()
+
+    def legacy() -> bytes:
+        content = loop.run_until_complete(
+            serialize_response(
+                field=field, response_content=[ContentResponse(**row) for row in rows]
+            )
+        )
+        return JSONResponse(content).body
+
+    def trusted() -> bytes:
+        return encode_json(project_rows(rows, ContentResponse))
+
+    if legacy() != trusted():
+        print("Trusted serialization is not byte-compatible with response_model")
+        return 1
+
+    results = {
+        "rows": args.rows,
+        "content_kb": args.content_kb,
+        "payload_bytes": len(trusted()),
+        "response_model": measure(legacy, args.iterations),
+        "trusted_orjson": measure(trusted, args.iterations),
+    }
+    results["speedup"] = round(
+        results["response_model"]["mean_ms"] / results["trusted_orjson"]["mean_ms"], 1
+    )
+    loop.close()
+
+    print(
+        f"{args.rows} rows x {args.content_kb} KB, "
+        f"{results['payload_bytes'] / 1024 / 1024:.1f} MB per page\n"
+        f"response_model  {results['response_model']['mean_ms']:>9.2f} ms\n"
+        f"trusted_orjson  {results['trusted_orjson']['mean_ms']:>9.2f} ms\n"
+        f"speedup         {results['speedup']:>9.1f}x"
+    )
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump({"serialization": results}, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
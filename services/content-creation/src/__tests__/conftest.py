@@ -0,0 +1,46 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import index  # noqa: E402
+from cache import ContentCache, InMemoryCache  # noqa: E402
+from db import CachedContentStore, InMemoryContentStore  # noqa: E402
+from scheduler import create_generation_scheduler  # noqa: E402
+from transcripts import create_transcript_compressor  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clear_generation_cache():
+    """Start every test with an empty generation cache"""
+    asyncio.run(index.generation_cache.clear())
+    yield
+
+
+@pytest.fixture(autouse=True)
+def generation_scheduler(monkeypatch):
+    """Give every test fresh rate limits and an idle generation queue"""
+    scheduler = create_generation_scheduler()
+    monkeypatch.setattr(index, "generation_scheduler", scheduler)
+    return scheduler
+
+
+@pytest.fixture(autouse=True)
+def content_store(monkeypatch):
+    """Give every test an empty in-memory content store and read cache"""
+    store = CachedContentStore(InMemoryContentStore(), ContentCache(InMemoryCache()))
+    monkeypatch.setattr(index, "content_store", store)
+    monkeypatch.setattr(index, "content_cache", store.cache)
+    return store
+
+
+@pytest.fixture(autouse=True)
+def transcript_compressor(monkeypatch):
+    """Give every test an empty compressed transcript cache"""
+    compressor = create_transcript_compressor()
+    monkeypatch.setattr(index, "transcript_compressor", compressor)
+    return compressor
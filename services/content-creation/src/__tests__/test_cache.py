@@ -0,0 +1,231 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cache  # noqa: E402
+from cache import GenerationCache, InMemoryCache  # noqa: E402
+from index import ContentRequest  # noqa: E402
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for a redis.asyncio client"""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        await asyncio.sleep(0)  # A round trip lets other tasks run
+        return self.values.get(key)
+
+    async def set(self, key, value, px=None, nx=False):
+        await asyncio.sleep(0)
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        self.ttls[key] = px
+        return True
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    async def scan_iter(self, match):
+        for key in list(self.values):
+            if key.startswith(match.rstrip("*")):
+                yield key
+
+
+def make_request(**overrides):
+    """Build a content request with sensible defaults"""
+    fields = {
+        "title": "Test Article",
+        "content_type": "article",
+        "topic": "AI in Business",
+        "target_audience": "business professionals",
+        "tone": "professional",
+        "length": "medium",
+        "keywords": ["AI", "business", "automation"],
+        "client_id": "client-123",
+    }
+    fields.update(overrides)
+    return ContentRequest(**fields)
+
+
+class TestInMemoryCache:
+    """Test cases for the in-memory LRU cache"""
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry is evicted when full"""
+        cache = InMemoryCache(max_entries=2)
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.get("a")
+        await cache.set("c", 3)
+
+        assert await cache.get("a") == 1
+        assert await cache.get("b") is None
+        assert await cache.get("c") == 3
+
+    @pytest.mark.asyncio
+    async def test_expires_entries_after_ttl(self):
+        """Test entries are dropped once their TTL has passed"""
+        cache = InMemoryCache(max_entries=10, default_ttl=60)
+        with patch("cache.time.monotonic", return_value=1000.0):
+            await cache.set("a", 1)
+        with patch("cache.time.monotonic", return_value=1059.0):
+            assert await cache.get("a") == 1
+        with patch("cache.time.monotonic", return_value=1061.0):
+            assert await cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestGenerationCache:
+    """Test cases for generation cache keys and counters"""
+
+    def test_key_ignores_keyword_order(self):
+        """Test keyword order does not change the cache key"""
+        first = make_request(keywords=["AI", "business"])
+        second = make_request(keywords=["business", "AI"])
+        assert GenerationCache.key_for(first) == GenerationCache.key_for(second)
+
+    def test_key_ignores_non_prompt_fields(self):
+        """Test client and metadata do not change the cache key"""
+        first = make_request(client_id="client-1", metadata={"a": 1})
+        second = make_request(client_id="client-2", bypass_cache=True)
+        assert GenerationCache.key_for(first) == GenerationCache.key_for(second)
+
+    def test_key_changes_with_prompt_fields(self):
+        """Test prompt-relevant fields change the cache key"""
+        first = make_request(tone="professional")
+        second = make_request(tone="casual")
+        assert GenerationCache.key_for(first) != GenerationCache.key_for(second)
+
+    @pytest.mark.asyncio
+    async def test_counts_hits_and_misses(self):
+        """Test lookups update the hit and miss counters"""
+        generation_cache = GenerationCache(InMemoryCache())
+        await generation_cache.get("key")
+        await generation_cache.set("key", "content")
+        assert await generation_cache.get("key") == "content"
+        assert generation_cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+class TestRedisCache:
+    """Test cases for the shared Redis-compatible backend"""
+
+    @pytest.mark.asyncio
+    async def test_round_trips_json_with_ttl(self):
+        """Test values are stored as JSON under the prefix with a TTL"""
+        client = FakeRedis()
+        backend = cache.RedisCache(client, prefix="test:", default_ttl=30)
+
+        await backend.set("key", {"title": "Hello"})
+
+        assert client.values == {"test:key": '{"title":"Hello"}'}
+        assert client.ttls == {"test:key": 30000}
+        assert await backend.get("key") == {"title": "Hello"}
+
+        await backend.delete("key")
+        assert await backend.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_set_if_absent(self):
+        """Test only the first of two claims on a key stores its value"""
+        for backend in (cache.RedisCache(FakeRedis()), InMemoryCache()):
+            assert await backend.set_if_absent("key", "first", 10)
+            assert not await backend.set_if_absent("key", "second", 10)
+            assert await backend.get("key") == "first"
+
+    @pytest.mark.asyncio
+    async def test_caches_sharing_a_server_clear_separately(self, monkeypatch):
+        """Test clearing one configured cache leaves the others' keys"""
+        shared = FakeRedis()
+        monkeypatch.setattr(cache, "create_redis_client", lambda url: shared)
+        monkeypatch.setenv("CONTENT_CACHE_BACKEND", "redis")
+        monkeypatch.setenv("CONTENT_READ_CACHE_BACKEND", "redis")
+        generation_cache = cache.create_generation_cache()
+        content_cache = cache.create_content_cache()
+        await generation_cache.set("generation:1", "content")
+        await content_cache.invalidate("content_1")
+
+        await generation_cache.clear()
+
+        assert list(shared.values) == [
+            "content-creation:content:content-write:content_1"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_clear_only_removes_prefixed_keys(self):
+        """Test clear leaves keys outside the cache's prefix"""
+        client = FakeRedis()
+        client.values["other:key"] = "1"
+        backend = cache.RedisCache(client, prefix="test:")
+        await backend.set("a", 1)
+        await backend.set("b", 2)
+
+        await backend.clear()
+
+        assert client.values == {"other:key": "1"}
+
+
+class TestContentCache:
+    """Test cases for the content read cache"""
+
+    @pytest.mark.asyncio
+    async def test_round_trips_timestamps_through_json_backend(self):
+        """Test rows come back with datetimes from a JSON backend"""
+        content_cache = cache.ContentCache(cache.RedisCache(FakeRedis()))
+        created_at = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+        row = {"id": "content_1", "created_at": created_at, "updated_at": created_at}
+
+        await content_cache.fill(
+            "content_1", row, await content_cache.write_token("content_1")
+        )
+
+        assert await content_cache.get("content_1") == row
+        assert content_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_read_started_before_a_write_does_not_fill(self):
+        """Test a stale read racing an update cannot repopulate the cache"""
+        content_cache = cache.ContentCache(InMemoryCache())
+        token = await content_cache.write_token("content_1")
+
+        await content_cache.invalidate("content_1")
+        await content_cache.fill("content_1", {"id": "content_1"}, token)
+
+        assert await content_cache.get("content_1") is None
+
+    @pytest.mark.asyncio
+    async def test_write_in_another_worker_prevents_fill(self):
+        """Test workers sharing a backend see each other's writes"""
+        shared = FakeRedis()
+        reader = cache.ContentCache(cache.RedisCache(shared))
+        writer = cache.ContentCache(cache.RedisCache(shared))
+        token = await reader.write_token("content_1")
+
+        await writer.invalidate("content_1")
+        await reader.fill("content_1", {"id": "content_1", "version": 1}, token)
+        assert await reader.get("content_1") is None
+
+        token = await reader.write_token("content_1")
+        await reader.fill("content_1", {"id": "content_1", "version": 2}, token)
+        assert await writer.get("content_1") == {"id": "content_1", "version": 2}
+
+    def test_backend_from_environment(self, monkeypatch):
+        """Test the read cache backend is chosen through the environment"""
+        monkeypatch.setenv("CONTENT_READ_CACHE_BACKEND", "none")
+        assert isinstance(cache.create_content_cache().backend, cache.NullCache)
+
+        monkeypatch.setenv("CONTENT_READ_CACHE_BACKEND", "memcached")
+        with pytest.raises(ValueError):
+            cache.create_content_cache()
@@ -1,3 +1,4 @@
+import json
 import os
 import sys
 from datetime import datetime
@@ -384,3 +385,221 @@ class TestContentCreation:
         assert response.status_code == 500
         data = response.json()
         assert data["detail"] == "Failed to create content"
+
+
+class TestBatchContentCreation:
+    """Test cases for batch content creation endpoint"""
+
+    @pytest.fixture
+    def sample_batch_request(self):
+        """Sample batch request data"""
+        return {
+            "items": [
+                {
+                    "title": f"Test Post {index}",
+                    "content_type": "social",
+                    "topic": "AI in Business",
+                    "target_audience": "business professionals",
+                    "tone": "casual",
+                    "length": "short",
+                    "client_id": "client-123",
+                }
+                for index in range(3)
+            ]
+        }
+
+    @patch("index.generate_ai_content")
+    @patch("index.save_content_batch")
+    def test_create_batch_success(self, mock_save, mock_generate, sample_batch_request):
+        """Test successful batch creation saves all items in one call"""
+        mock_generate.return_value = "Generated post"
+        mock_save.return_value = ["content_1", "content_2", "content_3"]
+
+        response = client.post("/content/batch", json=sample_batch_request)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["succeeded"] == 3
+        assert data["failed"] == 0
+        assert [result["index"] for result in data["results"]] == [0, 1, 2]
+        assert data["results"][1]["content"]["id"] == "content_2"
+        assert data["results"][1]["content"]["title"] == "Test Post 1"
+
+        assert mock_generate.call_count == 3
+        mock_save.assert_called_once()
+        assert len(mock_save.call_args[0][0]) == 3
+
+    @patch("index.generate_ai_content")
+    @patch("index.save_content_batch")
+    def test_create_batch_partial_failure(
+        self, mock_save, mock_generate, sample_batch_request
+    ):
+        """Test batch creation reports per-item generation failures"""
+        mock_generate.side_effect = [
+            "Generated post",
+            Exception("AI service unavailable"),
+            "Generated post",
+        ]
+        mock_save.return_value = ["content_1", "content_3"]
+
+        response = client.post("/content/batch", json=sample_batch_request)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["succeeded"] == 2
+        assert data["failed"] == 1
+        assert data["results"][1]["success"] is False
+        assert data["results"][1]["error"] == "Failed to generate content"
+        assert data["results"][2]["content"]["id"] == "content_3"
+
+    @patch("index.generate_ai_content")
+    @patch("index.save_content_batch")
+    def test_create_batch_save_error(
+        self, mock_save, mock_generate, sample_batch_request
+    ):
+        """Test batch creation when the bulk save fails"""
+        mock_generate.return_value = "Generated post"
+        mock_save.side_effect = Exception("Database error")
+
+        response = client.post("/content/batch", json=sample_batch_request)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["failed"] == 3
+        assert all(
+            result["error"] == "Failed to save content" for result in data["results"]
+        )
+
+    def test_create_batch_empty(self):
+        """Test batch creation rejects an empty batch"""
+        response = client.post("/content/batch", json={"items": []})
+        assert response.status_code == 422  # Validation error
+
+
+def parse_sse_events(body: str):
+    """Parse a server-sent event stream into (event, data) pairs"""
+    events = []
+    for frame in body.strip().split("\n\n"):
+        event, data = None, []
+        for line in frame.split("\n"):
+            if line.startswith("event: "):
+                event = line[len("event: ") :]
+            elif line.startswith("data: "):
+                data.append(line[len("data: ") :])
+        events.append((event, json.loads("\n".join(data))))
+    return events
+
+
+class TestContentStreaming:
+    """Test cases for streaming content creation endpoint"""
+
+    @pytest.fixture
+    def sample_content_request(self):
+        """Sample content request data"""
+        return {
+            "title": "Test Article",
+            "content_type": "article",
+            "topic": "AI in Business",
+            "target_audience": "business professionals",
+            "tone": "professional",
+            "length": "long",
+            "client_id": "client-123",
+        }
+
+    @patch("index.stream_ai_content")
+    @patch("index.save_content")
+    def test_stream_content_success(
+        self, mock_save, mock_stream, sample_content_request
+    ):
+        """Test streamed chunks are followed by the persisted content"""
+
+        async def fake_stream(content_request, current_user):
+            for chunk in ["# Test Article\n", "Body text\n"]:
+                yield chunk
+
+        mock_stream.side_effect = fake_stream
+        mock_save.return_value = "content_123"
+
+        response = client.post("/content/stream", json=sample_content_request)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_sse_events(response.text)
+        assert events[0] == ("chunk", {"text": "# Test Article\n"})
+        assert events[1] == ("chunk", {"text": "Body text\n"})
+        event, data = events[-1]
+        assert event == "done"
+        assert data["id"] == "content_123"
+        assert data["content"] == "# Test Article\nBody text"
+        mock_save.assert_called_once()
+
+    @patch("index.stream_ai_content")
+    @patch("index.save_content")
+    def test_stream_content_generation_error(
+        self, mock_save, mock_stream, sample_content_request
+    ):
+        """Test streaming reports generation failures as an error event"""
+
+        async def failing_stream(content_request, current_user):
+            yield "partial"
+            raise Exception("AI service unavailable")
+
+        mock_stream.side_effect = failing_stream
+
+        response = client.post("/content/stream", json=sample_content_request)
+
+        events = parse_sse_events(response.text)
+        assert events[-1] == ("error", {"detail": "Failed to create content"})
+        mock_save.assert_not_called()
+
+
+class TestGenerationCaching:
+    """Test cases for generation cache use in content endpoints"""
+
+    @pytest.fixture
+    def sample_content_request(self):
+        """Sample content request data"""
+        return {
+            "title": "Test Article",
+            "content_type": "article",
+            "topic": "AI in Business",
+            "target_audience": "business professionals",
+            "tone": "professional",
+            "length": "medium",
+            "keywords": ["AI", "business"],
+            "client_id": "client-123",
+        }
+
+    @patch("index.generate_ai_content")
+    @patch("index.save_content")
+    def test_repeated_request_served_from_cache(
+        self, mock_save, mock_generate, sample_content_request
+    ):
+        """Test identical requests only generate content once"""
+        mock_generate.return_value = "Generated article content"
+        mock_save.return_value = "content_123"
+
+        first = client.post("/content", json=sample_content_request)
+        sample_content_request["keywords"] = ["business", "AI"]
+        second = client.post("/content", json=sample_content_request)
+
+        assert first.status_code == second.status_code == 201
+        assert second.json()["content"] == "Generated article content"
+        mock_generate.assert_called_once()
+        assert mock_save.call_count == 2
+
+    @patch("index.generate_ai_content")
+    @patch("index.save_content")
+    def test_bypass_cache_regenerates(
+        self, mock_save, mock_generate, sample_content_request
+    ):
+        """Test bypass_cache skips the cached result"""
+        mock_generate.side_effect = ["First version", "Second version"]
+        mock_save.return_value = "content_123"
+
+        client.post("/content", json=sample_content_request)
+        sample_content_request["bypass_cache"] = True
+        response = client.post("/content", json=sample_content_request)
+
+        assert response.json()["content"] == "Second version"
+        assert mock_generate.call_count == 2
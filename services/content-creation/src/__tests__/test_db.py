@@ -0,0 +1,311 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import asyncpg
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+from db import DatabaseConfig, InMemoryContentStore  # noqa: E402
+from index import app, get_current_user  # noqa: E402
+
+
+async def override_get_current_user():
+    """Override authentication for testing"""
+    return {"id": "user-123", "email": "test@example.com", "role": "user"}
+
+
+app.dependency_overrides[get_current_user] = override_get_current_user
+
+client = TestClient(app)
+
+
+def make_row(index, **overrides):
+    """Build a content row created index seconds ago"""
+    created_at = datetime.now(timezone.utc) - timedelta(seconds=index)
+    row = {
+        "id": f"content_{index}",
+        "client_id": "client-123",
+        "created_by": "user-123",
+        "meeting_id": None,
+        "template_id": None,
+        "title": f"Article {index}",
+        "content_type": "article",
+        "topic": "AI in Business",
+        "target_audience": "business professionals",
+        "tone": "professional",
+        "length": "medium",
+        "keywords": [],
+        "content": "Generated content",
+        "status": "draft",
+        "metadata": None,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+    row.update(overrides)
+    return row
+
+
+class TestInMemoryContentStore:
+    """Test cases for the in-memory content store"""
+
+    @pytest.mark.asyncio
+    async def test_list_filters_and_orders_newest_first(self):
+        """Test listing filters by client, type and status"""
+        store = InMemoryContentStore()
+        await store.insert_contents(
+            [
+                make_row(0),
+                make_row(1, status="published"),
+                make_row(2),
+                make_row(3, client_id="client-456"),
+                make_row(4, content_type="email"),
+            ]
+        )
+
+        rows = await store.list_content("client-123", "article", "draft", 10, 0)
+        assert [row["id"] for row in rows] == ["content_0", "content_2"]
+
+        page = await store.list_content("client-123", None, None, 2, 1)
+        assert [row["id"] for row in page] == ["content_1", "content_2"]
+
+    @pytest.mark.asyncio
+    async def test_update_bumps_version(self):
+        """Test updates apply allowed fields and bump the version"""
+        store = InMemoryContentStore()
+        await store.insert_content(make_row(0))
+
+        row = await store.update_content(
+            "content_0", {"status": "review", "client_id": "client-456"}
+        )
+
+        assert row["status"] == "review"
+        assert row["client_id"] == "client-123"
+        assert row["version"] == 2
+        assert await store.update_content("missing", {"status": "review"}) is None
+
+    @pytest.mark.asyncio
+    async def test_update_of_an_older_version_changes_nothing(self):
+        """Test a conditional update only applies to the expected version"""
+        store = InMemoryContentStore()
+        await store.insert_content(make_row(0))
+        await store.update_content("content_0", {"content": "Edited"})
+
+        stale = await store.update_content(
+            "content_0", {"content": "Regenerated"}, expected_version=1
+        )
+        current = await store.update_content(
+            "content_0", {"status": "review"}, expected_version=2
+        )
+
+        assert stale is None
+        assert current["content"] == "Edited"
+        assert current["version"] == 3
+
+
+class FailingPool:
+    """Stands in for an asyncpg pool whose statements raise an error"""
+
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+
+    async def execute(self, *args):
+        self.calls += 1
+        raise self.error
+
+    async def fetch(self, *args):
+        self.calls += 1
+        raise self.error
+
+
+class TestPostgresReferences:
+    """Test cases for foreign keys the database cannot accept"""
+
+    def make_store(self, error):
+        store = db.PostgresContentStore(DatabaseConfig(url="postgresql://test"))
+        store._pool = FailingPool(error)
+        return store
+
+    @pytest.mark.asyncio
+    async def test_bad_references_are_invalid_reference_errors(self):
+        """Test unknown and malformed ids are reported, not database failures"""
+        template = {"id": "template_1", "client_id": "client-123"}
+        for error in (
+            asyncpg.ForeignKeyViolationError("violates foreign key constraint"),
+            asyncpg.DataError("invalid input for query argument $2"),
+        ):
+            with pytest.raises(db.InvalidReferenceError):
+                await self.make_store(error).insert_template(template)
+
+    @pytest.mark.asyncio
+    async def test_lists_for_non_uuid_client_are_empty(self):
+        """Test a client id that cannot exist finds no rows without a query"""
+        store = self.make_store(asyncpg.DataError("invalid input"))
+
+        assert await store.list_content("client-123", None, None, 10) == []
+        assert await store.list_templates("client-123", None) == []
+        assert store._pool.calls == 0
+
+
+class TestDatabaseConfig:
+    """Test cases for database configuration"""
+
+    def test_in_memory_without_database_url(self, monkeypatch):
+        """Test the in-memory store is used when no database is configured"""
+        monkeypatch.delenv("DATABASE_URL", raising=False)
+        monkeypatch.delenv("CONTENT_CREATION_DATABASE_URL", raising=False)
+        assert isinstance(db.create_content_store(), InMemoryContentStore)
+
+    def test_pool_settings_from_environment(self, monkeypatch):
+        """Test pool sizing is read from the environment"""
+        monkeypatch.setenv("DATABASE_URL", "postgresql://localhost/qylon")
+        monkeypatch.setenv("DB_POOL_MIN_SIZE", "4")
+        monkeypatch.setenv("DB_POOL_MAX_SIZE", "40")
+        monkeypatch.setenv("DB_STATEMENT_CACHE_SIZE", "0")
+
+        config = DatabaseConfig.from_env()
+
+        assert config.min_pool_size == 4
+        assert config.max_pool_size == 40
+        assert config.statement_cache_size == 0
+        assert isinstance(db.create_content_store(), db.PostgresContentStore)
+
+
+class TestPersistenceEndpoints:
+    """Test cases for endpoints backed by the content store"""
+
+    @patch("index.generate_ai_content")
+    def test_created_content_can_be_read_and_updated(self, mock_generate):
+        """Test content round-trips through create, get, update and list"""
+        mock_generate.return_value = "Generated article content"
+
+        created = client.post(
+            "/content",
+            json={
+                "title": "Test Article",
+                "content_type": "article",
+                "topic": "AI in Business",
+                "target_audience": "business professionals",
+                "tone": "professional",
+                "length": "medium",
+                "client_id": "client-123",
+            },
+        ).json()
+
+        fetched = client.get(f"/content/{created['id']}")
+        assert fetched.status_code == 200
+        assert fetched.json()["content"] == "Generated article content"
+
+        updated = client.put(f"/content/{created['id']}", json={"status": "review"})
+        assert updated.json()["status"] == "review"
+
+        listed = client.get("/content?client_id=client-123&status=review").json()
+        assert [item["id"] for item in listed] == [created["id"]]
+
+    @patch("index.generate_ai_content")
+    def test_rapid_creations_get_distinct_ids(self, mock_generate):
+        """Test content created by one user in the same second does not collide"""
+        mock_generate.side_effect = lambda request, user: f"Content on {request.topic}"
+
+        created = [
+            client.post(
+                "/content",
+                json={
+                    "title": "Test Article",
+                    "content_type": "article",
+                    "topic": f"Topic {index}",
+                    "target_audience": "business professionals",
+                    "tone": "professional",
+                    "length": "medium",
+                    "client_id": "client-123",
+                },
+            ).json()["id"]
+            for index in range(5)
+        ]
+
+        assert len(set(created)) == 5
+        listed = client.get("/content?client_id=client-123").json()
+        assert [item["id"] for item in listed] == created[::-1]
+
+    @patch("index.generate_ai_content")
+    def test_reads_are_cached_until_updated(self, mock_generate, content_store):
+        """Test repeated reads hit the cache and updates invalidate it"""
+        mock_generate.return_value = "Generated article content"
+        created = client.post(
+            "/content",
+            json={
+                "title": "Test Article",
+                "content_type": "article",
+                "topic": "AI in Business",
+                "target_audience": "business professionals",
+                "tone": "professional",
+                "length": "medium",
+                "client_id": "client-123",
+            },
+        ).json()
+
+        with patch.object(
+            content_store.store,
+            "get_content",
+            wraps=content_store.store.get_content,
+        ) as store_get:
+            for _ in range(3):
+                assert client.get(f"/content/{created['id']}").status_code == 200
+            assert store_get.call_count == 1
+
+            client.put(f"/content/{created['id']}", json={"status": "published"})
+            fetched = client.get(f"/content/{created['id']}").json()
+
+            assert fetched["status"] == "published"
+            assert store_get.call_count == 2
+
+    @patch("index.generate_ai_content")
+    def test_invalid_reference_is_rejected(self, mock_generate, content_store):
+        """Test an unknown client or meeting returns 422 instead of 500"""
+        mock_generate.return_value = "Generated content"
+        error = db.InvalidReferenceError("violates foreign key constraint")
+
+        with patch.object(content_store.store, "insert_content", side_effect=error):
+            response = client.post(
+                "/content",
+                json={
+                    "title": "Test Article",
+                    "content_type": "article",
+                    "topic": "AI in Business",
+                    "target_audience": "business professionals",
+                    "tone": "professional",
+                    "length": "short",
+                    "client_id": "client-123",
+                },
+            )
+
+        assert response.status_code == 422
+        assert "foreign key" not in response.json()["detail"]
+
+    def test_created_template_can_be_listed_and_rendered(self):
+        """Test templates round-trip through create, list and render"""
+        created = client.post(
+            "/templates",
+            json={
+                "name": "Welcome Email",
+                "content_type": "email",
+                "template_content": "Hello {first_name}!",
+                "variables": ["first_name"],
+                "client_id": "client-123",
+            },
+        ).json()
+
+        listed = client.get("/templates?client_id=client-123").json()
+        assert [template["id"] for template in listed] == [created["id"]]
+
+        rendered = client.post(
+            f"/templates/{created['id']}/render",
+            json={"variables": {"first_name": "Ada"}},
+        )
+        assert rendered.json()["content"] == "Hello Ada!"
@@ -0,0 +1,185 @@
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import index  # noqa: E402
+from deadlines import DeadlineMiddleware, finish_before_cancel  # noqa: E402
+from index import app, get_current_user  # noqa: E402
+from metrics import Counter  # noqa: E402
+from singleflight import SingleFlight  # noqa: E402
+
+
+async def override_get_current_user():
+    """Override authentication for testing"""
+    return {"id": "user-123", "email": "test@example.com", "role": "user"}
+
+
+app.dependency_overrides[get_current_user] = override_get_current_user
+
+client = TestClient(app)
+
+CONTENT_REQUEST = {
+    "title": "Test Article",
+    "content_type": "article",
+    "topic": "AI in Business",
+    "target_audience": "business professionals",
+    "tone": "professional",
+    "length": "short",
+    "client_id": "client-123",
+}
+
+
+def make_scope(method="POST", path="/content", headers=()):
+    return {"type": "http", "method": method, "path": path, "headers": list(headers)}
+
+
+def make_middleware(app=None, **kwargs):
+    return DeadlineMiddleware(
+        app, Counter("cancelled", "Cancelled", ("reason",)), **kwargs
+    )
+
+
+class TestTimeouts:
+    """Test cases for choosing a request's deadline"""
+
+    def test_route_default_and_fallback(self):
+        """Test route defaults win over the service-wide default"""
+        middleware = make_middleware(
+            default_timeout=30,
+            route_timeouts="POST /content/batch=300,GET /content/{content_id}=0",
+        )
+
+        assert middleware.timeout_for(make_scope(path="/content/batch")) == 300
+        assert middleware.timeout_for(make_scope(path="/content")) == 30
+        assert middleware.timeout_for(make_scope("GET", "/content/content_1")) is None
+
+    def test_header_is_capped(self):
+        """Test X-Request-Timeout sets the deadline, up to the ceiling"""
+        middleware = make_middleware(default_timeout=30, max_timeout=60)
+
+        def timeout(value):
+            return middleware.timeout_for(
+                make_scope(headers=[(b"x-request-timeout", value)])
+            )
+
+        assert timeout(b"2.5") == 2.5
+        assert timeout(b"3600") == 60
+        assert timeout(b"soon") == 30
+        assert timeout(b"-1") == 30
+
+
+class TestCancellation:
+    """Test cases for cancelling requests"""
+
+    @patch("index.generate_ai_content")
+    def test_deadline_returns_504_and_saves_nothing(self, mock_generate, content_store):
+        """Test a generation past the deadline is cancelled before any write"""
+        generation_cancelled = asyncio.Event()
+
+        async def slow_generation(request, user):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                generation_cancelled.set()
+                raise
+
+        mock_generate.side_effect = slow_generation
+        cancelled_before = index.REQUESTS_CANCELLED.value("deadline")
+
+        response = client.post(
+            "/content", json=CONTENT_REQUEST, headers={"X-Request-Timeout": "0.1"}
+        )
+
+        assert response.status_code == 504
+        assert generation_cancelled.is_set()
+        assert index.REQUESTS_CANCELLED.value("deadline") == cancelled_before + 1
+        assert index.REQUEST_SECONDS.count("POST", "/content", "504") >= 1
+        assert len(index.generation_flights) == 0
+        assert index.generation_scheduler.running == 0
+        assert content_store.store._content == {}
+
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_handler(self):
+        """Test the handler is cancelled as soon as the client goes away"""
+        handler_cancelled = asyncio.Event()
+        disconnect = asyncio.Event()
+        sent = []
+
+        async def app(scope, receive, send):
+            await receive()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                handler_cancelled.set()
+                raise
+
+        messages = [{"type": "http.request", "body": b"{}", "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        middleware = make_middleware(app, default_timeout=30)
+        call = asyncio.ensure_future(middleware(make_scope(), receive, send))
+        await asyncio.sleep(0.01)
+        disconnect.set()
+        await asyncio.wait_for(call, 1)
+
+        assert handler_cancelled.is_set()
+        assert middleware.counter.value("disconnect") == 1
+        assert sent[0]["status"] == 499
+
+    @pytest.mark.asyncio
+    async def test_write_finishes_before_cancellation(self):
+        """Test cancelling the caller lets an in-progress write complete"""
+        written = []
+
+        async def write():
+            await asyncio.sleep(0.05)
+            written.append("row")
+
+        caller = asyncio.ensure_future(finish_before_cancel(write()))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        assert written == ["row"]
+
+    @pytest.mark.asyncio
+    async def test_last_caller_leaving_cancels_shared_call(self):
+        """Test a coalesced call is cancelled once every caller is cancelled"""
+        flights = SingleFlight()
+        call_cancelled = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                call_cancelled.set()
+                raise
+
+        callers = [asyncio.ensure_future(flights.do("key", work)) for _ in range(2)]
+        await asyncio.sleep(0)
+        callers[0].cancel()
+        await asyncio.sleep(0)
+        assert not call_cancelled.is_set()
+
+        callers[1].cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert call_cancelled.is_set()
+        assert len(flights) == 0
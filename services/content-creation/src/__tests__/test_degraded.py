@@ -0,0 +1,192 @@
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import index  # noqa: E402
+from degraded import DegradationPolicy  # noqa: E402
+from index import app, get_current_user  # noqa: E402
+from llm import FakeProvider  # noqa: E402
+
+
+async def override_get_current_user():
+    """Override authentication for testing"""
+    return {"id": "user-123", "email": "test@example.com", "role": "user"}
+
+
+app.dependency_overrides[get_current_user] = override_get_current_user
+
+client = TestClient(app)
+
+CONTENT_REQUEST = {
+    "title": "Test Article",
+    "content_type": "article",
+    "topic": "AI in Business",
+    "target_audience": "business professionals",
+    "tone": "professional",
+    "length": "short",
+    "client_id": "client-123",
+    "allow_degraded": True,
+}
+
+
+class Backlog:
+    """Queue depth the tests can raise and clear"""
+
+    depth = 0
+
+    def __call__(self):
+        return self.depth
+
+
+@pytest.fixture
+def backlog():
+    """Put the service in degraded mode through a deep generation queue"""
+    backlog = Backlog()
+    backlog.depth = 10
+    policy = DegradationPolicy(backlog, lambda: None, max_queue_depth=5)
+    with patch("index.degradation_policy", policy), patch(
+        "index.DEGRADED_UPGRADE_RETRY_SECONDS", 0.01
+    ):
+        yield backlog
+
+
+class TestDegradationPolicy:
+    """Test cases for deciding when to degrade"""
+
+    def test_reasons(self):
+        """Test open circuits, deep queues and slow calls each degrade"""
+        backlog = Backlog()
+        provider = FakeProvider()
+        policy = DegradationPolicy(
+            backlog, lambda: provider, max_queue_depth=5, max_latency=1
+        )
+        assert policy.reason() is None
+
+        provider.call_latency.observe(2)
+        assert policy.reason() == "latency"
+
+        backlog.depth = 5
+        assert policy.reason() == "queue_depth"
+
+        provider.circuit.opened_at = time.monotonic()
+        assert policy.reason() == "circuit_open"
+
+    def test_old_latency_is_ignored(self):
+        """Test a slow call long ago does not keep the service degraded"""
+        provider = FakeProvider()
+        provider.call_latency.max_age = 0
+        provider.call_latency.observe(60)
+        policy = DegradationPolicy(Backlog(), lambda: provider, max_latency=1)
+
+        assert policy.reason() is None
+
+
+class TestDegradedContent:
+    """Test cases for fallback content under overload"""
+
+    @patch("index.generate_ai_content")
+    def test_opted_in_request_gets_flagged_draft(self, mock_generate, backlog):
+        """Test drafts are served without generating and flagged in metadata"""
+        response = client.post("/content", json=CONTENT_REQUEST)
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["metadata"] == {"degraded": True, "degraded_reason": "queue_depth"}
+        assert "# Test Article" in data["content"]
+        mock_generate.assert_not_called()
+
+    @patch("index.generate_ai_content")
+    def test_requests_must_opt_in(self, mock_generate, backlog):
+        """Test requests without allow_degraded are generated as usual"""
+        mock_generate.return_value = "Generated content"
+
+        response = client.post(
+            "/content", json={**CONTENT_REQUEST, "allow_degraded": False}
+        )
+
+        assert response.json()["content"] == "Generated content"
+        assert response.json()["metadata"] is None
+
+    @patch("index.generate_ai_content")
+    def test_draft_is_upgraded_after_recovery(self, mock_generate, backlog):
+        """Test the background upgrade replaces the draft once healthy"""
+        mock_generate.return_value = "Generated content"
+
+        with TestClient(app) as live_client:
+            created = live_client.post("/content", json=CONTENT_REQUEST).json()
+            # Reading the draft caches it; the upgrade must invalidate that
+            live_client.get(f"/content/{created['id']}")
+            backlog.depth = 0
+
+            for _ in range(100):
+                current = live_client.get(f"/content/{created['id']}").json()
+                if current["content"] == "Generated content":
+                    break
+                time.sleep(0.01)
+
+        assert current["content"] == "Generated content"
+        assert current["metadata"]["degraded"] is False
+        assert index.DEGRADED_UPGRADES.value("upgraded") >= 1
+
+    @pytest.mark.asyncio
+    async def test_edit_racing_the_upgrade_is_kept(self, content_store):
+        """Test an edit landing after the last check is not overwritten"""
+        user = {"id": "user-123"}
+        content_request = index.ContentRequest(**CONTENT_REQUEST)
+        draft = index.build_fallback_content(content_request)
+        content_id = await index.save_content(content_request, draft, user)
+        skipped = index.DEGRADED_UPGRADES.value("skipped")
+        reads = 0
+        get_content = content_store.get_content
+
+        async def get_then_edit(requested_id):
+            nonlocal reads
+            reads += 1
+            row = await get_content(requested_id)
+            if reads == 2:
+                await content_store.store.update_content(
+                    requested_id, {"content": "Edited by hand"}
+                )
+            return row
+
+        healthy = DegradationPolicy(lambda: 0, lambda: None)
+        with patch("index.degradation_policy", healthy), patch(
+            "index.generate_content", return_value="Generated content"
+        ), patch.object(content_store, "get_content", get_then_edit):
+            await index.upgrade_degraded_content(
+                content_id, content_request, draft, user
+            )
+
+        row = await content_store.get_content(content_id)
+        assert row["content"] == "Edited by hand"
+        assert index.DEGRADED_UPGRADES.value("skipped") == skipped + 1
+
+    @patch("index.generate_ai_content")
+    def test_edited_draft_is_not_overwritten(self, mock_generate, backlog):
+        """Test a draft edited before recovery keeps the edit"""
+        mock_generate.return_value = "Generated content"
+        skipped = index.DEGRADED_UPGRADES.value("skipped")
+
+        with TestClient(app) as live_client:
+            created = live_client.post("/content", json=CONTENT_REQUEST).json()
+            live_client.put(
+                f"/content/{created['id']}", json={"content": "Edited by hand"}
+            )
+            backlog.depth = 0
+
+            for _ in range(100):
+                if index.DEGRADED_UPGRADES.value("skipped") > skipped:
+                    break
+                time.sleep(0.01)
+            current = live_client.get(f"/content/{created['id']}").json()
+
+        assert index.DEGRADED_UPGRADES.value("skipped") == skipped + 1
+        assert current["content"] == "Edited by hand"
+        mock_generate.assert_not_called()
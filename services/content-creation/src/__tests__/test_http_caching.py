@@ -0,0 +1,160 @@
+import asyncio
+import gzip
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_caching  # noqa: E402
+from index import app, get_current_user  # noqa: E402
+from test_db import make_row  # noqa: E402
+
+
+async def override_get_current_user():
+    """Override authentication for testing"""
+    return {"id": "user-123", "email": "test@example.com", "role": "user"}
+
+
+app.dependency_overrides[get_current_user] = override_get_current_user
+
+client = TestClient(app)
+
+
+class TestNegotiation:
+    """Test cases for Accept-Encoding and If-None-Match parsing"""
+
+    @pytest.mark.parametrize(
+        "accept_encoding, expected",
+        [
+            ("gzip, deflate", "gzip"),
+            ("br;q=0.5, gzip;q=0.8", "gzip"),
+            ("br, gzip", "br"),
+            ("*", "br"),
+            ("gzip;q=0, identity", None),
+            ("", None),
+        ],
+    )
+    def test_negotiate_encoding(self, accept_encoding, expected):
+        """Test the highest-weighted supported encoding wins"""
+        chosen = http_caching.negotiate_encoding(accept_encoding, ("br", "gzip"))
+        assert chosen == expected
+
+    def test_etag_matching(self):
+        """Test tags match across weak prefixes, lists and encodings"""
+        etag = http_caching.compute_etag(b"body")
+
+        assert http_caching.etag_matches(etag, etag)
+        assert http_caching.etag_matches(f'"other", W/{etag}', etag)
+        assert http_caching.etag_matches(f'{etag[:-1]}-gzip"', etag)
+        assert http_caching.etag_matches("*", etag)
+        assert not http_caching.etag_matches('"other"', etag)
+
+
+class TestConditionalRequests:
+    """Test cases for ETags and 304 responses on the read endpoints"""
+
+    def test_get_content_not_modified(self, content_store):
+        """Test a matching If-None-Match returns 304 until the content changes"""
+        asyncio.run(content_store.insert_content(make_row(0)))
+
+        first = client.get("/content/content_0")
+        etag = first.headers["etag"]
+        assert first.status_code == 200
+
+        cached = client.get("/content/content_0", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        client.put("/content/content_0", json={"status": "published"})
+        changed = client.get("/content/content_0", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+    def test_list_endpoints_are_tagged(self, content_store):
+        """Test list responses carry ETags and honour If-None-Match"""
+        asyncio.run(content_store.insert_content(make_row(0)))
+
+        for path in ("/content?client_id=client-123", "/templates?client_id=c"):
+            etag = client.get(path).headers["etag"]
+            response = client.get(path, headers={"If-None-Match": etag})
+            assert response.status_code == 304
+
+    def test_errors_are_not_tagged(self):
+        """Test non-200 responses get no ETag"""
+        response = client.get("/content/missing")
+
+        assert response.status_code == 404
+        assert "etag" not in response.headers
+
+
+class TestCompression:
+    """Test cases for negotiated response compression"""
+
+    def test_large_response_is_gzipped(self, content_store):
+        """Test bodies above the threshold are compressed for gzip clients"""
+        asyncio.run(
+            content_store.insert_content(make_row(0, content="Lorem ipsum " * 500))
+        )
+
+        response = client.get("/content/content_0", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert response.headers["etag"].endswith('-gzip"')
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert response.json()["content"] == "Lorem ipsum " * 500
+
+    def test_small_or_unaccepted_responses_are_not_compressed(self, content_store):
+        """Test small bodies and identity-only clients get plain responses"""
+        asyncio.run(
+            content_store.insert_content(make_row(0, content="Lorem ipsum " * 500))
+        )
+
+        small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        identity = client.get(
+            "/content/content_0", headers={"Accept-Encoding": "identity"}
+        )
+
+        assert "content-encoding" not in small.headers
+        assert "content-encoding" not in identity.headers
+        assert "accept-encoding" in identity.headers["vary"].lower()
+        assert "vary" not in small.headers
+
+    @patch("index.stream_ai_content")
+    def test_streaming_responses_pass_through(self, mock_stream):
+        """Test server-sent events are neither buffered nor compressed"""
+
+        async def chunks(content_request, current_user):
+            for _ in range(200):
+                yield "Lorem ipsum dolor sit amet. "
+
+        mock_stream.side_effect = chunks
+
+        response = client.post(
+            "/content/stream",
+            headers={"Accept-Encoding": "gzip"},
+            json={
+                "title": "Test Article",
+                "content_type": "article",
+                "topic": "AI in Business",
+                "target_audience": "business professionals",
+                "tone": "professional",
+                "length": "medium",
+                "client_id": "client-123",
+            },
+        )
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert "event: done" in response.text
+
+    def test_gzip_body_round_trips(self):
+        """Test the gzip encoder produces standard gzip data"""
+        body = b"x" * 4096
+        assert gzip.decompress(http_caching.compress(body, "gzip", 6, 4)) == body
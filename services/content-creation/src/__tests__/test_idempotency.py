@@ -0,0 +1,261 @@
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cache  # noqa: E402
+import idempotency  # noqa: E402
+from cache import InMemoryCache  # noqa: E402
+from index import app, get_current_user  # noqa: E402
+from test_cache import FakeRedis  # noqa: E402
+
+
+async def override_get_current_user():
+    """Override authentication for testing"""
+    return {"id": "user-123", "email": "test@example.com", "role": "user"}
+
+
+app.dependency_overrides[get_current_user] = override_get_current_user
+
+client = TestClient(app)
+
+CONTENT_REQUEST = {
+    "title": "Test Article",
+    "content_type": "article",
+    "topic": "AI in Business",
+    "target_audience": "business professionals",
+    "tone": "professional",
+    "length": "short",
+    "client_id": "client-123",
+    "bypass_cache": True,
+}
+
+
+@pytest.fixture(autouse=True)
+def idempotency_store():
+    """Give every test an empty idempotency store"""
+    store = idempotency.IdempotencyStore(InMemoryCache(), poll_interval=0.01)
+    with patch("index.idempotency_store", store):
+        yield store
+
+
+class TestIdempotencyStore:
+    """Test cases for running requests once per key"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_retry_waits_for_original(self, idempotency_store):
+        """Test a retry arriving mid-request shares the original response"""
+        calls = 0
+
+        async def create():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"id": "content_1"}
+
+        results = await asyncio.gather(
+            *(idempotency_store.run("key", "fp", create) for _ in range(3))
+        )
+
+        assert calls == 1
+        assert [replayed for _, replayed in results] == [False, True, True]
+        assert all(body == {"id": "content_1"} for body, _ in results)
+
+    @pytest.mark.asyncio
+    async def test_waits_on_other_worker(self, idempotency_store):
+        """Test an in-progress marker left by another worker is waited on"""
+        lock_key = idempotency_store.lock_key_for("key")
+        await idempotency_store.locks.set(
+            lock_key, {"state": "in_progress", "fingerprint": "fp"}
+        )
+
+        async def finish_elsewhere():
+            await asyncio.sleep(0.03)
+            await idempotency_store.backend.set(
+                "key",
+                {"state": "completed", "fingerprint": "fp", "response": {"id": "c"}},
+            )
+            await idempotency_store.locks.delete(lock_key)
+
+        async def create():
+            raise AssertionError("the request must not run twice")
+
+        finisher = asyncio.ensure_future(finish_elsewhere())
+        body, replayed = await idempotency_store.run("key", "fp", create)
+        await finisher
+
+        assert body == {"id": "c"}
+        assert replayed
+
+    @pytest.mark.asyncio
+    async def test_workers_race_for_a_key(self):
+        """Test two workers sharing a backend run a request once between them"""
+        shared = FakeRedis()
+        workers = [
+            idempotency.IdempotencyStore(cache.RedisCache(shared), poll_interval=0.01)
+            for _ in range(2)
+        ]
+        calls = 0
+
+        async def create():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return {"id": "content_1"}
+
+        results = await asyncio.gather(
+            *(worker.run("key", "fp", create) for worker in workers)
+        )
+
+        assert calls == 1
+        assert sorted(replayed for _, replayed in results) == [False, True]
+
+    @pytest.mark.asyncio
+    async def test_failure_is_not_recorded(self, idempotency_store):
+        """Test a failed request leaves the key free for a retry"""
+
+        async def fail():
+            raise RuntimeError("provider down")
+
+        async def succeed():
+            return {"id": "content_2"}
+
+        with pytest.raises(RuntimeError):
+            await idempotency_store.run("key", "fp", fail)
+
+        assert await idempotency_store.run("key", "fp", succeed) == (
+            {"id": "content_2"},
+            False,
+        )
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request_finishes_for_its_retry(self, idempotency_store):
+        """Test a request whose client went away still completes for the retry"""
+        calls = 0
+
+        async def create():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return {"id": "content_4"}
+
+        abandoned = asyncio.ensure_future(idempotency_store.run("key", "fp", create))
+        await asyncio.sleep(0.01)
+        abandoned.cancel()
+        await asyncio.sleep(0)
+
+        body, replayed = await idempotency_store.run("key", "fp", create)
+
+        assert abandoned.cancelled()
+        assert calls == 1
+        assert body == {"id": "content_4"}
+        assert replayed
+
+    @pytest.mark.asyncio
+    async def test_completed_records_do_not_evict_markers(self, monkeypatch):
+        """Test a full record cache cannot free the key of a running request"""
+        monkeypatch.setenv("IDEMPOTENCY_MAX_ENTRIES", "1")
+        store = idempotency.create_idempotency_store()
+        store.poll_interval = 0.01
+        calls = 0
+
+        async def slow():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.03)
+            return {"id": "content_5"}
+
+        async def quick():
+            return {"id": "content_6"}
+
+        running = asyncio.ensure_future(store.run("slow", "fp", slow))
+        await asyncio.sleep(0)
+        await store.run("quick-1", "fp", quick)
+        await store.run("quick-2", "fp", quick)
+
+        # A retry from another worker only sees the shared backends
+        other_worker = idempotency.IdempotencyStore(
+            store.backend, store.locks, poll_interval=0.01
+        )
+        body, replayed = await other_worker.run("slow", "fp", slow)
+
+        assert (await running)[0] == body == {"id": "content_5"}
+        assert replayed
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_key_reused_for_other_request(self, idempotency_store):
+        """Test a key cannot be replayed for a different request body"""
+
+        async def create():
+            return {"id": "content_3"}
+
+        await idempotency_store.run("key", "fp-1", create)
+
+        with pytest.raises(idempotency.IdempotencyConflictError):
+            await idempotency_store.run("key", "fp-2", create)
+
+
+class TestIdempotentEndpoints:
+    """Test cases for Idempotency-Key on the create endpoints"""
+
+    @patch("index.generate_ai_content")
+    def test_retried_content_request_is_replayed(self, mock_generate, content_store):
+        """Test a retry returns the original content without generating again"""
+        mock_generate.return_value = "Generated content"
+        headers = {"Idempotency-Key": "retry-1"}
+
+        first = client.post("/content", json=CONTENT_REQUEST, headers=headers)
+        retry = client.post("/content", json=CONTENT_REQUEST, headers=headers)
+
+        assert first.status_code == retry.status_code == 201
+        assert retry.json() == first.json()
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert "idempotent-replayed" not in first.headers
+        assert mock_generate.call_count == 1
+        assert len(content_store.store._content) == 1
+
+    @patch("index.generate_ai_content")
+    def test_keys_are_scoped(self, mock_generate, content_store):
+        """Test different keys, and requests without a key, run separately"""
+        mock_generate.return_value = "Generated content"
+
+        client.post("/content", json=CONTENT_REQUEST, headers={"Idempotency-Key": "a"})
+        client.post("/content", json=CONTENT_REQUEST, headers={"Idempotency-Key": "b"})
+        client.post("/content", json=CONTENT_REQUEST)
+
+        assert len(content_store.store._content) == 3
+
+    def test_changed_body_is_rejected(self):
+        """Test reusing a key for another template returns 422"""
+        template = {
+            "name": "Newsletter",
+            "content_type": "email",
+            "template_content": "Hello {{name}}",
+            "variables": ["name"],
+            "client_id": "client-123",
+        }
+        headers = {"Idempotency-Key": "template-1"}
+
+        first = client.post("/templates", json=template, headers=headers)
+        retry = client.post("/templates", json=template, headers=headers)
+        changed = client.post(
+            "/templates", json={**template, "name": "Digest"}, headers=headers
+        )
+
+        assert first.status_code == 201
+        assert retry.json()["id"] == first.json()["id"]
+        assert changed.status_code == 422
+
+    def test_invalid_key(self):
+        """Test keys with whitespace or control characters are rejected"""
+        response = client.post(
+            "/content", json=CONTENT_REQUEST, headers={"Idempotency-Key": "a b"}
+        )
+        assert response.status_code == 400
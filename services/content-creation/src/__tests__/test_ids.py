@@ -0,0 +1,122 @@
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ids  # noqa: E402
+
+
+class TestUlidGenerator:
+    """Test cases for ULID generation"""
+
+    def test_ids_are_sortable_and_unique(self):
+        """Test ids from one generator increase even within a millisecond"""
+        generator = ids.UlidGenerator()
+        with patch("ids._now_ms", return_value=1750000000000):
+            batch = generator.new_ids(1000)
+
+        assert len(set(batch)) == 1000
+        assert batch == sorted(batch)
+        assert all(len(value) == 26 for value in batch)
+
+    def test_later_millisecond_sorts_after(self):
+        """Test the time prefix orders ids across milliseconds"""
+        generator = ids.UlidGenerator()
+        with patch("ids._now_ms", return_value=1750000000001):
+            later = ids.UlidGenerator().new_id()
+        with patch("ids._now_ms", return_value=1750000000000):
+            earlier = generator.new_id()
+
+        assert earlier < later
+
+    def test_clock_stepping_back_stays_monotonic(self):
+        """Test ids keep increasing when the wall clock goes backwards"""
+        generator = ids.UlidGenerator()
+        with patch("ids._now_ms", return_value=1750000000000):
+            first = generator.new_id()
+        with patch("ids._now_ms", return_value=1699999999000):
+            second = generator.new_id()
+
+        assert first < second
+
+    def test_thread_safe(self):
+        """Test concurrent threads never receive the same id"""
+        generator = ids.UlidGenerator()
+        results = []
+
+        def worker():
+            results.extend(generator.new_ids(2000))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(results)) == 8000
+
+
+class TestSnowflakeGenerator:
+    """Test cases for snowflake id generation"""
+
+    def test_sequence_rolls_over_to_next_millisecond(self):
+        """Test an exhausted sequence waits for the next millisecond"""
+        generator = ids.SnowflakeGenerator(worker_id=7)
+        clock = iter([1750000000000] * 4097 + [1750000000001] * 10)
+        with patch("ids._now_ms", side_effect=lambda: next(clock)):
+            batch = generator.new_ids(4097)
+
+        assert len(set(batch)) == 4097
+        assert batch == sorted(batch)
+        assert (int(batch[-1]) >> 22) - (int(batch[0]) >> 22) == 1
+
+    def test_worker_id_is_embedded(self):
+        """Test different workers produce different ids at the same instant"""
+        with patch("ids._now_ms", return_value=1750000000000):
+            first = ids.SnowflakeGenerator(worker_id=1).new_id()
+            second = ids.SnowflakeGenerator(worker_id=2).new_id()
+
+        assert first != second
+        assert (int(second) >> 12) & 1023 == 2
+
+    def test_invalid_worker_id(self):
+        """Test worker ids outside 10 bits are rejected"""
+        with pytest.raises(ValueError):
+            ids.SnowflakeGenerator(worker_id=1024)
+
+
+class TestPrefixedIds:
+    """Test cases for prefixed row ids"""
+
+    def test_prefixed_many_matches_single_ids(self):
+        """Test batch ids share the single id format and ascend"""
+        generator = ids.UlidGenerator()
+
+        single = generator.prefixed("content")
+        batch = generator.prefixed_many("content", 3)
+
+        assert [len(content_id) for content_id in batch] == [len(single)] * 3
+        assert all(content_id.startswith("content_") for content_id in batch)
+        assert [single] + batch == sorted([single] + batch)
+
+
+class TestCreateIdGenerator:
+    """Test cases for configuring the id generator"""
+
+    def test_from_environment(self, monkeypatch):
+        """Test the generator is chosen through environment variables"""
+        monkeypatch.delenv("CONTENT_ID_GENERATOR", raising=False)
+        assert isinstance(ids.create_id_generator(), ids.UlidGenerator)
+
+        monkeypatch.setenv("CONTENT_ID_GENERATOR", "snowflake")
+        monkeypatch.setenv("CONTENT_ID_WORKER_ID", "12")
+        assert ids.create_id_generator().worker_id == 12
+
+        monkeypatch.setenv("CONTENT_ID_GENERATOR", "uuid")
+        with pytest.raises(ValueError):
+            ids.create_id_generator()
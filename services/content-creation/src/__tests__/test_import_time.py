@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+
+# Directory holding index.py, used as the working directory of the cold starts
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-start budget for importing the service, in milliseconds
+IMPORT_BUDGET_MS = float(os.getenv("CONTENT_IMPORT_BUDGET_MS", 2000))
+
+# Optional subsystems that must only be imported when first used
+LAZY_MODULES = (
+    "anthropic",
+    "asyncpg",
+    "httpx",
+    "numpy",
+    "openai",
+    "redis",
+    "supabase",
+    "uvicorn",
+)
+
+
+def profile_import(module="index"):
+    """Import a module in a fresh interpreter with -X importtime
+
+    Returns the module's cumulative import time in microseconds, the
+    cumulative time of every module it pulled in, and the modules loaded.
+    """
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in ("DATABASE_URL", "CONTENT_CREATION_DATABASE_URL")
+    }
+    env["LLM_PROVIDER"] = "mock"
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import sys, {module}; print(' '.join(sys.modules))",
+        ],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    pending = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        pending[name.strip()] = int(cumulative)
+        # Children are reported before their parent, so everything since the
+        # previous top-level line was imported on behalf of this one
+        if not name.startswith("  "):
+            if name.strip() == module:
+                times.update(pending)
+            pending = {}
+    return times[module], times, set(result.stdout.split())
+
+
+def format_report(times, top=15):
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:top]
+    return "\n".join(f"{us / 1000:9.1f} ms  {name}" for name, us in slowest)
+
+
+class TestColdStart:
+    """Test cases for the service's import-time budget"""
+
+    def test_import_within_budget(self):
+        """Test importing the service stays within the cold-start budget"""
+        # Best of three, so a busy machine does not fail the build on noise
+        runs = [profile_import() for _ in range(3)]
+        total, times, _ = min(runs, key=lambda run: run[0])
+
+        print(f"\nimport index: {total / 1000:.1f} ms\n{format_report(times)}")
+        assert total / 1000 <= IMPORT_BUDGET_MS, (
+            f"Importing index took {total / 1000:.1f} ms, over the "
+            f"{IMPORT_BUDGET_MS:.0f} ms budget. Slowest imports:\n"
+            f"{format_report(times)}"
+        )
+
+    def test_optional_subsystems_are_lazy(self):
+        """Test provider SDKs and optional backends are not imported at startup"""
+        _, _, modules = profile_import()
+
+        assert sorted(set(LAZY_MODULES) & modules) == []
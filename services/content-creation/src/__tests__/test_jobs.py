@@ -0,0 +1,141 @@
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jobs  # noqa: E402
+from index import app, get_current_user  # noqa: E402
+from jobs import JobQueue, QueueFullError  # noqa: E402
+
+
+async def override_get_current_user():
+    """Override authentication for testing"""
+    return {"id": "user-123", "email": "test@example.com", "role": "user"}
+
+
+app.dependency_overrides[get_current_user] = override_get_current_user
+
+
+def wait_for_job(client, status_url, timeout=5.0):
+    """Poll a job until it leaves the queued/running states"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        data = client.get(status_url).json()
+        if data["status"] in (jobs.JOB_SUCCEEDED, jobs.JOB_FAILED):
+            return data
+        time.sleep(0.01)
+    raise AssertionError("Job did not finish in time")
+
+
+class TestJobQueue:
+    """Test cases for the background job queue"""
+
+    @pytest.mark.asyncio
+    async def test_runs_jobs_in_background(self):
+        """Test submitted jobs run on the worker pool"""
+        queue = JobQueue(workers=2)
+
+        async def work():
+            return "result"
+
+        job = queue.submit("user-123", work)
+        await asyncio.sleep(0.01)
+
+        assert queue.get(job.id).status == jobs.JOB_SUCCEEDED
+        assert queue.get(job.id).result == "result"
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_rejects_jobs_when_full(self):
+        """Test submit raises once the queue is at capacity"""
+        queue = JobQueue(workers=1, max_queue_size=1)
+
+        async def work():
+            return "result"
+
+        queue.submit("user-123", work)
+        with pytest.raises(QueueFullError):
+            queue.submit("user-123", work)
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_expires_finished_jobs(self):
+        """Test finished jobs are forgotten after the result TTL"""
+        queue = JobQueue(workers=1, result_ttl=0)
+
+        async def work():
+            return "result"
+
+        job = queue.submit("user-123", work)
+        await asyncio.sleep(0.01)
+
+        assert queue.get(job.id) is None
+        await queue.stop()
+
+
+class TestContentJobEndpoints:
+    """Test cases for asynchronous content job endpoints"""
+
+    @pytest.fixture
+    def sample_content_request(self):
+        """Sample content request data"""
+        return {
+            "title": "Test Article",
+            "content_type": "article",
+            "topic": "AI in Business",
+            "target_audience": "business professionals",
+            "tone": "professional",
+            "length": "long",
+            "client_id": "client-123",
+        }
+
+    @patch("index.generate_ai_content")
+    @patch("index.save_content")
+    def test_create_job_and_poll(
+        self, mock_save, mock_generate, sample_content_request
+    ):
+        """Test job creation returns 202 and the result can be polled"""
+        mock_generate.return_value = "Generated article content"
+        mock_save.return_value = "content_123"
+
+        with TestClient(app) as client:
+            response = client.post("/content/jobs", json=sample_content_request)
+
+            assert response.status_code == 202
+            data = response.json()
+            assert data["status"] == "queued"
+            assert response.headers["location"] == data["status_url"]
+
+            job = wait_for_job(client, data["status_url"])
+
+        assert job["status"] == jobs.JOB_SUCCEEDED
+        assert job["result"]["id"] == "content_123"
+        assert job["result"]["content"] == "Generated article content"
+
+    @patch("index.generate_ai_content")
+    def test_failed_job_reports_error(self, mock_generate, sample_content_request):
+        """Test job failures are reported without leaking internals"""
+        mock_generate.side_effect = Exception("AI service unavailable")
+
+        with TestClient(app) as client:
+            response = client.post("/content/jobs", json=sample_content_request)
+            job = wait_for_job(client, response.json()["status_url"])
+
+        assert job["status"] == jobs.JOB_FAILED
+        assert job["error"] == "Failed to create content"
+        assert job["result"] is None
+
+    def test_get_unknown_job(self):
+        """Test polling an unknown job returns 404"""
+        with TestClient(app) as client:
+            response = client.get("/content/jobs/unknown")
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Job not found"
@@ -0,0 +1,311 @@
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm  # noqa: E402
+from llm import OpenAIProvider  # noqa: E402
+from llm import AnthropicProvider, FakeProvider, LLMError  # noqa: E402
+
+
+def make_client(handler):
+    """Build a pooled client that answers requests with handler"""
+    return llm.create_http_client(transport=httpx.MockTransport(handler))
+
+
+def make_openai(client, **kwargs):
+    """Build an OpenAI provider that retries without waiting"""
+    return OpenAIProvider(
+        api_key="test-key",
+        model="test-model",
+        base_url="https://llm.test/v1",
+        client=client,
+        backoff_base=0,
+        **kwargs,
+    )
+
+
+class TestFakeProvider:
+    """Test cases for the offline fake provider"""
+
+    @pytest.mark.asyncio
+    async def test_complete_respects_token_budget(self):
+        """Test completions contain max_tokens tokens"""
+        provider = FakeProvider(latency=0, tokens_per_second=100000)
+        content = await provider.complete("write about AI", max_tokens=7)
+        assert len(content.split()) == 7
+
+    @pytest.mark.asyncio
+    async def test_stream_matches_complete(self):
+        """Test streamed chunks join to the full completion"""
+        provider = FakeProvider(latency=0, tokens_per_second=100000)
+        chunks = [chunk async for chunk in provider.stream("write", max_tokens=5)]
+        assert len(chunks) == 5
+        assert "".join(chunks).strip() == await provider.complete("write", max_tokens=5)
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrency(self):
+        """Test the provider never runs more calls than its limit"""
+        provider = FakeProvider(
+            latency=0.01, tokens_per_second=100000, max_concurrency=2
+        )
+        active = peak = 0
+        original = provider._complete
+
+        async def tracked(*args):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            try:
+                return await original(*args)
+            finally:
+                active -= 1
+
+        provider._complete = tracked
+        await asyncio.gather(*(provider.complete("write") for _ in range(6)))
+        assert peak == 2
+
+
+class TestHTTPProviders:
+    """Test cases for HTTP-backed providers"""
+
+    @pytest.mark.asyncio
+    async def test_openai_retries_rate_limits(self):
+        """Test 429 responses are retried before succeeding"""
+        calls = []
+
+        def handler(request):
+            calls.append(json.loads(request.content))
+            if len(calls) < 3:
+                return httpx.Response(429, headers={"retry-after": "0"})
+            return httpx.Response(
+                200, json={"choices": [{"message": {"content": "Hello"}}]}
+            )
+
+        async with make_client(handler) as client:
+            content = await make_openai(client).complete("Say hello", max_tokens=5)
+
+        assert content == "Hello"
+        assert len(calls) == 3
+        assert calls[0]["max_tokens"] == 5
+
+    @pytest.mark.asyncio
+    async def test_openai_does_not_retry_client_errors(self):
+        """Test non-retryable errors fail immediately"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(400, json={"error": "bad request"})
+
+        async with make_client(handler) as client:
+            with pytest.raises(LLMError):
+                await make_openai(client).complete("Say hello")
+
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_openai_gives_up_after_max_retries(self):
+        """Test server errors are retried a bounded number of times"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        async with make_client(handler) as client:
+            with pytest.raises(LLMError):
+                await make_openai(client, max_retries=2).complete("Say hello")
+
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_openai_stream(self):
+        """Test streamed deltas are yielded as text chunks"""
+        events = [
+            {"choices": [{"delta": {"role": "assistant"}}]},
+            {"choices": [{"delta": {"content": "Hel"}}]},
+            {"choices": [{"delta": {"content": "lo"}}]},
+        ]
+        body = "".join(f"data: {json.dumps(event)}\n\n" for event in events)
+        body += "data: [DONE]\n\n"
+
+        def handler(request):
+            return httpx.Response(200, content=body.encode())
+
+        async with make_client(handler) as client:
+            provider = make_openai(client)
+            chunks = [chunk async for chunk in provider.stream("Say hello")]
+
+        assert chunks == ["Hel", "lo"]
+
+    @pytest.mark.asyncio
+    async def test_openai_variants_in_one_request(self):
+        """Test several completions are requested with n in a single call"""
+        calls = []
+
+        def handler(request):
+            calls.append(json.loads(request.content))
+            choices = [
+                {"index": 1, "message": {"content": "Hi"}},
+                {"index": 0, "message": {"content": "Hello"}},
+            ]
+            return httpx.Response(200, json={"choices": choices})
+
+        async with make_client(handler) as client:
+            contents = await make_openai(client).complete_many("Say hello", 2)
+
+        assert contents == ["Hello", "Hi"]
+        assert len(calls) == 1
+        assert calls[0]["n"] == 2
+
+    @pytest.mark.asyncio
+    async def test_anthropic_variants_are_separate_calls(self):
+        """Test providers without batching make one call per variant"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(
+                200, json={"content": [{"type": "text", "text": "Hello"}]}
+            )
+
+        async with make_client(handler) as client:
+            provider = AnthropicProvider(
+                api_key="test-key",
+                model="test-model",
+                base_url="https://llm.test",
+                client=client,
+            )
+            contents = await provider.complete_many("Say hello", 3)
+
+        assert contents == ["Hello"] * 3
+        assert len(calls) == 3
+
+    def test_batching_provider_must_implement_batch_call(self):
+        """Test a batching provider without its batch call cannot be built"""
+
+        class IncompleteProvider(llm.BatchingProvider):
+            async def _complete(self, prompt, max_tokens, temperature):
+                return prompt
+
+            async def _stream(self, prompt, max_tokens, temperature):
+                yield prompt
+
+        with pytest.raises(TypeError):
+            IncompleteProvider()
+
+    @pytest.mark.asyncio
+    async def test_anthropic_complete_and_stream(self):
+        """Test Anthropic responses and stream events are parsed"""
+
+        def handler(request):
+            assert request.headers["x-api-key"] == "test-key"
+            if json.loads(request.content)["stream"]:
+                event = {"type": "content_block_delta", "delta": {"text": "Hi"}}
+                return httpx.Response(200, content=f"data: {json.dumps(event)}\n\n")
+            return httpx.Response(
+                200, json={"content": [{"type": "text", "text": "Hello"}]}
+            )
+
+        async with make_client(handler) as client:
+            provider = AnthropicProvider(
+                api_key="test-key",
+                model="test-model",
+                base_url="https://llm.test",
+                client=client,
+            )
+            assert await provider.complete("Say hello") == "Hello"
+            assert [chunk async for chunk in provider.stream("Say hi")] == ["Hi"]
+
+
+class TestCircuitBreaker:
+    """Test cases for failing fast on a failing provider"""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_failures_and_fails_fast(self):
+        """Test consecutive failures open the circuit so calls skip the provider"""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(500)
+
+        provider = make_openai(make_client(handler), max_retries=0)
+        provider.circuit = llm.CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+        for _ in range(2):
+            with pytest.raises(LLMError):
+                await provider.complete("Hello")
+        with pytest.raises(llm.CircuitOpenError):
+            await provider.complete("Hello")
+
+        assert provider.circuit.is_open
+        assert len(requests) == 2
+
+    def test_half_open_trial(self):
+        """Test one trial call is let through after the reset timeout"""
+        circuit = llm.CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        circuit.record_failure()
+
+        assert circuit.allow()
+        assert not circuit.allow()
+        circuit.record_success()
+        assert circuit.allow() and circuit.allow()
+
+
+class TestProviderFactory:
+    """Test cases for provider configuration"""
+
+    def test_mock_provider_is_none(self):
+        """Test the built-in mock needs no provider"""
+        assert llm.create_llm_provider("mock") is None
+
+    def test_fake_provider_from_environment(self, monkeypatch):
+        """Test fake provider latency and rate come from the environment"""
+        monkeypatch.setenv("LLM_FAKE_LATENCY_MS", "50")
+        monkeypatch.setenv("LLM_FAKE_TOKENS_PER_SECOND", "1000")
+        provider = llm.create_llm_provider("fake")
+        assert provider.latency == 0.05
+        assert provider.tokens_per_second == 1000
+
+    def test_unknown_provider(self):
+        """Test unknown provider names are rejected"""
+        with pytest.raises(ValueError):
+            llm.create_llm_provider("unknown")
+
+
+class TestGenerationWithProvider:
+    """Test cases for generate_ai_content backed by a provider"""
+
+    @pytest.mark.asyncio
+    async def test_generate_uses_configured_provider(self):
+        """Test generation prompts the provider with a length budget"""
+        import index
+
+        content_request = index.ContentRequest(
+            title="Test Article",
+            content_type="article",
+            topic="AI in Business",
+            target_audience="business professionals",
+            tone="professional",
+            length="short",
+            client_id="client-123",
+        )
+        provider = FakeProvider(latency=0, tokens_per_second=100000)
+
+        with patch("index.get_llm_provider", return_value=provider):
+            content = await index.generate_ai_content(content_request, {})
+            chunks = [
+                chunk async for chunk in index.stream_ai_content(content_request, {})
+            ]
+
+        assert len(content.split()) == index.MAX_TOKENS_BY_LENGTH["short"]
+        assert "".join(chunks).strip() == content
@@ -0,0 +1,217 @@
+import json
+import logging
+import os
+import queue
+import sys
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logs  # noqa: E402
+from index import app, get_current_user  # noqa: E402
+from logs import JSONFormatter, NonBlockingQueueHandler  # noqa: E402
+
+
+async def override_get_current_user():
+    """Override authentication for testing"""
+    return {"id": "user-123", "email": "test@example.com", "role": "user"}
+
+
+app.dependency_overrides[get_current_user] = override_get_current_user
+
+client = TestClient(app)
+
+
+def make_record(level=logging.INFO, msg="Created %s", args=("content_1",), **extra):
+    record = logging.LogRecord("index", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def restore_logging():
+    """Put the root and server loggers back after reconfiguring them"""
+    loggers = [
+        logging.getLogger(name)
+        for name in ("", "uvicorn", "uvicorn.error", "uvicorn.access")
+    ]
+    saved = [(lg, list(lg.handlers), lg.level, lg.propagate) for lg in loggers]
+    yield
+    for logger, handlers, level, propagate in saved:
+        logger.handlers = handlers
+        logger.setLevel(level)
+        logger.propagate = propagate
+
+
+class TestJSONFormatter:
+    """Test cases for structured log lines"""
+
+    def test_formats_message_lazily_with_context(self):
+        """Test the %-arguments, request id and extra fields end up in the JSON"""
+        record = make_record(request_id="req-1", content_id="content_1")
+
+        entry = json.loads(JSONFormatter().format(record))
+
+        assert entry["message"] == "Created content_1"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "index"
+        assert entry["request_id"] == "req-1"
+        assert entry["content_id"] == "content_1"
+        assert entry["timestamp"].endswith("Z")
+
+    def test_includes_exception(self):
+        """Test tracebacks are rendered into an exception field"""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record(level=logging.ERROR)
+            record.exc_info = sys.exc_info()
+
+        entry = json.loads(JSONFormatter().format(record))
+
+        assert "ValueError: boom" in entry["exception"]
+
+
+class TestQueueHandling:
+    """Test cases for queuing records without blocking the caller"""
+
+    def test_records_are_queued_unformatted(self):
+        """Test the message is left for the listener thread to format"""
+        log_queue = queue.Queue()
+        handler = NonBlockingQueueHandler(log_queue)
+
+        handler.handle(make_record())
+
+        queued = log_queue.get_nowait()
+        assert queued.msg == "Created %s"
+        assert queued.args == ("content_1",)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test records are counted and dropped once the queue is full"""
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+
+        for _ in range(5):
+            handler.handle(make_record())
+
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+
+    def test_sampling_by_level(self):
+        """Test sampled levels are thinned while warnings always pass"""
+        sampling = logs.SamplingFilter(logs.parse_sample_rates("INFO=0, WARNING=0"))
+
+        assert not sampling.filter(make_record(logging.INFO))
+        assert sampling.filter(make_record(logging.WARNING))
+        assert sampling.filter(make_record(logging.DEBUG))
+        assert sampling.sampled_out == 1
+
+    def test_parse_sample_rates(self):
+        """Test LEVEL=rate pairs are parsed into logging levels"""
+        assert logs.parse_sample_rates("info=0.1,DEBUG=0.01") == {
+            logging.INFO: 0.1,
+            logging.DEBUG: 0.01,
+        }
+
+
+class TestStructuredMode:
+    """Test cases for the structured logging configuration"""
+
+    def test_writes_json_from_listener(self, monkeypatch, capsys, restore_logging):
+        """Test records reach stderr as JSON through the queue listener"""
+        monkeypatch.setenv("LOG_MODE", "structured")
+        setup = logs.configure_logging()
+
+        token = logs.request_id_var.set("req-42")
+        try:
+            logging.getLogger("index").info("Created %s", "content_9")
+        finally:
+            logs.request_id_var.reset(token)
+        setup.stop()
+
+        lines = [line for line in capsys.readouterr().err.splitlines() if line]
+        entry = json.loads(lines[-1])
+        assert entry["message"] == "Created content_9"
+        assert entry["request_id"] == "req-42"
+        assert setup.stats() == {"dropped": 0, "sampled_out": 0}
+
+    def test_plain_mode_sets_level_over_existing_handlers(
+        self, monkeypatch, restore_logging
+    ):
+        """Test LOG_LEVEL applies even when the root logger has handlers"""
+        monkeypatch.setenv("LOG_MODE", "plain")
+        monkeypatch.setenv("LOG_LEVEL", "debug")
+        root = logging.getLogger()
+        root.addHandler(ListHandler())
+        root.setLevel(logging.WARNING)
+
+        logs.configure_logging()
+
+        assert root.level == logging.DEBUG
+
+    def test_unknown_mode(self, monkeypatch):
+        """Test an unknown LOG_MODE is rejected"""
+        monkeypatch.setenv("LOG_MODE", "verbose")
+        with pytest.raises(ValueError):
+            logs.configure_logging()
+
+
+class TestRequestIds:
+    """Test cases for request id correlation"""
+
+    def test_generates_and_echoes_request_id(self):
+        """Test every response carries a generated request id"""
+        response = client.get("/health")
+        assert len(response.headers["x-request-id"]) == 32
+
+    def test_reuses_valid_incoming_id(self):
+        """Test a well-formed incoming X-Request-ID is kept"""
+        response = client.get("/health", headers={"X-Request-ID": "edge-1234"})
+        assert response.headers["x-request-id"] == "edge-1234"
+
+    def test_replaces_malformed_incoming_id(self):
+        """Test ids that could forge log lines are replaced"""
+        response = client.get("/health", headers={"X-Request-ID": "a b\tc"})
+        assert response.headers["x-request-id"] != "a b\tc"
+
+    @patch("index.generate_ai_content")
+    def test_request_logs_carry_request_id(self, mock_generate, caplog):
+        """Test records logged while handling a request carry its id"""
+        mock_generate.return_value = "Generated content"
+        caplog.set_level(logging.INFO, logger="index")
+        handler = ListHandler()
+        handler.addFilter(logs.RequestIdFilter())
+        index_logger = logging.getLogger("index")
+        index_logger.addHandler(handler)
+        try:
+            response = client.post(
+                "/content",
+                json={
+                    "title": "Test Article",
+                    "content_type": "article",
+                    "topic": "AI in Business",
+                    "target_audience": "business professionals",
+                    "tone": "professional",
+                    "length": "short",
+                    "client_id": "client-123",
+                },
+                headers={"X-Request-ID": "req-create-1"},
+            )
+        finally:
+            index_logger.removeHandler(handler)
+
+        assert response.status_code == 201
+        assert handler.records
+        assert {record.request_id for record in handler.records} == {"req-create-1"}
@@ -0,0 +1,164 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import longform  # noqa: E402
+from llm import FakeProvider  # noqa: E402
+from longform import LongFormGenerator  # noqa: E402
+
+REQUEST = SimpleNamespace(
+    title="Remote Work",
+    content_type="article",
+    topic="remote work",
+    target_audience="managers",
+    tone="professional",
+    keywords=["hybrid"],
+)
+
+OUTLINE = "1. Why it matters\n2. Tools\n3. Pitfalls\n4. Next steps"
+
+
+class SectionLLM:
+    """Answers the outline prompt, then writes each section after a delay"""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.active = 0
+        self.peak = 0
+        self.section_tokens = []
+
+    def section_number(self, prompt):
+        return int(prompt.split("Write only section ")[1].split(",")[0])
+
+    async def complete(self, prompt, max_tokens):
+        if prompt.startswith("Outline"):
+            return OUTLINE
+        number = self.section_number(prompt)
+        self.section_tokens.append(max_tokens)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(number, 0.01))
+            return f"Body {number}."
+        finally:
+            self.active -= 1
+
+    async def stream(self, prompt, max_tokens):
+        number = self.section_number(prompt)
+        for word in ("Body", f"{number}."):
+            await asyncio.sleep(self.delays.get(number, 0.01) / 2)
+            yield word if word == "Body" else f" {word}"
+
+
+class TestOutline:
+    """Test cases for reading the outline"""
+
+    def test_parses_numbered_and_bulleted_headings(self):
+        """Test numbering, bullets and duplicates are dropped"""
+        text = "1. Intro\n- **Tools**\n\n## Pitfalls\n2) intro\nSection 4: Wrap-up"
+
+        assert longform.parse_outline(text, 6) == [
+            "Intro",
+            "Tools",
+            "Pitfalls",
+            "Wrap-up",
+        ]
+        assert longform.parse_outline(text, 2) == ["Intro", "Tools"]
+
+    def test_falls_back_to_default_outline(self):
+        """Test an answer that is not a list of headings uses the default"""
+        outline = longform.parse_outline("A single rambling paragraph.", 6)
+        assert outline == list(longform.DEFAULT_OUTLINE)
+
+
+class TestLongFormGenerator:
+    """Test cases for outline-then-sections generation"""
+
+    @pytest.mark.asyncio
+    async def test_sections_run_concurrently_and_stay_in_order(self):
+        """Test sections are written in parallel, stitched in outline order"""
+        llm = SectionLLM(delays={1: 0.05, 2: 0.01, 3: 0.03, 4: 0.02})
+        generator = LongFormGenerator(llm.complete, llm.stream, max_concurrency=3)
+
+        content = await generator.generate(REQUEST, 2000)
+
+        assert content.startswith("# Remote Work\n\n## Why it matters\n\nBody 1.")
+        positions = [content.index(f"Body {number}.") for number in range(1, 5)]
+        assert positions == sorted(positions)
+        assert llm.peak == 3
+        assert llm.section_tokens == [500] * 4
+
+    @pytest.mark.asyncio
+    async def test_stream_matches_generate(self):
+        """Test streaming yields the same document in order"""
+        llm = SectionLLM(delays={1: 0.04, 2: 0.01})
+        generator = LongFormGenerator(llm.complete, llm.stream)
+
+        chunks = [chunk async for chunk in generator.stream(REQUEST, 2000)]
+
+        assert "".join(chunks) == await generator.generate(REQUEST, 2000)
+        assert chunks[:3] == ["# Remote Work\n\n", "## Why it matters\n\n", "Body"]
+
+    @pytest.mark.asyncio
+    async def test_section_failure_stops_stream(self):
+        """Test a failing section fails the stream and cancels the rest"""
+        llm = SectionLLM()
+        cancelled = []
+
+        async def stream(prompt, max_tokens):
+            number = llm.section_number(prompt)
+            if number == 2:
+                raise RuntimeError("provider down")
+            try:
+                await asyncio.sleep(0.01 if number == 1 else 10)
+                yield "text"
+            except asyncio.CancelledError:
+                cancelled.append(number)
+                raise
+
+        generator = LongFormGenerator(llm.complete, stream)
+
+        with pytest.raises(RuntimeError):
+            async for _ in generator.stream(REQUEST, 2000):
+                pass
+        await asyncio.sleep(0)
+
+        assert sorted(cancelled) == [3, 4]
+
+
+class TestLongFormContent:
+    """Test cases for long articles generated through a provider"""
+
+    @pytest.mark.asyncio
+    async def test_long_article_is_written_by_section(self):
+        """Test long articles use the outline, short ones a single completion"""
+        import index
+
+        provider = FakeProvider(latency=0, tokens_per_second=100000)
+        fields = dict(
+            title="Remote Work",
+            content_type="article",
+            topic="remote work",
+            target_audience="managers",
+            tone="professional",
+            client_id="client-123",
+        )
+
+        with patch("index.get_llm_provider", return_value=provider):
+            long_content = await index.generate_ai_content(
+                index.ContentRequest(length="long", **fields), {}
+            )
+            short_content = await index.generate_ai_content(
+                index.ContentRequest(length="short", **fields), {}
+            )
+
+        for heading in longform.DEFAULT_OUTLINE:
+            assert f"## {heading}" in long_content
+        assert "##" not in short_content
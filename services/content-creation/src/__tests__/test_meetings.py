@@ -0,0 +1,217 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import meetings  # noqa: E402
+from db import InMemoryContentStore  # noqa: E402
+from index import app, get_current_user  # noqa: E402
+from meetings import MeetingSummarizer, TranscriptNotFoundError  # noqa: E402
+
+MEETING_ID = "5d9b6a1e-3c2f-4e8a-9b7d-1f2e3a4b5c6d"
+
+
+async def override_get_current_user():
+    """Override authentication for testing"""
+    return {"id": "user-123", "email": "test@example.com", "role": "user"}
+
+
+app.dependency_overrides[get_current_user] = override_get_current_user
+
+client = TestClient(app)
+
+
+def make_segments(count, words=20):
+    """Transcript segments of a fixed size, ten seconds apart"""
+    return [
+        {
+            "segment_sequence": index,
+            "start_time_ms": index * 10000,
+            "end_time_ms": index * 10000 + 9000,
+            "speaker_id": f"speaker_{index % 3}",
+            "text": f"Segment {index} " + "word " * words,
+        }
+        for index in range(count)
+    ]
+
+
+class RecordingLLM:
+    """Completion function that records calls and peak concurrency"""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.prompts = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, prompt, max_tokens):
+        self.prompts.append(prompt)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            return f"summary {len(self.prompts)}"
+        finally:
+            self.active -= 1
+
+
+class TestTranscriptChunking:
+    """Test cases for packing segments into chunks"""
+
+    @pytest.mark.asyncio
+    async def test_chunks_break_between_segments(self):
+        """Test chunks stay under the size limit and keep every segment in order"""
+        segments = make_segments(50)
+
+        async def batches():
+            for start in range(0, 50, 7):
+                yield segments[start : start + 7]
+
+        chunks = [chunk async for chunk in meetings.chunk_transcript(batches(), 1000)]
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 1000 for chunk in chunks)
+        lines = "\n".join(chunks).split("\n")
+        assert lines == [meetings.format_segment(segment) for segment in segments]
+
+    def test_format_segment(self):
+        """Test segments render with a timestamp and speaker"""
+        segment = {"start_time_ms": 3723000, "speaker_id": "alice", "text": " Hi "}
+        assert meetings.format_segment(segment) == "[01:02:03] alice: Hi"
+
+
+class TestMeetingSummarizer:
+    """Test cases for map-reduce meeting summarization"""
+
+    def make_summarizer(self, segments, llm, **kwargs):
+        store = InMemoryContentStore()
+        store.add_transcript_segments(MEETING_ID, "client-123", segments)
+        return MeetingSummarizer(store, llm, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_map_runs_with_bounded_parallelism(self):
+        """Test chunks are summarized concurrently, never above the limit"""
+        llm = RecordingLLM()
+        summarizer = self.make_summarizer(
+            make_segments(40), llm, chunk_chars=500, max_concurrency=3
+        )
+
+        summaries = await summarizer.summarize(MEETING_ID, "client-123")
+
+        assert len(llm.prompts) > 3
+        assert llm.peak == 3
+        assert len(summaries) <= summarizer.reduce_fanout
+
+    @pytest.mark.asyncio
+    async def test_reduces_hierarchically(self):
+        """Test partial summaries are merged level by level down to the fanout"""
+        llm = RecordingLLM(delay=0)
+        summarizer = self.make_summarizer(
+            make_segments(20),
+            llm,
+            chunk_chars=200,
+            reduce_fanout=2,
+            segment_batch_size=3,
+        )
+
+        summaries = await summarizer.summarize(MEETING_ID, "client-123")
+
+        map_calls = [p for p in llm.prompts if p.startswith("Summarize part")]
+        merge_calls = [p for p in llm.prompts if p.startswith("Merge")]
+        assert len(map_calls) == 20
+        # 20 -> 10 -> 5 -> 3 -> 2 partial summaries; a lone leftover is
+        # carried up a level without a call
+        assert len(merge_calls) == 10 + 5 + 2 + 1
+        assert len(summaries) == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_transcript(self):
+        """Test a meeting without segments raises TranscriptNotFoundError"""
+        summarizer = self.make_summarizer([], RecordingLLM())
+
+        with pytest.raises(TranscriptNotFoundError):
+            await summarizer.summarize(MEETING_ID, "client-123")
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_outstanding_chunks(self):
+        """Test one failing chunk summary fails the whole summarization"""
+
+        async def failing(prompt, max_tokens):
+            if "part 2 " in prompt:
+                raise RuntimeError("provider down")
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        summarizer = self.make_summarizer(
+            make_segments(20), failing, chunk_chars=300, max_concurrency=2
+        )
+
+        with pytest.raises(RuntimeError):
+            await summarizer.summarize(MEETING_ID, "client-123")
+
+
+class TestMeetingContent:
+    """Test cases for generating content from a meeting"""
+
+    @pytest.fixture
+    def meeting_request(self):
+        return {
+            "title": "Weekly sync summary",
+            "content_type": "summary",
+            "topic": "Weekly sync",
+            "target_audience": "the team",
+            "tone": "professional",
+            "length": "short",
+            "client_id": "client-123",
+            "meeting_id": MEETING_ID,
+        }
+
+    def test_create_summary_from_transcript(self, content_store, meeting_request):
+        """Test summary content is written from the meeting's transcript"""
+        content_store.store.add_transcript_segments(
+            MEETING_ID,
+            "client-123",
+            [
+                {
+                    "segment_sequence": 0,
+                    "start_time_ms": 0,
+                    "end_time_ms": 4000,
+                    "speaker_id": "alice",
+                    "text": "We will ship the billing migration on Friday.",
+                }
+            ],
+        )
+
+        response = client.post("/content", json=meeting_request)
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["meeting_id"] == MEETING_ID
+        assert data["content"].startswith("Weekly sync summary")
+        assert "billing migration on Friday" in data["content"]
+
+    def test_missing_transcript_returns_404(self, meeting_request):
+        """Test a meeting without a transcript is reported as not found"""
+        response = client.post("/content", json=meeting_request)
+
+        assert response.status_code == 404
+        assert MEETING_ID in response.json()["detail"]
+
+    def test_other_clients_meeting_returns_404(self, content_store, meeting_request):
+        """Test a meeting is only summarized for the client it belongs to"""
+        content_store.store.add_transcript_segments(
+            MEETING_ID, "client-123", make_segments(3)
+        )
+        other_client = {**meeting_request, "client_id": "client-456"}
+
+        owner = client.post("/content", json=meeting_request)
+        response = client.post("/content", json=other_client)
+
+        assert owner.status_code == 201
+        assert response.status_code == 404
+        assert "Segment" not in response.text
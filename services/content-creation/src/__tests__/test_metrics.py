@@ -0,0 +1,114 @@
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import index  # noqa: E402
+import metrics  # noqa: E402
+from index import app, get_current_user  # noqa: E402
+
+
+async def override_get_current_user():
+    """Override authentication for testing"""
+    return {"id": "user-123", "email": "test@example.com", "role": "user"}
+
+
+app.dependency_overrides[get_current_user] = override_get_current_user
+
+client = TestClient(app)
+
+
+class TestMetricsRegistry:
+    """Test cases for the Prometheus text exposition"""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram samples follow the exposition format"""
+        registry = metrics.MetricsRegistry()
+        histogram = registry.histogram(
+            "latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0)
+        )
+        histogram.observe(0.05, "/a")
+        histogram.observe(0.5, "/a")
+        histogram.observe(5, "/a")
+
+        assert registry.render().splitlines() == [
+            "# HELP latency_seconds Latency",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{route="/a",le="0.1"} 1',
+            'latency_seconds_bucket{route="/a",le="1"} 2',
+            'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+            'latency_seconds_sum{route="/a"} 5.55',
+            'latency_seconds_count{route="/a"} 3',
+        ]
+
+    def test_counters_callbacks_and_escaping(self):
+        """Test counters and callback gauges render with escaped labels"""
+        registry = metrics.MetricsRegistry()
+        counter = registry.counter("events_total", "Events", ("kind",))
+        counter.inc('say "hi"\n')
+        registry.gauge_callback("depth", "Depth", lambda: 7)
+
+        lines = registry.render().splitlines()
+
+        assert 'events_total{kind="say \\"hi\\"\\n"} 1' in lines
+        assert "# TYPE depth gauge" in lines
+        assert "depth 7" in lines
+
+    def test_duplicate_names_are_rejected(self):
+        """Test two metrics cannot share a name"""
+        registry = metrics.MetricsRegistry()
+        registry.counter("events_total", "Events")
+
+        with pytest.raises(ValueError):
+            registry.counter("events_total", "Events")
+
+
+class TestMetricsEndpoint:
+    """Test cases for the /metrics endpoint"""
+
+    @patch("index.generate_ai_content")
+    def test_reports_routes_stages_and_queues(self, mock_generate):
+        """Test a scrape includes request, stage, queue and cache metrics"""
+        mock_generate.return_value = "Generated article content"
+        before = index.REQUEST_SECONDS.count("POST", "/content", "201")
+
+        client.post(
+            "/content",
+            json={
+                "title": "Test Article",
+                "content_type": "article",
+                "topic": "AI in Business",
+                "target_audience": "business professionals",
+                "tone": "professional",
+                "length": "medium",
+                "client_id": "client-123",
+            },
+        )
+        client.get("/content/missing")
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert index.REQUEST_SECONDS.count("POST", "/content", "201") == before + 1
+        assert (
+            'content_creation_http_request_duration_seconds_count{method="GET",'
+            'route="/content/{content_id}",status="404"}'
+        ) in body
+        assert 'content_creation_stage_duration_seconds_count{stage="save"}' in body
+        assert 'content_creation_queue_depth{queue="generation"} 0' in body
+        assert 'content_creation_queue_depth{queue="jobs"} 0' in body
+        assert 'content_creation_cache_misses_total{cache="content"} 1' in body
+        assert "content_creation_generations_running 0" in body
+
+    def test_unknown_paths_share_one_label(self):
+        """Test unmatched paths do not create a series per URL"""
+        client.get("/no/such/path/1")
+        client.get("/no/such/path/2")
+
+        assert index.REQUEST_SECONDS.count("GET", "unmatched", "404") >= 2
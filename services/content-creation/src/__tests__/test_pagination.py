@@ -0,0 +1,142 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pagination  # noqa: E402
+from index import app, get_current_user  # noqa: E402
+from test_db import make_row  # noqa: E402
+
+
+async def override_get_current_user():
+    """Override authentication for testing"""
+    return {"id": "user-123", "email": "test@example.com", "role": "user"}
+
+
+app.dependency_overrides[get_current_user] = override_get_current_user
+
+client = TestClient(app)
+
+
+class TestCursor:
+    """Test cases for cursor encoding"""
+
+    def test_round_trip(self):
+        """Test a cursor decodes to the key it was built from"""
+        created_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+        cursor = pagination.encode_cursor(created_at, "content_42")
+
+        assert "=" not in cursor
+        assert pagination.decode_cursor(cursor) == (created_at, "content_42")
+
+    @pytest.mark.parametrize(
+        "cursor", ["not-a-cursor", "", "WzFd", "e30", "WyIyMDI0LTAxLTAxIiwiYSJd"]
+    )
+    def test_invalid_cursor(self, cursor):
+        """Test malformed cursors are rejected"""
+        with pytest.raises(pagination.InvalidCursorError):
+            pagination.decode_cursor(cursor)
+
+    def test_next_cursor_only_when_more_rows(self):
+        """Test the next cursor points at the last row of a full page"""
+        rows = [make_row(index) for index in range(3)]
+
+        assert pagination.next_cursor(rows, 3) is None
+        assert pagination.decode_cursor(pagination.next_cursor(rows, 2)) == (
+            rows[1]["created_at"],
+            rows[1]["id"],
+        )
+
+
+class TestCursorPagination:
+    """Test cases for keyset-paginated list endpoints"""
+
+    def test_content_pages_cover_every_row_once(self, content_store):
+        """Test walking the cursor visits each row once, ties broken by id"""
+        tied = make_row(0)["created_at"]
+        rows = [make_row(index, created_at=tied) for index in range(5)]
+        rows += [make_row(index) for index in range(5, 12)]
+        rows.append(make_row(12, client_id="client-456"))
+        asyncio.run(content_store.insert_contents(rows))
+
+        seen = []
+        response = client.get("/content?client_id=client-123&pagination=cursor&limit=4")
+        while True:
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page["items"]) <= 4
+            seen += [item["id"] for item in page["items"]]
+            if page["next_cursor"] is None:
+                break
+            response = client.get(
+                "/content",
+                params={
+                    "client_id": "client-123",
+                    "cursor": page["next_cursor"],
+                    "limit": 4,
+                },
+            )
+
+        expected = sorted(
+            (row for row in rows if row["client_id"] == "client-123"),
+            key=lambda row: (row["created_at"], row["id"]),
+            reverse=True,
+        )
+        assert seen == [row["id"] for row in expected]
+
+    def test_offset_pagination_still_returns_a_list(self, content_store):
+        """Test the legacy offset mode keeps its response shape"""
+        asyncio.run(content_store.insert_contents([make_row(i) for i in range(3)]))
+
+        response = client.get("/content?client_id=client-123&limit=2&offset=1")
+
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()] == ["content_1", "content_2"]
+
+    def test_invalid_cursor_is_rejected(self):
+        """Test a malformed cursor returns 400"""
+        response = client.get("/content?client_id=client-123&cursor=garbage")
+        assert response.status_code == 400
+
+        response = client.get("/templates?client_id=client-123&cursor=garbage")
+        assert response.status_code == 400
+
+    def test_template_pages(self, content_store):
+        """Test templates can be listed a page at a time"""
+        now = datetime.now(timezone.utc)
+        for index, name in enumerate(["First", "Second", "Third"]):
+            created_at = now + timedelta(seconds=index)
+            asyncio.run(
+                content_store.insert_template(
+                    {
+                        "id": f"template_{index}",
+                        "client_id": "client-123",
+                        "created_by": "user-123",
+                        "name": name,
+                        "content_type": "email",
+                        "template_content": "Hello {first_name}!",
+                        "variables": ["first_name"],
+                        "description": None,
+                        "created_at": created_at,
+                        "updated_at": created_at,
+                    }
+                )
+            )
+
+        first = client.get(
+            "/templates?client_id=client-123&pagination=cursor&limit=2"
+        ).json()
+        second = client.get(
+            "/templates",
+            params={"client_id": "client-123", "cursor": first["next_cursor"]},
+        ).json()
+
+        assert [item["name"] for item in first["items"]] == ["Third", "Second"]
+        assert [item["name"] for item in second["items"]] == ["First"]
+        assert second["next_cursor"] is None
@@ -0,0 +1,228 @@
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import index  # noqa: E402
+import scheduler  # noqa: E402
+from index import app, get_current_user  # noqa: E402
+
+
+async def override_get_current_user():
+    """Override authentication for testing"""
+    return {"id": "user-123", "email": "test@example.com", "role": "user"}
+
+
+app.dependency_overrides[get_current_user] = override_get_current_user
+
+client = TestClient(app)
+
+CONTENT_REQUEST = {
+    "title": "Test Article",
+    "content_type": "article",
+    "topic": "AI in Business",
+    "target_audience": "business professionals",
+    "tone": "professional",
+    "length": "medium",
+    "client_id": "client-123",
+}
+
+
+async def run_in_order(generation_scheduler, requests):
+    """Queue requests behind a held slot and return the order they ran in"""
+    order = []
+
+    async def run(client_id, label):
+        async with generation_scheduler.slot(client_id):
+            order.append(label)
+
+    async with generation_scheduler.slot("holder"):
+        tasks = []
+        for client_id, label in requests:
+            tasks.append(asyncio.ensure_future(run(client_id, label)))
+            await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return order
+
+
+class TestTokenBucket:
+    """Test cases for per-client token buckets"""
+
+    def test_burst_then_refill_time(self):
+        """Test a bucket allows its burst and reports the wait for more"""
+        bucket = scheduler.TokenBucket(rate=2, burst=3)
+
+        assert [bucket.take() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.take() == pytest.approx(0.5, abs=0.01)
+
+    def test_cost_above_burst_needs_a_full_bucket(self):
+        """Test a request larger than the burst empties a full bucket"""
+        bucket = scheduler.TokenBucket(rate=2, burst=3)
+
+        assert bucket.take(10) == 0.0
+        assert bucket.take(10) == pytest.approx(1.5, abs=0.01)
+
+
+class TestGenerationScheduler:
+    """Test cases for admission and fair queuing"""
+
+    def test_rate_limit_is_per_client(self):
+        """Test one client's exhausted bucket does not affect another"""
+        generation_scheduler = scheduler.GenerationScheduler(
+            rate_per_client=1, burst_per_client=2
+        )
+        generation_scheduler.admit("heavy")
+        generation_scheduler.admit("heavy")
+
+        with pytest.raises(scheduler.RateLimitedError) as error:
+            generation_scheduler.admit("heavy")
+        generation_scheduler.admit("light")
+
+        assert error.value.status_code == 429
+        assert error.value.retry_after_header == "1"
+
+    def test_admit_many_charges_all_or_none(self):
+        """Test a rejection for one client leaves the others' tokens alone"""
+        generation_scheduler = scheduler.GenerationScheduler(
+            rate_per_client=1, burst_per_client=2
+        )
+        generation_scheduler.admit("busy", cost=2)
+
+        with pytest.raises(scheduler.RateLimitedError):
+            generation_scheduler.admit_many({"idle": 2, "busy": 1})
+        generation_scheduler.admit("idle", cost=2)
+
+    @pytest.mark.asyncio
+    async def test_backlogged_client_is_interleaved(self):
+        """Test a deep backlog from one client does not starve another"""
+        generation_scheduler = scheduler.GenerationScheduler(max_concurrency=1)
+
+        order = await run_in_order(
+            generation_scheduler,
+            [("heavy", "h1"), ("heavy", "h2"), ("heavy", "h3"), ("heavy", "h4")]
+            + [("light", "l1"), ("light", "l2")],
+        )
+
+        assert order == ["h1", "l1", "h2", "l2", "h3", "h4"]
+
+    @pytest.mark.asyncio
+    async def test_weights_share_capacity(self):
+        """Test a client with twice the weight gets twice the turns"""
+        generation_scheduler = scheduler.GenerationScheduler(
+            max_concurrency=1, weights={"premium": 2}
+        )
+
+        order = await run_in_order(
+            generation_scheduler,
+            [("standard", f"s{index}") for index in range(1, 4)]
+            + [("premium", f"p{index}") for index in range(1, 5)],
+        )
+
+        assert order == ["p1", "s1", "p2", "p3", "s2", "p4", "s3"]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_and_timeouts_are_rejected(self):
+        """Test requests beyond the queue or past the timeout get 503 errors"""
+        generation_scheduler = scheduler.GenerationScheduler(
+            max_concurrency=1, max_queue_size=1, queue_timeout=0.05
+        )
+
+        async with generation_scheduler.slot("a"):
+            waiting = asyncio.ensure_future(generation_scheduler.slot("b").__aenter__())
+            await asyncio.sleep(0)
+
+            with pytest.raises(scheduler.SchedulerFullError):
+                generation_scheduler.admit("c")
+            with pytest.raises(scheduler.SchedulerFullError) as error:
+                await waiting
+
+        assert error.value.status_code == 503
+        assert generation_scheduler.stats()["queued"] == 0
+        assert generation_scheduler.stats()["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_its_place(self):
+        """Test a request abandoned while queued never takes a slot"""
+        generation_scheduler = scheduler.GenerationScheduler(max_concurrency=1)
+
+        async with generation_scheduler.slot("a"):
+            waiting = asyncio.ensure_future(generation_scheduler.slot("b").__aenter__())
+            await asyncio.sleep(0)
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+
+        assert generation_scheduler.stats()["queued"] == 0
+        assert generation_scheduler.stats()["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_abandoned_waiters_leave_no_finish_tag(self):
+        """Test requests that gave up do not push back the client's next one"""
+        generation_scheduler = scheduler.GenerationScheduler(
+            max_concurrency=1, queue_timeout=0.01
+        )
+
+        async with generation_scheduler.slot("a"):
+            for _ in range(3):
+                with pytest.raises(scheduler.SchedulerFullError):
+                    await generation_scheduler.slot("b", cost=100).__aenter__()
+
+        assert generation_scheduler._finish_tags == {}
+        order = await run_in_order(
+            generation_scheduler, [("c", "c1"), ("c", "c2"), ("b", "b1")]
+        )
+        assert order == ["c1", "b1", "c2"]
+
+
+class TestAdmissionEndpoints:
+    """Test cases for rejected generation requests"""
+
+    @patch("index.generate_ai_content")
+    def test_rate_limited_client_gets_429(self, mock_generate, monkeypatch):
+        """Test a client over its rate gets 429 with Retry-After"""
+        mock_generate.return_value = "Generated article content"
+        monkeypatch.setattr(
+            index,
+            "generation_scheduler",
+            scheduler.GenerationScheduler(rate_per_client=0.5, burst_per_client=1),
+        )
+
+        assert client.post("/content", json=CONTENT_REQUEST).status_code == 201
+        response = client.post("/content", json=CONTENT_REQUEST)
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "2"
+        other_client = {**CONTENT_REQUEST, "client_id": "client-456"}
+        assert client.post("/content", json=other_client).status_code == 201
+
+    @patch("index.generate_ai_content")
+    def test_batch_larger_than_burst_is_accepted(self, mock_generate):
+        """Test a single-client batch above the burst is admitted once"""
+        mock_generate.return_value = "Generated article content"
+        items = [{**CONTENT_REQUEST, "title": f"Article {n}"} for n in range(51)]
+
+        response = client.post("/content/batch", json={"items": items})
+        retry = client.post("/content/batch", json={"items": items})
+
+        assert response.status_code == 200
+        assert response.json()["succeeded"] == 51
+        assert retry.status_code == 429
+
+    def test_full_queue_gets_503(self, monkeypatch):
+        """Test requests are turned away with 503 while the queue is full"""
+        generation_scheduler = scheduler.GenerationScheduler(max_queue_size=0)
+        monkeypatch.setattr(index, "generation_scheduler", generation_scheduler)
+
+        for path in ("/content", "/content/stream", "/content/jobs"):
+            response = client.post(path, json=CONTENT_REQUEST)
+            assert response.status_code == 503
+            assert response.headers["retry-after"] == "5"
+
+        batch = client.post("/content/batch", json={"items": [CONTENT_REQUEST]})
+        assert batch.status_code == 503
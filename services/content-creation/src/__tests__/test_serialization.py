@@ -0,0 +1,97 @@
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from index import ContentResponse, TemplateResponse  # noqa: E402
+from serialization import encode_json, project_rows  # noqa: E402
+from test_db import make_row  # noqa: E402
+
+
+def legacy_encode(model, rows):
+    """Encode rows the way FastAPI's response_model path does"""
+    field = create_response_field(name="Response", type_=List[model])
+    content = asyncio.run(
+        serialize_response(field=field, response_content=[model(**row) for row in rows])
+    )
+    return JSONResponse(content).body
+
+
+class TestSerialization:
+    """Test cases for the fast list serialization path"""
+
+    def test_content_rows_match_response_model_bytes(self):
+        """Test encoded content rows are byte-identical to the legacy path"""
+        rows = [
+            make_row(0, content='Café ☕ «quoted» "text"\n\ttabs', keywords=["a"]),
+            make_row(
+                1,
+                created_at=datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc),
+                metadata={"source": "meeting", "nested": {"score": 0.5, "n": [1]}},
+                meeting_id="8f14e45f-ceea-4671-9a1b-5e7a5b6c1e2d",
+            ),
+            make_row(
+                2,
+                created_at=datetime(
+                    2024, 5, 1, 12, 0, 0, 1, tzinfo=timezone(timedelta(hours=2))
+                ),
+            ),
+        ]
+
+        assert encode_json(project_rows(rows, ContentResponse)) == legacy_encode(
+            ContentResponse, rows
+        )
+
+    def test_template_rows_match_response_model_bytes(self):
+        """Test encoded template rows are byte-identical to the legacy path"""
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "id": "template_1",
+                "client_id": "client-123",
+                "created_by": "user-123",
+                "name": "Welcome",
+                "content_type": "email",
+                "template_content": "Hello {first_name}! 👋",
+                "variables": ["first_name"],
+                "description": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+        ]
+
+        assert encode_json(project_rows(rows, TemplateResponse)) == legacy_encode(
+            TemplateResponse, rows
+        )
+
+    def test_float_exponents_are_json_equivalent(self):
+        """Test floats in metadata may be spelled differently but decode equal"""
+        rows = [make_row(0, metadata={"big": 1e16, "small": 1e-7, "score": 0.5})]
+
+        encoded = encode_json(project_rows(rows, ContentResponse))
+        legacy = legacy_encode(ContentResponse, rows)
+
+        assert b'"big":1e16' in encoded and b'"big":1e+16' in legacy
+        assert b'"small":1e-7' in encoded and b'"small":1e-07' in legacy
+        assert json.loads(encoded) == json.loads(legacy)
+
+    def test_project_rows_drops_internal_columns(self):
+        """Test columns outside the response schema are not exposed"""
+        projected = project_rows([make_row(0, version=3)], ContentResponse)
+
+        assert list(projected[0]) == list(ContentResponse.model_fields)
+
+    def test_rejects_unknown_types(self):
+        """Test values orjson cannot encode raise instead of being dropped"""
+        with pytest.raises(TypeError):
+            encode_json({"value": object()})
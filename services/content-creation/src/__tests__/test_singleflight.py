@@ -0,0 +1,122 @@
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import index  # noqa: E402
+from singleflight import SingleFlight  # noqa: E402
+
+
+class TestSingleFlight:
+    """Test cases for in-flight call coalescing"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_result(self):
+        """Test identical concurrent calls run the work once"""
+        flights = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flights.do("key", work) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert len(flights) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_follower_does_not_cancel_call(self):
+        """Test cancelling one caller leaves the shared call running"""
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "result"
+
+        leader = asyncio.ensure_future(flights.do("key", work))
+        follower = asyncio.ensure_future(flights.do("key", work))
+        await asyncio.sleep(0)
+        follower.cancel()
+        release.set()
+
+        assert await leader == "result"
+        assert follower.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_caller_after_cancellation_starts_afresh(self):
+        """Test a call still unwinding from cancellation is not joined"""
+        flights = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            try:
+                await asyncio.sleep(10)
+            finally:
+                await asyncio.sleep(0.01)  # Cleanup outlives the cancellation
+            return "result"
+
+        async def quick():
+            return "fresh"
+
+        abandoned = asyncio.ensure_future(flights.do("key", work))
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        await asyncio.sleep(0)
+
+        assert await flights.do("key", quick) == "fresh"
+        assert abandoned.cancelled()
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        """Test a failing call raises in every waiting caller"""
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            flights.do("key", work), flights.do("key", work), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(flights) == 0
+
+    @pytest.mark.asyncio
+    async def test_generate_content_coalesces_identical_requests(self):
+        """Test identical in-flight content requests generate only once"""
+        content_request = index.ContentRequest(
+            title="Test Article",
+            content_type="article",
+            topic="AI in Business",
+            target_audience="business professionals",
+            tone="professional",
+            length="medium",
+            client_id="client-123",
+            bypass_cache=True,
+        )
+
+        async def slow_generate(content_request, current_user):
+            await asyncio.sleep(0.01)
+            return "Generated article content"
+
+        with patch("index.generate_ai_content", side_effect=slow_generate) as mock:
+            results = await asyncio.gather(
+                index.generate_content(content_request, {"id": "user-1"}),
+                index.generate_content(content_request, {"id": "user-2"}),
+            )
+
+        assert results == ["Generated article content"] * 2
+        mock.assert_called_once()
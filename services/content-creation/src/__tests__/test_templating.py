@@ -0,0 +1,177 @@
+import os
+import sys
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from index import TemplateResponse, app, get_current_user  # noqa: E402
+from templating import compile_template  # noqa: E402
+from templating import TemplateCache, TemplateError  # noqa: E402
+
+
+async def override_get_current_user():
+    """Override authentication for testing"""
+    return {"id": "user-123", "email": "test@example.com", "role": "user"}
+
+
+app.dependency_overrides[get_current_user] = override_get_current_user
+
+client = TestClient(app)
+
+
+class TestCompileTemplate:
+    """Test cases for template parsing and rendering"""
+
+    def test_render_substitutes_variables(self):
+        """Test placeholders are replaced and escaped braces kept"""
+        compiled = compile_template("Hi {name}, {{not}} {topic}!", ["name", "topic"])
+        assert compiled.render({"name": "Ada", "topic": "AI"}) == "Hi Ada, {not} AI!"
+
+    def test_rejects_undeclared_variables(self):
+        """Test placeholders must be declared as variables"""
+        with pytest.raises(TemplateError, match="Undeclared template variables"):
+            compile_template("Hi {name} {company}", ["name"])
+
+    def test_rejects_expressions(self):
+        """Test attribute access and format specs are not allowed"""
+        for template_content in ["{name.upper}", "{name:>10}", "{name!r}", "{}"]:
+            with pytest.raises(TemplateError):
+                compile_template(template_content, ["name"])
+
+    def test_rejects_unbalanced_braces(self):
+        """Test malformed templates are rejected"""
+        with pytest.raises(TemplateError, match="Invalid template syntax"):
+            compile_template("Hi {name", ["name"])
+
+    def test_render_requires_all_variables(self):
+        """Test rendering fails when a used variable is missing"""
+        compiled = compile_template("Hi {name}", ["name"])
+        with pytest.raises(TemplateError, match="Missing template variables: name"):
+            compiled.render({})
+
+
+class TestTemplateCache:
+    """Test cases for the compiled template cache"""
+
+    def test_compiles_once_per_content(self):
+        """Test a template is only parsed until its content changes"""
+        cache = TemplateCache()
+        first = cache.get_or_compile("template_1", "Hi {name}", ["name"])
+        second = cache.get_or_compile("template_1", "Hi {name}", ["name"])
+        changed = cache.get_or_compile("template_1", "Hello {name}", ["name"])
+
+        assert first is second
+        assert changed is not first
+        assert cache.stats() == {"hits": 1, "misses": 2, "size": 2}
+
+    def test_evicts_least_recently_used(self):
+        """Test the cache stays within its size bound"""
+        cache = TemplateCache(max_entries=1)
+        cache.get_or_compile("template_1", "A", [])
+        cache.get_or_compile("template_2", "B", [])
+        assert len(cache) == 1
+
+
+class TestTemplateRenderEndpoint:
+    """Test cases for the template render endpoint"""
+
+    @pytest.fixture
+    def template(self):
+        """Stored template"""
+        return TemplateResponse(
+            id="template_123",
+            name="Welcome Email",
+            content_type="email",
+            template_content="Hello {first_name}, welcome to {company}!",
+            variables=["first_name", "company"],
+            description=None,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+            client_id="client-123",
+        )
+
+    @patch("index.retrieve_template")
+    def test_render_single(self, mock_retrieve, template):
+        """Test rendering one set of variables"""
+        mock_retrieve.return_value = template
+
+        response = client.post(
+            "/templates/template_123/render",
+            json={"variables": {"first_name": "Ada", "company": "Qylon"}},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["content"] == "Hello Ada, welcome to Qylon!"
+
+    @patch("index.retrieve_template")
+    def test_render_bulk_with_partial_failure(self, mock_retrieve, template):
+        """Test bulk rendering reports failures per item"""
+        mock_retrieve.return_value = template
+
+        response = client.post(
+            "/templates/template_123/render",
+            json={
+                "items": [
+                    {"first_name": "Ada", "company": "Qylon"},
+                    {"first_name": "Grace"},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results[0]["content"] == "Hello Ada, welcome to Qylon!"
+        assert results[1]["success"] is False
+        assert results[1]["error"] == "Missing template variables: company"
+
+    @patch("index.retrieve_template")
+    def test_render_missing_variable(self, mock_retrieve, template):
+        """Test single rendering with a missing variable returns 422"""
+        mock_retrieve.return_value = template
+
+        response = client.post(
+            "/templates/template_123/render",
+            json={"variables": {"first_name": "Ada"}},
+        )
+
+        assert response.status_code == 422
+
+    @patch("index.retrieve_template")
+    def test_render_template_not_found(self, mock_retrieve):
+        """Test rendering an unknown template returns 404"""
+        mock_retrieve.return_value = None
+
+        response = client.post(
+            "/templates/unknown/render", json={"variables": {"name": "Ada"}}
+        )
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Template not found"
+
+    def test_render_requires_single_or_bulk(self):
+        """Test exactly one of variables or items must be given"""
+        response = client.post("/templates/template_123/render", json={})
+        assert response.status_code == 422
+
+    @patch("index.save_template")
+    def test_create_template_rejects_undeclared_variables(self, mock_save):
+        """Test invalid templates are rejected before saving"""
+        response = client.post(
+            "/templates",
+            json={
+                "name": "Broken Template",
+                "content_type": "email",
+                "template_content": "Hello {first_name} from {company}",
+                "variables": ["first_name"],
+                "client_id": "client-123",
+            },
+        )
+
+        assert response.status_code == 422
+        assert response.json()["detail"] == "Undeclared template variables: company"
+        mock_save.assert_not_called()
@@ -0,0 +1,151 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcripts  # noqa: E402
+from cache import InMemoryCache  # noqa: E402
+from db import InMemoryContentStore  # noqa: E402
+from meetings import MeetingSummarizer  # noqa: E402
+from transcripts import TranscriptCompressor  # noqa: E402
+
+FILLER = "Yeah, okay, so I think that is right."
+
+
+def make_transcript(rounds):
+    """Transcript mixing on-topic discussion with small talk"""
+    lines = [
+        "The billing migration moves invoices to the new ledger service.",
+        FILLER,
+        "Invoices for the ledger migration must be reconciled before billing.",
+        "Did anyone watch the game last night?",
+        "The ledger service owns billing invoices after the migration.",
+    ]
+    return [
+        {
+            "segment_sequence": index,
+            "start_time_ms": index * 5000,
+            "end_time_ms": index * 5000 + 4000,
+            "speaker_id": f"speaker_{index % 2}",
+            "text": lines[index % len(lines)] + f" Item {index}.",
+        }
+        for index in range(rounds * len(lines))
+    ]
+
+
+class TestSentenceScoring:
+    """Test cases for TF-IDF sentence scoring"""
+
+    def test_on_topic_sentences_score_higher(self):
+        """Test sentences sharing the transcript's terms beat small talk"""
+        sentences = [
+            "The billing migration moves invoices to the ledger.",
+            "Did anyone watch the game last night?",
+            "Ledger invoices need reconciling before the billing migration.",
+            "Billing invoices move to the ledger after migration.",
+        ]
+
+        scores = transcripts.score_sentences(sentences)
+
+        assert scores.shape == (4,)
+        assert scores.argmin() == 1
+        assert 0 <= scores.min() and scores.max() <= 1 + 1e-9
+
+    def test_sentences_without_terms_score_zero(self):
+        """Test stop-word-only input scores zero instead of dividing by zero"""
+        assert list(transcripts.score_sentences(["Yeah, okay.", "Um, so."])) == [0, 0]
+
+
+class TestCompressSegments:
+    """Test cases for compressing transcripts to a token budget"""
+
+    def test_within_budget_is_unchanged(self):
+        """Test a short transcript is returned as it is"""
+        segments = make_transcript(1)
+        assert transcripts.compress_segments(segments, 10000) is segments
+
+    def test_compresses_to_budget_in_order(self):
+        """Test kept sentences fit the budget and keep transcript order"""
+        segments = make_transcript(40)
+        total = sum(
+            transcripts.estimate_tokens(segment["text"]) for segment in segments
+        )
+
+        compressed = transcripts.compress_segments(segments, total // 5)
+
+        kept_tokens = sum(
+            transcripts.estimate_tokens(sentence)
+            for segment in compressed
+            for sentence in segment["text"].replace(". ", ".\n").split("\n")
+        )
+        assert kept_tokens <= total // 5
+        sequences = [segment["segment_sequence"] for segment in compressed]
+        assert sequences == sorted(sequences)
+        assert set(compressed[0]) == {
+            "segment_sequence",
+            "start_time_ms",
+            "end_time_ms",
+            "speaker_id",
+            "text",
+        }
+        assert not any(FILLER in segment["text"] for segment in compressed)
+
+
+class TestTranscriptCompressor:
+    """Test cases for the per-meeting compressed transcript cache"""
+
+    @pytest.mark.asyncio
+    async def test_caches_per_meeting(self):
+        """Test a cached meeting is not read from the store again"""
+        compressor = TranscriptCompressor(InMemoryCache(), token_budget=200)
+        reads = []
+
+        async def batches():
+            reads.append(1)
+            yield make_transcript(10)
+
+        first = [
+            batch async for batch in compressor.compress("m-1", "client-123", batches())
+        ]
+        second = [
+            batch async for batch in compressor.compress("m-1", "client-123", batches())
+        ]
+
+        assert first == second
+        assert len(reads) == 1
+        assert compressor.stats()["hits"] == 1
+        assert compressor.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_summarizer_prompts_shrink(self):
+        """Test compression cuts the transcript the map stage sends out"""
+        store = InMemoryContentStore()
+        store.add_transcript_segments("m-1", "client-123", make_transcript(100))
+        prompts = {"raw": [], "compressed": []}
+
+        def recorder(name):
+            async def complete(prompt, max_tokens):
+                prompts[name].append(prompt)
+                await asyncio.sleep(0)
+                return "summary"
+
+            return complete
+
+        await MeetingSummarizer(store, recorder("raw"), chunk_chars=4000).summarize(
+            "m-1", "client-123"
+        )
+        await MeetingSummarizer(
+            store,
+            recorder("compressed"),
+            chunk_chars=4000,
+            compressor=TranscriptCompressor(InMemoryCache(), token_budget=1000),
+        ).summarize("m-1", "client-123")
+
+        def map_chars(name):
+            return sum(len(p) for p in prompts[name] if p.startswith("Summarize"))
+
+        assert map_chars("compressed") * 4 < map_chars("raw")
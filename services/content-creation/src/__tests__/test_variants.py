@@ -0,0 +1,134 @@
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to import the main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from index import app, get_current_user  # noqa: E402
+from llm import FakeProvider  # noqa: E402
+
+
+async def override_get_current_user():
+    """Override authentication for testing"""
+    return {"id": "user-123", "email": "test@example.com", "role": "user"}
+
+
+app.dependency_overrides[get_current_user] = override_get_current_user
+
+client = TestClient(app)
+
+CONTENT_REQUEST = {
+    "title": "Test Article",
+    "content_type": "article",
+    "topic": "AI in Business",
+    "target_audience": "business professionals",
+    "tone": "professional",
+    "length": "short",
+    "client_id": "client-123",
+    "metadata": {"campaign": "launch"},
+}
+
+
+@pytest.fixture
+def provider():
+    """A fast fake provider that counts its batched calls"""
+    provider = FakeProvider(latency=0, tokens_per_second=100000)
+    provider.batched_calls = 0
+    original = provider._complete_many
+
+    async def counted(*args):
+        provider.batched_calls += 1
+        return await original(*args)
+
+    provider._complete_many = counted
+    with patch("index.get_llm_provider", return_value=provider):
+        yield provider
+
+
+class TestContentVariants:
+    """Test cases for generating several alternatives in one request"""
+
+    def test_variants_share_one_provider_call(self, provider, content_store):
+        """Test variants come from one call and are saved as linked drafts"""
+        response = client.post("/content", json={**CONTENT_REQUEST, "variants": 3})
+
+        assert response.status_code == 201
+        data = response.json()
+        variants = data["variants"]
+        assert provider.batched_calls == 1
+        assert len({variant["content"] for variant in variants}) == 3
+        assert [variant["metadata"]["variant"] for variant in variants] == [1, 2, 3]
+
+        rows = content_store.store._content
+        assert sorted(rows) == sorted(variant["id"] for variant in variants)
+        for row in rows.values():
+            assert row["metadata"]["variant_group"] == data["variant_group"]
+            assert row["metadata"]["variants"] == 3
+            assert row["metadata"]["campaign"] == "launch"
+
+    def test_single_variant_keeps_response_shape(self, provider):
+        """Test requests without variants still return one piece of content"""
+        response = client.post("/content", json=CONTENT_REQUEST)
+
+        assert response.status_code == 201
+        assert "variant_group" not in response.json()
+        assert "variant" not in response.json()["metadata"]
+        assert provider.batched_calls == 0
+
+    @patch("index.generate_ai_content")
+    def test_mock_backend_generates_each_variant(
+        self, mock_generate, generation_scheduler
+    ):
+        """Test without a batching provider each variant takes its own slot"""
+        running = []
+
+        async def generate(content_request, current_user):
+            running.append(generation_scheduler.running)
+            await asyncio.sleep(0)
+            return "Generated content"
+
+        mock_generate.side_effect = generate
+
+        with patch("index.get_llm_provider", return_value=None):
+            response = client.post("/content", json={**CONTENT_REQUEST, "variants": 2})
+
+        assert response.status_code == 201
+        assert len(response.json()["variants"]) == 2
+        assert mock_generate.call_count == 2
+        assert max(running) == 2
+
+    def test_meeting_is_summarized_once(self, provider):
+        """Test meeting variants share one summary and one batched write-up"""
+        meeting_request = {
+            **CONTENT_REQUEST,
+            "content_type": "summary",
+            "meeting_id": "5d9b6a1e-3c2f-4e8a-9b7d-1f2e3a4b5c6d",
+            "variants": 3,
+        }
+
+        with patch(
+            "index.summarize_meeting", return_value=["We ship on Friday."]
+        ) as summarize:
+            response = client.post("/content", json=meeting_request)
+
+        assert response.status_code == 201
+        assert len(response.json()["variants"]) == 3
+        assert summarize.call_count == 1
+        assert provider.batched_calls == 1
+
+    def test_variant_limits(self):
+        """Test variants are bounded and only accepted by POST /content"""
+        too_many = client.post("/content", json={**CONTENT_REQUEST, "variants": 50})
+        batch = client.post(
+            "/content/batch", json={"items": [{**CONTENT_REQUEST, "variants": 2}]}
+        )
+        stream = client.post("/content/stream", json={**CONTENT_REQUEST, "variants": 2})
+
+        assert too_many.status_code == 422
+        assert batch.status_code == 422
+        assert stream.status_code == 422
@@ -0,0 +1,366 @@
+"""
+Caching primitives for the Content Creation Service.
+
+Backends share a small async interface so the in-process store can later be
+swapped for a shared one without touching call sites.
+"""
+
+import hashlib
+import json
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+
+class CacheBackend(ABC):
+    """Async key/value store with optional per-entry TTL"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, expiring it after ttl seconds when given"""
+
+    @abstractmethod
+    async def set_if_absent(
+        self, key: str, value: Any, ttl: Optional[float] = None
+    ) -> bool:
+        """Atomically store a value unless the key exists, returning whether it did"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove a value if present"""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove every value"""
+
+
+class NullCache(CacheBackend):
+    """Backend that never stores anything, used to disable caching"""
+
+    async def get(self, key: str) -> Optional[Any]:
+        return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        return None
+
+    async def set_if_absent(
+        self, key: str, value: Any, ttl: Optional[float] = None
+    ) -> bool:
+        return True
+
+    async def delete(self, key: str) -> None:
+        return None
+
+    async def clear(self) -> None:
+        return None
+
+
+class InMemoryCache(CacheBackend):
+    """Size-bounded LRU cache with TTL expiry, local to the process"""
+
+    def __init__(self, max_entries: int = 1024, default_ttl: Optional[float] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def set_if_absent(
+        self, key: str, value: Any, ttl: Optional[float] = None
+    ) -> bool:
+        # Neither call yields to the event loop, so no other task runs between
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisCache(CacheBackend):
+    """Backend shared between workers through a Redis-compatible server
+
+    Values are stored as JSON under a key prefix, so clear() only removes this
+    cache's keys. Any client exposing the redis.asyncio get/set/delete/scan_iter
+    methods works, including in-memory fakes in tests.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        prefix: str = "content-creation:",
+        default_ttl: Optional[float] = None,
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        await self._set(key, value, ttl)
+
+    async def set_if_absent(
+        self, key: str, value: Any, ttl: Optional[float] = None
+    ) -> bool:
+        return bool(await self._set(key, value, ttl, nx=True))
+
+    async def _set(
+        self, key: str, value: Any, ttl: Optional[float], nx: bool = False
+    ) -> Any:
+        ttl = self.default_ttl if ttl is None else ttl
+        return await self.client.set(
+            self.prefix + key,
+            json.dumps(value, separators=(",", ":")),
+            px=int(ttl * 1000) if ttl is not None else None,
+            nx=nx,
+        )
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+    async def clear(self) -> None:
+        keys = [key async for key in self.client.scan_iter(match=self.prefix + "*")]
+        if keys:
+            await self.client.delete(*keys)
+
+
+def create_redis_client(url: str) -> Any:
+    """Create an asyncio Redis client, requiring the optional redis package"""
+    try:
+        import redis.asyncio as redis
+    except ImportError as e:
+        raise RuntimeError("The redis cache backend requires the redis package") from e
+    return redis.from_url(url)
+
+
+def create_cache_backend(name: str, max_entries: int, prefix: str) -> CacheBackend:
+    """Create a cache backend by name: memory, redis or none
+
+    Each cache passes its own key prefix, so clearing one shared backend
+    never removes another cache's keys.
+    """
+    name = name.lower()
+    if name == "memory":
+        return InMemoryCache(max_entries=max_entries)
+    if name == "redis":
+        url = os.getenv("REDIS_URL", "redis://localhost:6379")
+        return RedisCache(create_redis_client(url), prefix=prefix)
+    if name == "none":
+        return NullCache()
+    raise ValueError(f"Unknown cache backend: {name}")
+
+
+# ContentRequest fields that influence the generated text
+GENERATION_KEY_FIELDS = (
+    "title",
+    "content_type",
+    "topic",
+    "target_audience",
+    "tone",
+    "length",
+    "meeting_id",
+    "template_id",
+)
+
+
+class GenerationCache:
+    """Cache of generated content keyed on the prompt-relevant request fields"""
+
+    def __init__(self, backend: CacheBackend, ttl: Optional[float] = None):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(content_request: Any) -> str:
+        """Build a canonical cache key for a content request"""
+        fields: Dict[str, Any] = {}
+        for name in GENERATION_KEY_FIELDS:
+            value = getattr(content_request, name, None)
+            fields[name] = value.strip() if isinstance(value, str) else value
+
+        # Keyword order does not change the prompt
+        keywords = getattr(content_request, "keywords", None) or []
+        fields["keywords"] = sorted({keyword.strip() for keyword in keywords})
+
+        # Content written from a meeting's transcript stays with its client
+        if fields.get("meeting_id"):
+            fields["client_id"] = getattr(content_request, "client_id", None)
+
+        canonical = json.dumps(fields, sort_keys=True, separators=(",", ":"))
+        return "generation:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        content = await self.backend.get(key)
+        if content is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return content
+
+    async def set(self, key: str, content: str) -> None:
+        await self.backend.set(key, content, self.ttl)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Content row fields stored as ISO-8601 strings in cached entries
+CONTENT_TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+
+# Write tokens only have to outlive the reads in flight when they change
+WRITE_TOKEN_TTL_SECONDS = 3600
+
+
+class ContentCache:
+    """Read-through cache of content rows keyed on content id
+
+    Every write stores a new write token for the row in the backend, then
+    invalidates its entry. A read notes the token before reading the row and
+    checks it again after filling the cache, removing its entry when a write
+    happened in between. The token lives in the backend, so with a shared
+    backend a slow read in one worker cannot put back a row that another
+    worker has just updated.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: Optional[float] = None):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(content_id: str) -> str:
+        return f"content:{content_id}"
+
+    @staticmethod
+    def token_key_for(content_id: str) -> str:
+        return f"content-write:{content_id}"
+
+    async def write_token(self, content_id: str) -> Optional[str]:
+        """Token of the last write to a row, to note before reading it"""
+        return await self.backend.get(self.token_key_for(content_id))
+
+    async def get(self, content_id: str) -> Optional[Dict[str, Any]]:
+        entry = await self.backend.get(self.key_for(content_id))
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        row = dict(entry)
+        for field in CONTENT_TIMESTAMP_FIELDS:
+            if isinstance(row.get(field), str):
+                row[field] = datetime.fromisoformat(row[field])
+        return row
+
+    async def fill(
+        self, content_id: str, row: Dict[str, Any], token: Optional[str]
+    ) -> None:
+        """Cache a row read after write_token returned token"""
+        entry = dict(row)
+        for field in CONTENT_TIMESTAMP_FIELDS:
+            if isinstance(entry.get(field), datetime):
+                entry[field] = entry[field].isoformat()
+        key = self.key_for(content_id)
+        await self.backend.set(key, entry, self.ttl)
+
+        # A write that finished before this check is seen here; one that
+        # finishes after it deletes the entry itself
+        if await self.write_token(content_id) != token:
+            await self.backend.delete(key)
+
+    async def invalidate(self, content_id: str) -> None:
+        await self.backend.set(
+            self.token_key_for(content_id), uuid.uuid4().hex, WRITE_TOKEN_TTL_SECONDS
+        )
+        await self.backend.delete(self.key_for(content_id))
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def create_generation_cache() -> GenerationCache:
+    """Create the generation cache configured through environment variables"""
+    backend = create_cache_backend(
+        os.getenv("CONTENT_CACHE_BACKEND", "memory"),
+        max_entries=int(os.getenv("CONTENT_CACHE_MAX_ENTRIES", 1024)),
+        prefix="content-creation:generation:",
+    )
+    return GenerationCache(
+        backend, ttl=float(os.getenv("CONTENT_CACHE_TTL_SECONDS", 3600))
+    )
+
+
+def create_content_cache() -> ContentCache:
+    """Create the content read cache configured through environment variables"""
+    backend = create_cache_backend(
+        os.getenv("CONTENT_READ_CACHE_BACKEND", "memory"),
+        max_entries=int(os.getenv("CONTENT_READ_CACHE_MAX_ENTRIES", 10000)),
+        prefix="content-creation:content:",
+    )
+    return ContentCache(
+        backend, ttl=float(os.getenv("CONTENT_READ_CACHE_TTL_SECONDS", 60))
+    )
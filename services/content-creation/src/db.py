@@ -0,0 +1,630 @@
+"""
+Persistence layer for the Content Creation Service.
+
+PostgresContentStore keeps one asyncpg connection pool per process. asyncpg
+prepares every query on first use and caches the prepared statement on each
+pooled connection, so the hot read/write paths skip parsing and planning after
+warm-up. When no database is configured an in-memory store with the same
+interface is used, which keeps local development and tests self-contained.
+
+Clients, users and meetings are referenced by UUID foreign keys. The API
+accepts them as strings, so a malformed or unknown reference is reported as
+InvalidReferenceError rather than as a database failure, and listing rows for
+a client id that is not a UUID simply finds none.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from cache import ContentCache
+from pagination import Keyset
+
+logger = logging.getLogger(__name__)
+
+CONTENT_COLUMNS = (
+    "id",
+    "client_id",
+    "created_by",
+    "meeting_id",
+    "template_id",
+    "title",
+    "content_type",
+    "topic",
+    "target_audience",
+    "tone",
+    "length",
+    "keywords",
+    "content",
+    "status",
+    "metadata",
+    "version",
+    "created_at",
+    "updated_at",
+)
+
+TEMPLATE_COLUMNS = (
+    "id",
+    "client_id",
+    "created_by",
+    "name",
+    "content_type",
+    "template_content",
+    "variables",
+    "description",
+    "created_at",
+    "updated_at",
+)
+
+TRANSCRIPT_SEGMENT_COLUMNS = (
+    "segment_sequence",
+    "start_time_ms",
+    "end_time_ms",
+    "speaker_id",
+    "text",
+)
+
+# Content fields that may be changed after creation
+UPDATABLE_CONTENT_FIELDS = ("title", "content", "status", "metadata")
+
+
+class InvalidReferenceError(ValueError):
+    """Raised for a malformed or unknown client, user, meeting or template id"""
+
+
+@dataclass
+class DatabaseConfig:
+    url: str
+    min_pool_size: int = 2
+    max_pool_size: int = 10
+    max_inactive_connection_lifetime: float = 300.0
+    statement_cache_size: int = 256
+    command_timeout: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> Optional["DatabaseConfig"]:
+        """Build the configuration from environment variables, if configured"""
+        url = os.getenv("DATABASE_URL") or os.getenv("CONTENT_CREATION_DATABASE_URL")
+        if not url:
+            return None
+
+        return cls(
+            url=url,
+            min_pool_size=int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+            max_pool_size=int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+            max_inactive_connection_lifetime=float(
+                os.getenv("DB_POOL_MAX_INACTIVE_SECONDS", 300)
+            ),
+            # Set to 0 behind transaction-mode poolers such as PgBouncer
+            statement_cache_size=int(os.getenv("DB_STATEMENT_CACHE_SIZE", 256)),
+            command_timeout=float(os.getenv("DB_COMMAND_TIMEOUT_SECONDS", 30)),
+        )
+
+
+class ContentStore(ABC):
+    """Storage for content and template rows, represented as dicts"""
+
+    @abstractmethod
+    async def insert_content(self, row: Dict[str, Any]) -> None:
+        """Insert one content row"""
+
+    @abstractmethod
+    async def insert_contents(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert several content rows atomically in one round-trip"""
+
+    @abstractmethod
+    async def get_content(self, content_id: str) -> Optional[Dict[str, Any]]:
+        """Return a content row by id"""
+
+    @abstractmethod
+    async def update_content(
+        self,
+        content_id: str,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Apply changes to a content row and return the updated row
+
+        With expected_version, the row is only changed while it still has that
+        version. None is returned when no row was changed.
+        """
+
+    @abstractmethod
+    async def list_content(
+        self,
+        client_id: str,
+        content_type: Optional[str],
+        status: Optional[str],
+        limit: int,
+        offset: int = 0,
+        after: Optional[Keyset] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return a client's content rows, newest first, optionally after a key"""
+
+    @abstractmethod
+    async def insert_template(self, row: Dict[str, Any]) -> None:
+        """Insert one template row"""
+
+    @abstractmethod
+    async def get_template(self, template_id: str) -> Optional[Dict[str, Any]]:
+        """Return a template row by id"""
+
+    @abstractmethod
+    async def list_templates(
+        self,
+        client_id: str,
+        content_type: Optional[str],
+        limit: Optional[int] = None,
+        after: Optional[Keyset] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return a client's template rows, newest first, optionally after a key"""
+
+    @abstractmethod
+    def iter_transcript_segments(
+        self, meeting_id: str, client_id: str, batch_size: int
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield a meeting's transcription segments in order, in batches
+
+        Nothing is yielded unless the meeting belongs to client_id.
+        """
+
+    async def close(self) -> None:
+        """Release resources held by the store"""
+
+
+class InMemoryContentStore(ContentStore):
+    """Process-local store used when no database is configured"""
+
+    def __init__(self) -> None:
+        self._content: Dict[str, Dict[str, Any]] = {}
+        self._templates: Dict[str, Dict[str, Any]] = {}
+        self._segments: Dict[str, List[Dict[str, Any]]] = {}
+        self._meeting_clients: Dict[str, str] = {}
+
+    def add_transcript_segments(
+        self, meeting_id: str, client_id: str, segments: List[Dict[str, Any]]
+    ) -> None:
+        """Record transcription segments for a client's meeting"""
+        self._meeting_clients[meeting_id] = client_id
+        self._segments.setdefault(meeting_id, []).extend(segments)
+
+    async def insert_content(self, row: Dict[str, Any]) -> None:
+        self._content[row["id"]] = {"version": 1, **row}
+
+    async def insert_contents(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            await self.insert_content(row)
+
+    async def get_content(self, content_id: str) -> Optional[Dict[str, Any]]:
+        row = self._content.get(content_id)
+        return dict(row) if row else None
+
+    async def update_content(
+        self,
+        content_id: str,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        row = self._content.get(content_id)
+        if row is None or expected_version not in (None, row["version"]):
+            return None
+
+        row.update(
+            {
+                key: value
+                for key, value in changes.items()
+                if key in UPDATABLE_CONTENT_FIELDS
+            }
+        )
+        row["version"] += 1
+        row["updated_at"] = datetime.now(timezone.utc)
+        return dict(row)
+
+    async def list_content(
+        self,
+        client_id: str,
+        content_type: Optional[str],
+        status: Optional[str],
+        limit: int,
+        offset: int = 0,
+        after: Optional[Keyset] = None,
+    ) -> List[Dict[str, Any]]:
+        rows = [
+            row
+            for row in self._content.values()
+            if row["client_id"] == client_id
+            and (content_type is None or row["content_type"] == content_type)
+            and (status is None or row["status"] == status)
+            and (after is None or (row["created_at"], row["id"]) < after)
+        ]
+        rows.sort(key=lambda row: (row["created_at"], row["id"]), reverse=True)
+        return [dict(row) for row in rows[offset : offset + limit]]
+
+    async def insert_template(self, row: Dict[str, Any]) -> None:
+        self._templates[row["id"]] = dict(row)
+
+    async def get_template(self, template_id: str) -> Optional[Dict[str, Any]]:
+        row = self._templates.get(template_id)
+        return dict(row) if row else None
+
+    async def list_templates(
+        self,
+        client_id: str,
+        content_type: Optional[str],
+        limit: Optional[int] = None,
+        after: Optional[Keyset] = None,
+    ) -> List[Dict[str, Any]]:
+        rows = [
+            row
+            for row in self._templates.values()
+            if row["client_id"] == client_id
+            and (content_type is None or row["content_type"] == content_type)
+            and (after is None or (row["created_at"], row["id"]) < after)
+        ]
+        rows.sort(key=lambda row: (row["created_at"], row["id"]), reverse=True)
+        return [dict(row) for row in rows[:limit]]
+
+    async def iter_transcript_segments(
+        self, meeting_id: str, client_id: str, batch_size: int
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        if self._meeting_clients.get(meeting_id) != client_id:
+            return
+        segments = sorted(
+            self._segments.get(meeting_id, []),
+            key=lambda segment: segment["segment_sequence"],
+        )
+        for start in range(0, len(segments), batch_size):
+            yield [dict(segment) for segment in segments[start : start + batch_size]]
+
+
+def _parse_uuid(value: str) -> Optional[uuid.UUID]:
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        return None
+
+
+@contextmanager
+def _checked_references() -> Iterator[None]:
+    """Report malformed or unknown foreign keys as InvalidReferenceError"""
+    import asyncpg
+
+    try:
+        yield
+    except (asyncpg.DataError, asyncpg.ForeignKeyViolationError) as e:
+        raise InvalidReferenceError(str(e)) from e
+
+
+def _record_to_row(record: Any) -> Dict[str, Any]:
+    """Convert an asyncpg record to a plain row dict"""
+    return {
+        key: str(value) if isinstance(value, uuid.UUID) else value
+        for key, value in record.items()
+    }
+
+
+class PostgresContentStore(ContentStore):
+    """Store backed by a pooled asyncpg connection"""
+
+    def __init__(self, config: DatabaseConfig):
+        self.config = config
+        self._pool: Any = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _init_connection(self, connection: Any) -> None:
+        for type_name in ("json", "jsonb"):
+            await connection.set_type_codec(
+                type_name,
+                encoder=json.dumps,
+                decoder=json.loads,
+                schema="pg_catalog",
+            )
+
+    async def connect(self) -> Any:
+        """Create the connection pool on first use"""
+        if self._pool is not None:
+            return self._pool
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._pool is not None:
+                return self._pool
+
+            import asyncpg
+
+            self._pool = await asyncpg.create_pool(
+                self.config.url,
+                min_size=self.config.min_pool_size,
+                max_size=self.config.max_pool_size,
+                max_inactive_connection_lifetime=(
+                    self.config.max_inactive_connection_lifetime
+                ),
+                statement_cache_size=self.config.statement_cache_size,
+                command_timeout=self.config.command_timeout,
+                init=self._init_connection,
+            )
+            logger.info(
+                "Database pool created: %s-%s connections",
+                self.config.min_pool_size,
+                self.config.max_pool_size,
+            )
+        return self._pool
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def insert_content(self, row: Dict[str, Any]) -> None:
+        await self.insert_contents([row])
+
+    async def insert_contents(self, rows: List[Dict[str, Any]]) -> None:
+        columns = [column for column in CONTENT_COLUMNS if column != "version"]
+        placeholders = ", ".join(f"${index}" for index in range(1, len(columns) + 1))
+        query = (
+            f"INSERT INTO content_pieces ({', '.join(columns)}) "
+            f"VALUES ({placeholders})"
+        )
+
+        pool = await self.connect()
+        async with pool.acquire() as connection:
+            # executemany pipelines every row before waiting for a reply
+            with _checked_references():
+                async with connection.transaction():
+                    await connection.executemany(
+                        query,
+                        [[row.get(column) for column in columns] for row in rows],
+                    )
+
+    async def get_content(self, content_id: str) -> Optional[Dict[str, Any]]:
+        pool = await self.connect()
+        record = await pool.fetchrow(
+            f"SELECT {', '.join(CONTENT_COLUMNS)} FROM content_pieces WHERE id = $1",
+            content_id,
+        )
+        return _record_to_row(record) if record else None
+
+    async def update_content(
+        self,
+        content_id: str,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        fields = [field for field in UPDATABLE_CONTENT_FIELDS if field in changes]
+        args: List[Any] = [content_id, *(changes[field] for field in fields)]
+        assignments = [f"{field} = ${index}" for index, field in enumerate(fields, 2)]
+        assignments += ["version = version + 1", "updated_at = NOW()"]
+        conditions = ["id = $1"]
+        if expected_version is not None:
+            args.append(expected_version)
+            conditions.append(f"version = ${len(args)}")
+
+        pool = await self.connect()
+        record = await pool.fetchrow(
+            f"UPDATE content_pieces SET {', '.join(assignments)} "
+            f"WHERE {' AND '.join(conditions)} "
+            f"RETURNING {', '.join(CONTENT_COLUMNS)}",
+            *args,
+        )
+        return _record_to_row(record) if record else None
+
+    async def list_content(
+        self,
+        client_id: str,
+        content_type: Optional[str],
+        status: Optional[str],
+        limit: int,
+        offset: int = 0,
+        after: Optional[Keyset] = None,
+    ) -> List[Dict[str, Any]]:
+        if _parse_uuid(client_id) is None:
+            return []
+
+        # Only the filters in use appear in the query, so each combination gets
+        # its own prepared statement and index-friendly plan
+        conditions = ["client_id = $1"]
+        args: List[Any] = [client_id]
+        for column, value in (("content_type", content_type), ("status", status)):
+            if value is not None:
+                args.append(value)
+                conditions.append(f"{column} = ${len(args)}")
+        if after is not None:
+            args.extend(after)
+            conditions.append(f"(created_at, id) < (${len(args) - 1}, ${len(args)})")
+        args.extend([limit, offset])
+
+        pool = await self.connect()
+        records = await pool.fetch(
+            f"SELECT {', '.join(CONTENT_COLUMNS)} FROM content_pieces "
+            f"WHERE {' AND '.join(conditions)} "
+            f"ORDER BY created_at DESC, id DESC "
+            f"LIMIT ${len(args) - 1} OFFSET ${len(args)}",
+            *args,
+        )
+        return [_record_to_row(record) for record in records]
+
+    async def insert_template(self, row: Dict[str, Any]) -> None:
+        placeholders = ", ".join(
+            f"${index}" for index in range(1, len(TEMPLATE_COLUMNS) + 1)
+        )
+        pool = await self.connect()
+        with _checked_references():
+            await pool.execute(
+                f"INSERT INTO content_templates ({', '.join(TEMPLATE_COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                *(row.get(column) for column in TEMPLATE_COLUMNS),
+            )
+
+    async def get_template(self, template_id: str) -> Optional[Dict[str, Any]]:
+        pool = await self.connect()
+        record = await pool.fetchrow(
+            f"SELECT {', '.join(TEMPLATE_COLUMNS)} FROM content_templates "
+            f"WHERE id = $1",
+            template_id,
+        )
+        return _record_to_row(record) if record else None
+
+    async def list_templates(
+        self,
+        client_id: str,
+        content_type: Optional[str],
+        limit: Optional[int] = None,
+        after: Optional[Keyset] = None,
+    ) -> List[Dict[str, Any]]:
+        if _parse_uuid(client_id) is None:
+            return []
+
+        conditions = ["client_id = $1"]
+        args: List[Any] = [client_id]
+        if content_type is not None:
+            args.append(content_type)
+            conditions.append(f"content_type = ${len(args)}")
+        if after is not None:
+            args.extend(after)
+            conditions.append(f"(created_at, id) < (${len(args) - 1}, ${len(args)})")
+        query = (
+            f"SELECT {', '.join(TEMPLATE_COLUMNS)} FROM content_templates "
+            f"WHERE {' AND '.join(conditions)} "
+            f"ORDER BY created_at DESC, id DESC"
+        )
+        if limit is not None:
+            args.append(limit)
+            query += f" LIMIT ${len(args)}"
+
+        pool = await self.connect()
+        records = await pool.fetch(query, *args)
+        return [_record_to_row(record) for record in records]
+
+    async def iter_transcript_segments(
+        self, meeting_id: str, client_id: str, batch_size: int
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        meeting_uuid = _parse_uuid(meeting_id)
+        client_uuid = _parse_uuid(client_id)
+        if meeting_uuid is None or client_uuid is None:
+            return
+
+        pool = await self.connect()
+        transcription_ids = await pool.fetch(
+            "SELECT t.id FROM transcriptions t "
+            "JOIN meetings m ON m.id = t.meeting_id "
+            "WHERE t.meeting_id = $1 AND m.client_id = $2 "
+            "ORDER BY t.created_at, t.id",
+            meeting_uuid,
+            client_uuid,
+        )
+        # Each batch is a short keyset query on (transcription_id,
+        # segment_sequence), so no connection is held while batches are used
+        query = (
+            f"SELECT {', '.join(TRANSCRIPT_SEGMENT_COLUMNS)} "
+            f"FROM transcription_segments "
+            f"WHERE transcription_id = $1 AND segment_sequence > $2 "
+            f"ORDER BY segment_sequence LIMIT $3"
+        )
+        for transcription in transcription_ids:
+            after = -1
+            while True:
+                records = await pool.fetch(
+                    query, transcription["id"], after, batch_size
+                )
+                if not records:
+                    break
+                yield [_record_to_row(record) for record in records]
+                if len(records) < batch_size:
+                    break
+                after = records[-1]["segment_sequence"]
+
+
+class CachedContentStore(ContentStore):
+    """Store wrapper that serves content reads through a read-through cache
+
+    Every write that can change an existing content row invalidates its entry
+    here, so no call site has to remember to. Inserts never replace an
+    existing row, so they leave the cache alone.
+    """
+
+    def __init__(self, store: ContentStore, cache: ContentCache):
+        self.store = store
+        self.cache = cache
+
+    async def insert_content(self, row: Dict[str, Any]) -> None:
+        await self.store.insert_content(row)
+
+    async def insert_contents(self, rows: List[Dict[str, Any]]) -> None:
+        await self.store.insert_contents(rows)
+
+    async def get_content(self, content_id: str) -> Optional[Dict[str, Any]]:
+        row = await self.cache.get(content_id)
+        if row is not None:
+            return row
+
+        token = await self.cache.write_token(content_id)
+        row = await self.store.get_content(content_id)
+        if row is not None:
+            await self.cache.fill(content_id, row, token)
+        return row
+
+    async def update_content(
+        self,
+        content_id: str,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            return await self.store.update_content(
+                content_id, changes, expected_version
+            )
+        finally:
+            await self.cache.invalidate(content_id)
+
+    async def list_content(
+        self,
+        client_id: str,
+        content_type: Optional[str],
+        status: Optional[str],
+        limit: int,
+        offset: int = 0,
+        after: Optional[Keyset] = None,
+    ) -> List[Dict[str, Any]]:
+        return await self.store.list_content(
+            client_id, content_type, status, limit, offset, after
+        )
+
+    async def insert_template(self, row: Dict[str, Any]) -> None:
+        await self.store.insert_template(row)
+
+    async def get_template(self, template_id: str) -> Optional[Dict[str, Any]]:
+        return await self.store.get_template(template_id)
+
+    async def list_templates(
+        self,
+        client_id: str,
+        content_type: Optional[str],
+        limit: Optional[int] = None,
+        after: Optional[Keyset] = None,
+    ) -> List[Dict[str, Any]]:
+        return await self.store.list_templates(client_id, content_type, limit, after)
+
+    def iter_transcript_segments(
+        self, meeting_id: str, client_id: str, batch_size: int
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        return self.store.iter_transcript_segments(meeting_id, client_id, batch_size)
+
+    async def close(self) -> None:
+        await self.store.close()
+
+
+def create_content_store() -> ContentStore:
+    """Create the store configured through environment variables"""
+    config = DatabaseConfig.from_env()
+    if config is None:
+        logger.warning("DATABASE_URL not set, using in-memory content store")
+        return InMemoryContentStore()
+    return PostgresContentStore(config)
@@ -0,0 +1,184 @@
+"""
+Request deadlines and client-disconnect cancellation for the Content Creation
+Service.
+
+Every HTTP request runs under a deadline: the caller may ask for a shorter
+(or, up to a ceiling, longer) one in the X-Request-Timeout header, otherwise
+the route's default applies. The request is handled in its own task while the
+middleware owns the connection's receive channel, so it notices as soon as the
+client goes away. When the deadline passes or the client disconnects, the
+handler task is cancelled; the cancellation travels down through the
+generation scheduler slot and into the LLM provider's HTTP call, so no work
+continues for an answer nobody will read. Requests carrying an Idempotency-Key
+are the exception: they run to the end so that a retry can collect the answer.
+Writes to the store are wrapped in
+finish_before_cancel, so a cancellation never lands between a row being
+written and its caches being updated.
+"""
+
+import asyncio
+import logging
+import math
+import re
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+
+import orjson
+from metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+TIMEOUT_HEADER = "x-request-timeout"
+
+# Status recorded for requests the client abandoned, as nginx does
+CLIENT_CLOSED_REQUEST = 499
+
+
+def parse_route_timeouts(value: str) -> List[Tuple[str, "re.Pattern[str]", float]]:
+    """Parse "METHOD /path/{param}=seconds" pairs, comma separated"""
+    routes = []
+    for pair in value.split(","):
+        if not pair.strip():
+            continue
+        route, _, seconds = pair.rpartition("=")
+        method, _, path = route.strip().partition(" ")
+        pattern = re.sub(r"\\{[^/]+?\\}", "[^/]+", re.escape(path.strip()))
+        routes.append((method.upper(), re.compile(f"^{pattern}$"), float(seconds)))
+    return routes
+
+
+async def finish_before_cancel(awaitable: Awaitable[T]) -> T:
+    """Await a write so that cancelling the caller cannot interrupt it
+
+    If the caller is cancelled meanwhile, the write still runs to the end and
+    the cancellation is raised afterwards.
+    """
+    task = asyncio.ensure_future(awaitable)
+    cancelled = False
+    while True:
+        try:
+            result = await asyncio.shield(task)
+            break
+        except asyncio.CancelledError:
+            if task.done():
+                raise
+            cancelled = True
+    if cancelled:
+        raise asyncio.CancelledError()
+    return result
+
+
+class DeadlineMiddleware:
+    """ASGI middleware cancelling requests on deadline or client disconnect
+
+    A request cancelled before its response started is answered with 504 on
+    deadline, or 499 on disconnect so that request metrics record it; the
+    server discards that answer as the client is gone. Once a (streaming)
+    response has started it is cut short instead.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        counter: Counter,
+        default_timeout: float = 120.0,
+        max_timeout: float = 600.0,
+        route_timeouts: str = "",
+    ):
+        self.app = app
+        self.counter = counter
+        self.default_timeout = default_timeout
+        self.max_timeout = max_timeout
+        self.route_timeouts = parse_route_timeouts(route_timeouts)
+
+    def timeout_for(self, scope: Dict[str, Any]) -> Optional[float]:
+        """Deadline in seconds for a request, or None for no deadline"""
+        for name, value in scope["headers"]:
+            if name == TIMEOUT_HEADER.encode():
+                try:
+                    requested = float(value.decode("latin-1"))
+                except ValueError:
+                    break
+                if requested > 0 and math.isfinite(requested):
+                    return min(requested, self.max_timeout)
+                break
+
+        for method, pattern, seconds in self.route_timeouts:
+            if method == scope["method"] and pattern.match(scope["path"]):
+                return seconds if seconds > 0 else None
+        return self.default_timeout if self.default_timeout > 0 else None
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timeout = self.timeout_for(scope)
+        messages: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        response_started = False
+        response_complete = False
+        reason: Optional[str] = None
+
+        async def send_tracked(message: Dict[str, Any]) -> None:
+            nonlocal response_started, response_complete
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body":
+                response_complete = not message.get("more_body", False)
+            await send(message)
+
+        handler = asyncio.ensure_future(self.app(scope, messages.get, send_tracked))
+
+        async def watch_for_disconnect() -> None:
+            # The only reader of receive; the handler gets messages through
+            # the queue, so the disconnect is seen even while it is busy
+            nonlocal reason
+            while True:
+                message = await receive()
+                await messages.put(message)
+                if message["type"] == "http.disconnect":
+                    if not response_complete and not handler.done():
+                        reason = "disconnect"
+                        handler.cancel()
+                    return
+
+        watcher = asyncio.ensure_future(watch_for_disconnect())
+        try:
+            await asyncio.wait({handler}, timeout=timeout)
+            if not handler.done():
+                reason = "deadline"
+                handler.cancel()
+                await asyncio.wait({handler})
+        except asyncio.CancelledError:
+            handler.cancel()
+            raise
+        finally:
+            watcher.cancel()
+
+        if reason is None or not handler.cancelled():
+            return handler.result()
+
+        self.counter.inc(reason)
+        logger.warning(
+            "Request %s %s cancelled: %s", scope["method"], scope["path"], reason
+        )
+        if response_started:
+            return
+        status_code, detail = (
+            (504, "Request deadline exceeded")
+            if reason == "deadline"
+            else (CLIENT_CLOSED_REQUEST, "Client closed request")
+        )
+        body = orjson.dumps({"detail": detail})
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status_code,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,60 @@
+"""
+Degraded-mode policy for the Content Creation Service.
+
+During an incident it is better to hand out a fast draft than to time out.
+Requests that opt in with allow_degraded are answered with the deterministic
+template-based fallback content instead of a generation while the provider's
+circuit is open, too many generations are waiting for a slot, or recent
+provider calls have become too slow. The draft is flagged in its metadata and
+regenerated in the background once the service has recovered.
+"""
+
+import os
+from collections.abc import Callable
+from typing import Optional
+
+from llm import LLMProvider
+
+
+class DegradationPolicy:
+    """Decide whether opted-in requests should get fallback content now
+
+    A threshold of zero or less disables that check.
+    """
+
+    def __init__(
+        self,
+        queue_depth: Callable[[], int],
+        provider: Callable[[], Optional[LLMProvider]],
+        max_queue_depth: int = 50,
+        max_latency: float = 30.0,
+    ):
+        self.queue_depth = queue_depth
+        self.provider = provider
+        self.max_queue_depth = max_queue_depth
+        self.max_latency = max_latency
+
+    def reason(self) -> Optional[str]:
+        """Why the service is degraded, or None when it is healthy"""
+        provider = self.provider()
+        if provider is not None and provider.circuit.is_open:
+            return "circuit_open"
+        if 0 < self.max_queue_depth <= self.queue_depth():
+            return "queue_depth"
+        if provider is not None and self.max_latency > 0:
+            latency = provider.call_latency.value
+            if latency is not None and latency >= self.max_latency:
+                return "latency"
+        return None
+
+
+def create_degradation_policy(
+    queue_depth: Callable[[], int], provider: Callable[[], Optional[LLMProvider]]
+) -> DegradationPolicy:
+    """Create the degradation policy configured through environment variables"""
+    return DegradationPolicy(
+        queue_depth,
+        provider,
+        max_queue_depth=int(os.getenv("DEGRADED_MAX_QUEUE_DEPTH", 50)),
+        max_latency=float(os.getenv("DEGRADED_MAX_LATENCY_SECONDS", 30)),
+    )
@@ -0,0 +1,209 @@
+"""
+Conditional requests and response compression for the Content Creation Service.
+
+A pure ASGI middleware buffers complete (non-streaming) responses, tags GET
+responses with a strong ETag computed from the body, answers a matching
+If-None-Match with 304 Not Modified, and compresses bodies above a size
+threshold with the best encoding the client accepts. Streaming responses,
+such as server-sent events, pass through untouched.
+"""
+
+import gzip
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+Message = Dict[str, Any]
+Send = Callable[[Message], Awaitable[None]]
+
+# Preferred first when the client weights them equally
+SUPPORTED_ENCODINGS: Tuple[str, ...] = (
+    ("br", "gzip") if brotli is not None else ("gzip",)
+)
+
+
+def negotiate_encoding(
+    accept_encoding: str, supported: Sequence[str] = SUPPORTED_ENCODINGS
+) -> Optional[str]:
+    """Pick the supported encoding with the highest q-value, if any"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        weights[coding] = quality
+
+    best: Optional[str] = None
+    best_quality = 0.0
+    for coding in supported:
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag
+
+    Tags are compared without their content-coding suffix: a client holding
+    the gzip form of an unchanged body still holds a valid representation.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.strip('"').split("-", 1)[0]
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"').split("-", 1)[0] == opaque:
+            return True
+    return False
+
+
+def compress(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class HTTPCachingMiddleware:
+    """ETags, 304 Not Modified and negotiated compression for buffered responses"""
+
+    def __init__(
+        self,
+        app: Any,
+        etag_paths: Sequence[str] = (),
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.etag_paths = tuple(etag_paths)
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def wants_etag(self, scope: Message) -> bool:
+        if scope["method"] != "GET":
+            return False
+        path = scope["path"]
+        return any(
+            path == prefix or path.startswith(prefix + "/")
+            for prefix in self.etag_paths
+        )
+
+    async def __call__(self, scope: Message, receive: Any, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""))
+        use_etag = self.wants_etag(scope)
+        if encoding is None and not use_etag:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        streaming = False
+
+        async def buffered_send(message: Message) -> None:
+            nonlocal start, streaming
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if streaming or message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+            if message.get("more_body", False):
+                # Streamed body: flush the headers and relay chunks as they come
+                streaming = True
+                await send(start)
+                await send(message)
+                return
+            await self.send_buffered(
+                start,
+                message.get("body", b""),
+                request_headers,
+                encoding,
+                use_etag,
+                send,
+            )
+
+        await self.app(scope, receive, buffered_send)
+
+    async def send_buffered(
+        self,
+        start: Message,
+        body: bytes,
+        request_headers: Headers,
+        encoding: Optional[str],
+        use_etag: bool,
+        send: Send,
+    ) -> None:
+        status_code = start["status"]
+        headers = MutableHeaders(raw=list(start["headers"]))
+        negotiable = (
+            200 <= status_code < 300
+            and status_code != 204
+            and len(body) >= self.minimum_size
+            and "content-encoding" not in headers
+            and not headers.get("content-type", "").startswith("text/event-stream")
+        )
+        compressible = negotiable and encoding is not None
+        if negotiable:
+            # The representation depends on Accept-Encoding even when this
+            # client gets it uncompressed, so shared caches must key on it
+            headers.add_vary_header("Accept-Encoding")
+
+        etag: Optional[str] = None
+        if use_etag and status_code == 200:
+            etag = compute_etag(body)
+            if compressible:
+                # Each encoding is a different representation, so a different tag
+                etag = f'{etag[:-1]}-{encoding}"'
+
+            if_none_match = request_headers.get("if-none-match")
+            if if_none_match is not None and etag_matches(if_none_match, etag):
+                del headers["content-length"]
+                del headers["content-type"]
+                headers["etag"] = etag
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": 304,
+                        "headers": headers.raw,
+                    }
+                )
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        if compressible:
+            body = compress(body, encoding, self.gzip_level, self.brotli_quality)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(body))
+
+        if etag is not None:
+            headers["etag"] = etag
+
+        await send({**start, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body})
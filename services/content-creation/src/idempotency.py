@@ -0,0 +1,211 @@
+"""
+Idempotency keys for the Content Creation Service's create endpoints.
+
+Clients and gateways retry POSTs that timed out, and without a key every
+retry starts another generation and writes another row. A request carrying an
+Idempotency-Key is recorded per user and route: the first request claims the
+key by atomically setting an in-progress marker in the backend, and a retry
+with the same key waits for it (through a SingleFlight in the same worker, or
+by polling the marker when another worker holds it). A keyed request runs to
+the end even if its client disconnects, so that the retry can pick up its
+result. Once it has succeeded, the stored response is replayed until the
+record expires. Failed requests are not recorded, so they can be retried. Reusing a key for a different request
+body is rejected.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+from collections.abc import Awaitable, Callable
+from typing import Annotated, Any, Dict, Optional, Set, Tuple
+
+from cache import CacheBackend, InMemoryCache, create_cache_backend
+from fastapi import Header, HTTPException, Response, status
+from pydantic import BaseModel
+from singleflight import SingleFlight
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+VALID_IDEMPOTENCY_KEY = re.compile(r"^[\x21-\x7e]{1,255}$")
+
+# Endpoint parameter reading the optional Idempotency-Key header
+IdempotencyKeyHeader = Annotated[Optional[str], Header(alias=IDEMPOTENCY_KEY_HEADER)]
+
+
+class IdempotencyConflictError(ValueError):
+    """Raised when an idempotency key is reused for a different request"""
+
+
+class IdempotencyStore:
+    """TTL'd record of in-progress and completed requests by idempotency key"""
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        locks: Optional[CacheBackend] = None,
+        ttl: float = 86400,
+        lock_ttl: float = 600,
+        poll_interval: float = 0.1,
+    ):
+        self.backend = backend
+        # In-progress markers, by default stored alongside the records
+        self.locks = backend if locks is None else locks
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self.flights = SingleFlight()
+        self.replays = 0
+        self._running: Set["asyncio.Task[Tuple[Dict[str, Any], bool]]"] = set()
+
+    @staticmethod
+    def key_for(route: str, user_id: str, idempotency_key: str) -> str:
+        scoped = f"{route}\n{user_id}\n{idempotency_key}"
+        return "idempotency:" + hashlib.sha256(scoped.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def lock_key_for(key: str) -> str:
+        return f"{key}:in-progress"
+
+    @staticmethod
+    def fingerprint(body: str) -> str:
+        return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+    async def run(
+        self,
+        key: str,
+        fingerprint: str,
+        fn: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Run fn once per key, returning its response and whether it was replayed"""
+        leader = False
+
+        async def execute() -> Tuple[Dict[str, Any], bool]:
+            nonlocal leader
+            leader = True
+            # Keep going when the caller is cancelled, say by a gateway timeout
+            # disconnecting the client, so its retry finds the request still
+            # claimed, or finished, instead of starting it again
+            task = asyncio.ensure_future(self._execute(key, fingerprint, fn))
+            self._running.add(task)
+            task.add_done_callback(self._finished)
+            return await asyncio.shield(task)
+
+        record, fresh = await self.flights.do(key, execute)
+        if record["fingerprint"] != fingerprint:
+            raise IdempotencyConflictError(
+                "Idempotency key was already used for a different request"
+            )
+
+        replayed = not (leader and fresh)
+        if replayed:
+            self.replays += 1
+        return record["response"], replayed
+
+    async def respond(
+        self,
+        route: str,
+        idempotency_key: Optional[str],
+        request_model: BaseModel,
+        response: Response,
+        user_id: str,
+        create: Callable[[], Awaitable[BaseModel]],
+    ) -> Any:
+        """Run a create endpoint once per Idempotency-Key, replaying its response
+
+        Requests without a key simply run. Replays are marked with an
+        Idempotent-Replayed response header.
+        """
+        if idempotency_key is None:
+            return await create()
+        if not VALID_IDEMPOTENCY_KEY.match(idempotency_key):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid Idempotency-Key header",
+            )
+
+        async def create_and_dump() -> Dict[str, Any]:
+            return (await create()).model_dump(mode="json")
+
+        try:
+            body, replayed = await self.run(
+                self.key_for(route, user_id, idempotency_key),
+                self.fingerprint(request_model.model_dump_json()),
+                create_and_dump,
+            )
+        except IdempotencyConflictError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+            )
+
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
+        return body
+
+    async def _execute(
+        self,
+        key: str,
+        fingerprint: str,
+        fn: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Tuple[Dict[str, Any], bool]:
+        # Claim the key atomically. If another worker holds it, wait until its
+        # request finishes or its marker expires
+        lock_key = self.lock_key_for(key)
+        marker = {"state": "in_progress", "fingerprint": fingerprint}
+        while True:
+            record = await self.backend.get(key)
+            if record is not None:
+                return record, False
+            if await self.locks.set_if_absent(lock_key, marker, self.lock_ttl):
+                break
+            held = await self.locks.get(lock_key)
+            if held is None:
+                continue  # Released or expired in between: claim it again
+            if held["fingerprint"] != fingerprint:
+                return held, False
+            await asyncio.sleep(self.poll_interval)
+
+        try:
+            # The holder before us may have finished just before our claim
+            record = await self.backend.get(key)
+            if record is not None:
+                return record, False
+
+            record = {
+                "state": "completed",
+                "fingerprint": fingerprint,
+                "response": await fn(),
+            }
+            await self.backend.set(key, record, self.ttl)
+            return record, True
+        finally:
+            await self.locks.delete(lock_key)
+
+    def _finished(self, task: "asyncio.Task[Any]") -> None:
+        self._running.discard(task)
+        # Mark the outcome as retrieved even if every caller has gone away
+        if not task.cancelled():
+            task.exception()
+
+
+def create_idempotency_store() -> IdempotencyStore:
+    """Create the idempotency store configured through environment variables"""
+    name = os.getenv("IDEMPOTENCY_BACKEND", "memory")
+    backend = create_cache_backend(
+        name,
+        max_entries=int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", 10000)),
+        prefix="content-creation:idempotency:",
+    )
+    # In-process markers get their own bound, so a run of completed requests
+    # cannot evict the marker of one still in progress
+    locks = None
+    if name.lower() == "memory":
+        locks = InMemoryCache(
+            max_entries=int(os.getenv("IDEMPOTENCY_MAX_IN_PROGRESS", 10000))
+        )
+    return IdempotencyStore(
+        backend,
+        locks,
+        ttl=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", 86400)),
+        lock_ttl=float(os.getenv("IDEMPOTENCY_LOCK_SECONDS", 600)),
+    )
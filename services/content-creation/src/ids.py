@@ -0,0 +1,147 @@
+"""
+Row id generation for the Content Creation Service.
+
+Ids are time-ordered, so new rows land at the right-hand edge of the primary
+key B-tree and ids sort in creation order, and they are unique across
+processes without coordination. Each generator is monotonic within a
+process: ids created later always compare greater.
+"""
+
+import hashlib
+import os
+import secrets
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import List
+
+# Crockford's base32 alphabet, whose character order matches ASCII order
+CROCKFORD_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+# Custom epoch for snowflake ids, 2024-01-01T00:00:00Z in milliseconds
+SNOWFLAKE_EPOCH_MS = 1704067200000
+SNOWFLAKE_WORKER_BITS = 10
+SNOWFLAKE_SEQUENCE_BITS = 12
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+class IdGenerator(ABC):
+    """Source of sortable, unique row ids"""
+
+    @abstractmethod
+    def new_id(self) -> str:
+        """Return an id greater than every id this generator returned before"""
+
+    def new_ids(self, count: int) -> List[str]:
+        """Return count ascending ids"""
+        return [self.new_id() for _ in range(count)]
+
+    def prefixed(self, prefix: str) -> str:
+        """Return a new id as prefix_<id>"""
+        return f"{prefix}_{self.new_id()}"
+
+    def prefixed_many(self, prefix: str, count: int) -> List[str]:
+        """Return count ascending ids as prefix_<id>"""
+        return [f"{prefix}_{new_id}" for new_id in self.new_ids(count)]
+
+
+class UlidGenerator(IdGenerator):
+    """26-character ULIDs: a 48-bit millisecond time and 80 random bits
+
+    The random part makes collisions across processes vanishingly unlikely.
+    Within a millisecond the previous random part is incremented instead of
+    redrawn, which keeps ids from one process strictly increasing.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._last_random = 0
+
+    def new_id(self) -> str:
+        with self._lock:
+            now = _now_ms()
+            if now > self._last_ms:
+                self._last_ms = now
+                self._last_random = secrets.randbits(80)
+            else:
+                # Same millisecond, or the clock stepped back: keep counting up
+                self._last_random += 1
+                if self._last_random >= 1 << 80:
+                    self._last_ms += 1
+                    self._last_random = 0
+            value = (self._last_ms << 80) | self._last_random
+
+        return "".join(
+            CROCKFORD_ALPHABET[(value >> shift) & 31] for shift in range(125, -5, -5)
+        )
+
+
+class SnowflakeGenerator(IdGenerator):
+    """64-bit snowflake ids: millisecond time, worker id and sequence
+
+    Uniqueness across processes relies on every process having a distinct
+    worker id. Ids are zero-padded decimals so string order matches numeric
+    order.
+    """
+
+    MAX_WORKER_ID = (1 << SNOWFLAKE_WORKER_BITS) - 1
+    MAX_SEQUENCE = (1 << SNOWFLAKE_SEQUENCE_BITS) - 1
+
+    def __init__(self, worker_id: int):
+        if not 0 <= worker_id <= self.MAX_WORKER_ID:
+            raise ValueError(f"Worker id must be between 0 and {self.MAX_WORKER_ID}")
+        self.worker_id = worker_id
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._sequence = 0
+
+    def new_id(self) -> str:
+        with self._lock:
+            now = max(_now_ms(), self._last_ms)
+            if now == self._last_ms:
+                self._sequence = (self._sequence + 1) & self.MAX_SEQUENCE
+                if self._sequence == 0:
+                    # Sequence exhausted for this millisecond
+                    while now <= self._last_ms:
+                        now = _now_ms()
+            else:
+                self._sequence = 0
+            self._last_ms = now
+            value = (
+                (now - SNOWFLAKE_EPOCH_MS)
+                << (SNOWFLAKE_WORKER_BITS + SNOWFLAKE_SEQUENCE_BITS)
+                | self.worker_id << SNOWFLAKE_SEQUENCE_BITS
+                | self._sequence
+            )
+
+        return f"{value:019d}"
+
+
+def default_worker_id() -> int:
+    """Derive a worker id from the host name and process id
+
+    Hashing can map two processes to the same id, so deployments running
+    many snowflake workers should set CONTENT_ID_WORKER_ID explicitly.
+    """
+    seed = f"{socket.gethostname()}:{os.getpid()}".encode("utf-8")
+    digest = hashlib.sha256(seed).digest()
+    return int.from_bytes(digest[:4], "big") % (SnowflakeGenerator.MAX_WORKER_ID + 1)
+
+
+def create_id_generator() -> IdGenerator:
+    """Create the id generator configured through environment variables"""
+    name = os.getenv("CONTENT_ID_GENERATOR", "ulid").lower()
+
+    if name == "ulid":
+        return UlidGenerator()
+    if name == "snowflake":
+        worker_id = os.getenv("CONTENT_ID_WORKER_ID")
+        return SnowflakeGenerator(
+            int(worker_id) if worker_id is not None else default_worker_id()
+        )
+    raise ValueError(f"Unknown CONTENT_ID_GENERATOR: {name}")
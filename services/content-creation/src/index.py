@@ -1,28 +1,59 @@
+import asyncio
+import json
 import logging
 import os
-from datetime import datetime
-from typing import Any, Dict, List, Optional
-
-import uvicorn
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from cache import create_content_cache, create_generation_cache
+from db import CachedContentStore, InvalidReferenceError, create_content_store
+from deadlines import DeadlineMiddleware, finish_before_cancel
+from degraded import create_degradation_policy
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from pydantic import BaseModel, Field
-
-# Removed unused imports: asyncio, aiohttp, json
+from http_caching import HTTPCachingMiddleware
+from idempotency import IdempotencyKeyHeader, create_idempotency_store
+from ids import create_id_generator
+from jobs import JobQueue, QueueFullError, create_job_queue
+from llm import BatchingProvider, close_llm_provider, get_llm_provider
+from logs import RequestIdMiddleware, configure_logging
+from longform import LongFormGenerator, create_longform_generator
+from meetings import TranscriptNotFoundError, create_meeting_summarizer
+from metrics import CONTENT_TYPE, MetricsMiddleware, MetricsRegistry
+from pagination import InvalidCursorError, decode_cursor, next_cursor
+from pydantic import BaseModel, Field, model_validator
+from scheduler import AdmissionError, create_generation_scheduler
+from serialization import TrustedJSONResponse, project_rows
+from singleflight import SingleFlight
+from templating import TemplateError, compile_template, create_template_cache
+from transcripts import create_transcript_compressor
+
+# Removed unused imports: aiohttp
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+# Configure logging: plain, or structured JSON written off the event loop
+logging_setup = configure_logging()
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background resources with the application"""
+    yield
+    await job_queue.stop()
+    await upgrade_queue.stop()
+    await close_llm_provider()
+    await content_store.close()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Qylon Content Creation Service",
@@ -30,11 +61,187 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Security
 security = HTTPBearer()
 
+# Batch generation settings
+BATCH_MAX_ITEMS = int(os.getenv("CONTENT_BATCH_MAX_ITEMS", 100))
+BATCH_MAX_CONCURRENCY = int(os.getenv("CONTENT_BATCH_MAX_CONCURRENCY", 8))
+
+# Most alternative versions generated for a single content request
+CONTENT_MAX_VARIANTS = int(os.getenv("CONTENT_MAX_VARIANTS", 5))
+
+# Returned when a client, user, meeting or template id is malformed or unknown
+INVALID_REFERENCE_DETAIL = "Unknown or invalid client, user, meeting or template id"
+
+# Largest page returned by the cursor-paginated list endpoints
+LIST_MAX_PAGE_SIZE = int(os.getenv("CONTENT_LIST_MAX_PAGE_SIZE", 200))
+
+# Simulated generation time of the mock AI backend
+MOCK_GENERATION_SECONDS = 2
+
+# Completion budget requested from the LLM provider for each length
+MAX_TOKENS_BY_LENGTH = {"short": 300, "medium": 800, "long": 2000}
+
+# Content types written from the meeting transcript when a meeting is given
+MEETING_CONTENT_TYPES = ("summary", "report")
+
+# Content types written outline-first, section by section, when long
+LONG_FORM_CONTENT_TYPES = ("article", "report")
+
+# Content and template persistence, with content reads served from a cache
+content_cache = create_content_cache()
+content_store = CachedContentStore(create_content_store(), content_cache)
+id_generator = create_id_generator()
+
+# Cache of generated content shared by all generation endpoints
+generation_cache = create_generation_cache()
+
+# Identical generations in flight at the same time share one call
+generation_flights = SingleFlight()
+
+# Per-client rate limits and fair sharing of generation capacity
+generation_scheduler = create_generation_scheduler()
+
+# Meeting transcripts compressed to a token budget, cached per meeting
+transcript_compressor = create_transcript_compressor()
+
+# Responses of create requests sent with an Idempotency-Key, replayed on retry
+idempotency_store = create_idempotency_store()
+
+# Compiled templates, keyed on template id and content hash
+template_cache = create_template_cache()
+TEMPLATE_RENDER_MAX_ITEMS = int(os.getenv("TEMPLATE_RENDER_MAX_ITEMS", 5000))
+
+# Background queue for asynchronous content jobs
+job_queue = create_job_queue()
+JOB_RETRY_AFTER_SECONDS = 5
+
+# Fallback content for opted-in requests while generation is overloaded, and
+# the background queue regenerating it once the service has recovered
+degradation_policy = create_degradation_policy(
+    lambda: generation_scheduler.queued, get_llm_provider
+)
+upgrade_queue = JobQueue(
+    workers=int(os.getenv("DEGRADED_UPGRADE_WORKERS", 2)),
+    max_queue_size=int(os.getenv("DEGRADED_UPGRADE_QUEUE_SIZE", 1000)),
+)
+DEGRADED_UPGRADE_RETRY_SECONDS = float(os.getenv("DEGRADED_UPGRADE_RETRY_SECONDS", 10))
+
+# Prometheus metrics; gauges are read from the live objects at scrape time
+metrics_registry = MetricsRegistry()
+REQUEST_SECONDS = metrics_registry.histogram(
+    "content_creation_http_request_duration_seconds",
+    "HTTP request latency by method, route and status",
+    ("method", "route", "status"),
+)
+STAGE_SECONDS = metrics_registry.histogram(
+    "content_creation_stage_duration_seconds",
+    "Time spent in each stage of content creation",
+    ("stage",),
+)
+DEGRADED_RESPONSES = metrics_registry.counter(
+    "content_creation_degraded_responses_total",
+    "Requests answered with fallback content, by reason",
+    ("reason",),
+)
+DEGRADED_UPGRADES = metrics_registry.counter(
+    "content_creation_degraded_upgrades_total",
+    "Background regenerations of fallback content, by outcome",
+    ("outcome",),
+)
+REQUESTS_CANCELLED = metrics_registry.counter(
+    "content_creation_requests_cancelled_total",
+    "Requests cancelled before completing, by reason",
+    ("reason",),
+)
+metrics_registry.gauge_callback(
+    "content_creation_generations_running",
+    "Generations holding a scheduler slot",
+    lambda: generation_scheduler.running,
+)
+metrics_registry.gauge_callback(
+    "content_creation_generations_in_flight",
+    "Distinct generations in flight, after coalescing identical requests",
+    lambda: len(generation_flights),
+)
+metrics_registry.gauge_callback(
+    "content_creation_queue_depth",
+    "Work waiting in each queue",
+    lambda: {
+        ("generation",): generation_scheduler.queued,
+        ("jobs",): job_queue.depth,
+        ("upgrades",): upgrade_queue.depth,
+    },
+    ("queue",),
+)
+metrics_registry.gauge_callback(
+    "content_creation_degraded_mode",
+    "Whether opted-in requests currently get fallback content",
+    lambda: 0 if degradation_policy.reason() is None else 1,
+)
+metrics_registry.counter_callback(
+    "content_creation_generation_rejections_total",
+    "Generation requests turned away by the scheduler",
+    lambda: {
+        ("rate_limited",): generation_scheduler.rate_limited,
+        ("capacity",): generation_scheduler.rejected,
+    },
+    ("reason",),
+)
+metrics_registry.counter_callback(
+    "content_creation_cache_hits_total",
+    "Cache lookups that found an entry",
+    lambda: {(name,): cache.hits for name, cache in caches_by_name().items()},
+    ("cache",),
+)
+metrics_registry.counter_callback(
+    "content_creation_cache_misses_total",
+    "Cache lookups that found nothing",
+    lambda: {(name,): cache.misses for name, cache in caches_by_name().items()},
+    ("cache",),
+)
+metrics_registry.gauge_callback(
+    "content_creation_cache_hit_ratio",
+    "Share of cache lookups that found an entry since start",
+    lambda: {
+        (name,): cache.hits / (cache.hits + cache.misses)
+        for name, cache in caches_by_name().items()
+        if cache.hits + cache.misses
+    },
+    ("cache",),
+)
+metrics_registry.counter_callback(
+    "content_creation_idempotent_replays_total",
+    "Create requests answered with the response to an earlier identical request",
+    lambda: idempotency_store.replays,
+)
+metrics_registry.counter_callback(
+    "content_creation_log_records_discarded_total",
+    "Log records not written, by reason",
+    lambda: {
+        ("queue_full",): logging_setup.stats()["dropped"],
+        ("sampled",): logging_setup.stats()["sampled_out"],
+    },
+    ("reason",),
+)
+
+
+def caches_by_name() -> Dict[str, Any]:
+    """Caches reported in the metrics"""
+    caches = {
+        "generation": generation_cache,
+        "content": content_cache,
+        "template": template_cache,
+    }
+    if transcript_compressor is not None:
+        caches["transcript"] = transcript_compressor
+    return caches
+
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -50,6 +257,33 @@ app.add_middleware(
     allowed_hosts=["*"],  # Configure properly for production
 )
 
+# ETags for the read endpoints, and compression of buffered responses
+app.add_middleware(
+    HTTPCachingMiddleware,
+    etag_paths=("/content", "/templates"),
+    minimum_size=int(os.getenv("CONTENT_COMPRESSION_MIN_BYTES", 1024)),
+    gzip_level=int(os.getenv("CONTENT_GZIP_LEVEL", 6)),
+    brotli_quality=int(os.getenv("CONTENT_BROTLI_QUALITY", 4)),
+)
+
+# Deadlines, and cancellation of requests whose client has gone away;
+# batches and streams get longer per-route defaults
+app.add_middleware(
+    DeadlineMiddleware,
+    counter=REQUESTS_CANCELLED,
+    default_timeout=float(os.getenv("REQUEST_TIMEOUT_SECONDS", 120)),
+    max_timeout=float(os.getenv("REQUEST_MAX_TIMEOUT_SECONDS", 600)),
+    route_timeouts=os.getenv(
+        "REQUEST_ROUTE_TIMEOUTS", "POST /content/batch=300,POST /content/stream=300"
+    ),
+)
+
+# Request ids for log correlation, echoed in X-Request-ID
+app.add_middleware(RequestIdMiddleware)
+
+# Request latency histograms, outermost so they cover every other layer
+app.add_middleware(MetricsMiddleware, histogram=REQUEST_SECONDS)
+
 # Pydantic models
 
 
@@ -67,6 +301,9 @@ class ContentRequest(BaseModel):
     meeting_id: Optional[str] = None
     template_id: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    bypass_cache: bool = False
+    allow_degraded: bool = False
+    variants: int = Field(default=1, ge=1, le=CONTENT_MAX_VARIANTS)
 
 
 class ContentResponse(BaseModel):
@@ -87,6 +324,43 @@ class ContentResponse(BaseModel):
     metadata: Optional[Dict[str, Any]]
 
 
+class ContentVariantsResponse(BaseModel):
+    variant_group: str
+    variants: List[ContentResponse]
+
+
+class BatchContentRequest(BaseModel):
+    items: List[ContentRequest] = Field(..., min_length=1, max_length=BATCH_MAX_ITEMS)
+
+
+class BatchContentItemResult(BaseModel):
+    index: int
+    success: bool
+    content: Optional[ContentResponse] = None
+    error: Optional[str] = None
+
+
+class BatchContentResponse(BaseModel):
+    results: List[BatchContentItemResult]
+    succeeded: int
+    failed: int
+
+
+class ContentJobAccepted(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+
+
+class ContentJobResponse(BaseModel):
+    id: str
+    status: str
+    created_at: datetime
+    updated_at: datetime
+    result: Optional[ContentResponse] = None
+    error: Optional[str] = None
+
+
 class ContentUpdateRequest(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     content: Optional[str] = None
@@ -119,6 +393,42 @@ class TemplateResponse(BaseModel):
     client_id: str
 
 
+class ContentPage(BaseModel):
+    items: List[ContentResponse]
+    next_cursor: Optional[str] = None
+
+
+class TemplatePage(BaseModel):
+    items: List[TemplateResponse]
+    next_cursor: Optional[str] = None
+
+
+class TemplateRenderRequest(BaseModel):
+    variables: Optional[Dict[str, Any]] = None
+    items: Optional[List[Dict[str, Any]]] = Field(
+        None, min_length=1, max_length=TEMPLATE_RENDER_MAX_ITEMS
+    )
+
+    @model_validator(mode="after")
+    def check_single_or_bulk(self) -> "TemplateRenderRequest":
+        if (self.variables is None) == (self.items is None):
+            raise ValueError("Provide exactly one of 'variables' or 'items'")
+        return self
+
+
+class TemplateRenderResult(BaseModel):
+    index: int
+    success: bool
+    content: Optional[str] = None
+    error: Optional[str] = None
+
+
+class TemplateRenderResponse(BaseModel):
+    template_id: str
+    content: Optional[str] = None
+    results: Optional[List[TemplateRenderResult]] = None
+
+
 # Authentication dependency
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -130,10 +440,14 @@ async def get_current_user(
         # token = credentials.credentials  # TODO: Use token for validation
 
         # In production, validate the JWT token with Supabase
-        # For now, we'll return a mock user
-        return {"id": "user-123", "email": "test@example.com", "role": "user"}
+        # For now, we'll return a mock user, with a UUID id like Supabase's
+        return {
+            "id": "00000000-0000-4000-8000-000000000123",
+            "email": "test@example.com",
+            "role": "user",
+        }
     except Exception as e:
-        logger.error(f"Authentication error: {str(e)}")
+        logger.error("Authentication error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
@@ -149,57 +463,361 @@ async def health_check():
         "service": "content-creation-service",
         "timestamp": datetime.utcnow().isoformat(),
         "version": "1.0.0",
+        "generation_cache": generation_cache.stats(),
+        "content_cache": content_cache.stats(),
+        "generations_in_flight": len(generation_flights),
+        "generation_scheduler": generation_scheduler.stats(),
+        "job_queue_depth": job_queue.depth,
+        "degraded_reason": degradation_policy.reason(),
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint"""
+    return Response(content=metrics_registry.render(), media_type=CONTENT_TYPE)
+
+
 # Content creation endpoints
 @app.post(
-    "/content", response_model=ContentResponse, status_code=status.HTTP_201_CREATED
+    "/content",
+    response_model=Union[ContentResponse, ContentVariantsResponse],
+    status_code=status.HTTP_201_CREATED,
 )
 async def create_content(
     content_request: ContentRequest,
+    response: Response,
+    idempotency_key: IdempotencyKeyHeader = None,
     current_user: dict = Depends(get_current_user),
 ):
-    """Create new content using AI"""
-    try:
-        logger.info(f"Creating content: {content_request.title}")
+    """Create new content using AI, or several alternatives of it"""
+    return await idempotency_store.respond(
+        "/content",
+        idempotency_key,
+        content_request,
+        response,
+        current_user["id"],
+        lambda: create_content_once(content_request, current_user),
+    )
 
-        # Generate content using AI
-        content = await generate_ai_content(content_request, current_user)
+
+async def create_content_once(
+    content_request: ContentRequest, current_user: dict
+) -> Union[ContentResponse, ContentVariantsResponse]:
+    """Create content for a request, with errors mapped to HTTP errors"""
+    try:
+        logger.info("Creating content: %s", content_request.title)
+        generation_scheduler.admit(
+            content_request.client_id, cost=content_request.variants
+        )
+        if content_request.variants > 1:
+            return await create_content_variants(content_request, current_user)
+
+        # Generate content using AI, or serve a draft while degraded
+        degraded = degraded_request(content_request)
+        if degraded is not None:
+            content_request = degraded
+            content = build_fallback_content(content_request)
+        else:
+            content = await generate_content(content_request, current_user)
 
         # Save content to database
         content_id = await save_content(content_request, content, current_user)
+        if degraded is not None:
+            schedule_upgrade(content_id, content_request, content, current_user)
 
         # Create response
-        response = ContentResponse(
-            id=content_id,
-            title=content_request.title,
-            content_type=content_request.content_type,
-            topic=content_request.topic,
-            target_audience=content_request.target_audience,
-            tone=content_request.tone,
-            length=content_request.length,
-            content=content,
-            status="draft",
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
-            client_id=content_request.client_id,
-            meeting_id=content_request.meeting_id,
-            template_id=content_request.template_id,
-            metadata=content_request.metadata,
-        )
+        response = build_content_response(content_id, content_request, content)
 
-        logger.info(f"Content created successfully: {content_id}")
+        logger.info("Content created successfully: %s", content_id)
         return response
 
+    except AdmissionError as e:
+        raise admission_http_error(e)
+    except TranscriptNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except InvalidReferenceError as e:
+        raise invalid_reference_http_error(e)
     except Exception as e:
-        logger.error(f"Content creation error: {str(e)}")
+        logger.error("Content creation error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create content",
         )
 
 
+async def create_content_variants(
+    content_request: ContentRequest, current_user: dict
+) -> ContentVariantsResponse:
+    """Generate alternatives for a request and save them as linked drafts"""
+    contents = await generate_variants(content_request, current_user)
+
+    # Every variant records its group, position and the group size
+    variant_group = id_generator.prefixed("variants")
+    variant_requests = [
+        content_request.model_copy(
+            update={
+                "metadata": {
+                    **(content_request.metadata or {}),
+                    "variant_group": variant_group,
+                    "variant": number,
+                    "variants": len(contents),
+                }
+            }
+        )
+        for number in range(1, len(contents) + 1)
+    ]
+    content_ids = await save_content_batch(
+        list(zip(variant_requests, contents)), current_user
+    )
+
+    logger.info("Content variants created successfully: %s", variant_group)
+    return ContentVariantsResponse(
+        variant_group=variant_group,
+        variants=[
+            build_content_response(content_id, variant_request, content)
+            for content_id, variant_request, content in zip(
+                content_ids, variant_requests, contents
+            )
+        ],
+    )
+
+
+@app.post("/content/batch", response_model=BatchContentResponse)
+async def create_content_batch(
+    batch_request: BatchContentRequest,
+    current_user: dict = Depends(get_current_user),
+):
+    """Create several pieces of content in one request"""
+    require_single_variant(batch_request.items)
+    try:
+        logger.info("Creating content batch: %s items", len(batch_request.items))
+        items_per_client: Dict[str, float] = {}
+        for item in batch_request.items:
+            items_per_client[item.client_id] = (
+                items_per_client.get(item.client_id, 0) + 1
+            )
+        generation_scheduler.admit_many(items_per_client)
+
+        # Items allowed to degrade get drafts while generation is overloaded
+        degraded = [degraded_request(item) for item in batch_request.items]
+        items = [
+            degraded_item or item
+            for item, degraded_item in zip(batch_request.items, degraded)
+        ]
+
+        # Generate content through a bounded worker pool
+        semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+        async def generate_item(content_request: ContentRequest, draft: bool) -> str:
+            if draft:
+                return build_fallback_content(content_request)
+            async with semaphore:
+                return await generate_content(content_request, current_user)
+
+        generated = await asyncio.gather(
+            *(
+                generate_item(item, degraded_item is not None)
+                for item, degraded_item in zip(items, degraded)
+            ),
+            return_exceptions=True,
+        )
+
+        results: List[BatchContentItemResult] = []
+        to_save = []
+        for index, (item, content) in enumerate(zip(items, generated)):
+            if isinstance(content, BaseException):
+                logger.error("Batch item %s generation error: %s", index, content)
+                error = (
+                    str(content)
+                    if isinstance(content, TranscriptNotFoundError)
+                    else "Failed to generate content"
+                )
+                results.append(
+                    BatchContentItemResult(index=index, success=False, error=error)
+                )
+            else:
+                to_save.append((index, item, content))
+
+        # Save every generated item in a single database round-trip
+        if to_save:
+            try:
+                content_ids = await save_content_batch(
+                    [(item, content) for _, item, content in to_save], current_user
+                )
+            except Exception as e:
+                logger.error("Batch content save error: %s", e)
+                content_ids = None
+                save_error = (
+                    INVALID_REFERENCE_DETAIL
+                    if isinstance(e, InvalidReferenceError)
+                    else "Failed to save content"
+                )
+
+            for position, (index, item, content) in enumerate(to_save):
+                if content_ids is not None and degraded[index] is not None:
+                    schedule_upgrade(content_ids[position], item, content, current_user)
+                if content_ids is None:
+                    results.append(
+                        BatchContentItemResult(
+                            index=index, success=False, error=save_error
+                        )
+                    )
+                else:
+                    results.append(
+                        BatchContentItemResult(
+                            index=index,
+                            success=True,
+                            content=build_content_response(
+                                content_ids[position], item, content
+                            ),
+                        )
+                    )
+
+        results.sort(key=lambda result: result.index)
+        succeeded = sum(1 for result in results if result.success)
+
+        logger.info(
+            "Content batch finished: %s succeeded, %s failed",
+            succeeded,
+            len(results) - succeeded,
+        )
+        return BatchContentResponse(
+            results=results, succeeded=succeeded, failed=len(results) - succeeded
+        )
+
+    except AdmissionError as e:
+        raise admission_http_error(e)
+    except Exception as e:
+        logger.error("Batch content creation error: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create content batch",
+        )
+
+
+@app.post("/content/stream")
+async def create_content_stream(
+    content_request: ContentRequest,
+    current_user: dict = Depends(get_current_user),
+):
+    """Create new content using AI, streaming it as server-sent events"""
+    require_single_variant([content_request])
+    logger.info("Streaming content: %s", content_request.title)
+    try:
+        generation_scheduler.admit(content_request.client_id)
+    except AdmissionError as e:
+        raise admission_http_error(e)
+
+    degraded = degraded_request(content_request)
+    if degraded is not None:
+        content_request = degraded
+
+    async def event_stream() -> AsyncIterator[str]:
+        chunks: List[str] = []
+        try:
+            # Forward generated text as soon as each chunk arrives
+            source = (
+                stream_fallback_content(content_request)
+                if degraded is not None
+                else stream_content(content_request, current_user)
+            )
+            async for chunk in source:
+                chunks.append(chunk)
+                yield format_sse_event("chunk", json.dumps({"text": chunk}))
+
+            content = "".join(chunks).strip()
+
+            # Save content to database
+            content_id = await save_content(content_request, content, current_user)
+            if degraded is not None:
+                schedule_upgrade(content_id, content_request, content, current_user)
+
+            response = build_content_response(content_id, content_request, content)
+            logger.info("Content streamed successfully: %s", content_id)
+            yield format_sse_event("done", response.model_dump_json())
+
+        except TranscriptNotFoundError as e:
+            yield format_sse_event("error", json.dumps({"detail": str(e)}))
+        except InvalidReferenceError as e:
+            logger.warning("Content streaming rejected: %s", e)
+            yield format_sse_event(
+                "error", json.dumps({"detail": INVALID_REFERENCE_DETAIL})
+            )
+        except Exception as e:
+            logger.error("Content streaming error: %s", e)
+            yield format_sse_event(
+                "error", json.dumps({"detail": "Failed to create content"})
+            )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post(
+    "/content/jobs",
+    response_model=ContentJobAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_content_job(
+    content_request: ContentRequest,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
+):
+    """Queue content creation and return immediately with a job id"""
+
+    async def run_job() -> ContentResponse:
+        content = await generate_content(content_request, current_user)
+        content_id = await save_content(content_request, content, current_user)
+        logger.info("Content job created content: %s", content_id)
+        return build_content_response(content_id, content_request, content)
+
+    require_single_variant([content_request])
+    try:
+        generation_scheduler.admit(content_request.client_id)
+    except AdmissionError as e:
+        raise admission_http_error(e)
+
+    try:
+        job = job_queue.submit(current_user["id"], run_job)
+    except QueueFullError:
+        logger.warning("Content job queue is full")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Content job queue is full",
+            headers={"Retry-After": str(JOB_RETRY_AFTER_SECONDS)},
+        )
+
+    logger.info("Content job queued: %s", job.id)
+    status_url = f"/content/jobs/{job.id}"
+    response.headers["Location"] = status_url
+    return ContentJobAccepted(job_id=job.id, status=job.status, status_url=status_url)
+
+
+@app.get("/content/jobs/{job_id}", response_model=ContentJobResponse)
+async def get_content_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Get the status of an asynchronous content job"""
+    job = job_queue.get(job_id)
+
+    if not job or job.owner_id != current_user["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+
+    return ContentJobResponse(
+        id=job.id,
+        status=job.status,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        result=job.result,
+        error="Failed to create content" if job.error else None,
+    )
+
+
 @app.get("/content/{content_id}", response_model=ContentResponse)
 async def get_content(content_id: str, current_user: dict = Depends(get_current_user)):
     """Get content by ID"""
@@ -218,7 +836,7 @@ async def get_content(content_id: str, current_user: dict = Depends(get_current_
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Get content error: {str(e)}")
+        logger.error("Get content error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve content",
@@ -249,33 +867,53 @@ async def update_content(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Update content error: {str(e)}")
+        logger.error("Update content error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update content",
         )
 
 
-@app.get("/content", response_model=List[ContentResponse])
+@app.get("/content", response_model=Union[ContentPage, List[ContentResponse]])
 async def list_content(
     client_id: str,
     content_type: Optional[str] = None,
-    status: Optional[str] = None,
-    limit: int = 50,
-    offset: int = 0,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    limit: int = Query(50, ge=1),
+    offset: int = Query(0, ge=0),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
 ):
     """List content with filters"""
     try:
+        # Cursor pagination returns a page with the cursor of the next one;
+        # offset pagination keeps the legacy plain list
+        if pagination == "cursor" or cursor is not None:
+            page = await list_content_page_from_db(
+                client_id,
+                content_type,
+                status_filter,
+                min(limit, LIST_MAX_PAGE_SIZE),
+                cursor,
+                current_user,
+            )
+            with STAGE_SECONDS.time("serialize"):
+                return TrustedJSONResponse(page)
+
         # Retrieve content list from database
         content_list = await list_content_from_db(
-            client_id, content_type, status, limit, offset, current_user
+            client_id, content_type, status_filter, limit, offset, current_user
         )
 
-        return content_list
+        # Rows from the store already match the schema, so skip re-validation
+        with STAGE_SECONDS.time("serialize"):
+            return TrustedJSONResponse(content_list)
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
-        logger.error(f"List content error: {str(e)}")
+        logger.error("List content error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve content list",
@@ -288,14 +926,47 @@ async def list_content(
 )
 async def create_template(
     template_request: TemplateRequest,
+    response: Response,
+    idempotency_key: IdempotencyKeyHeader = None,
     current_user: dict = Depends(get_current_user),
 ):
     """Create new content template"""
+    return await idempotency_store.respond(
+        "/templates",
+        idempotency_key,
+        template_request,
+        response,
+        current_user["id"],
+        lambda: create_template_once(template_request, current_user),
+    )
+
+
+async def create_template_once(
+    template_request: TemplateRequest, current_user: dict
+) -> TemplateResponse:
+    """Create a template for a request, with errors mapped to HTTP errors"""
+    # Validate placeholders against the declared variables
+    try:
+        compiled = compile_template(
+            template_request.template_content, template_request.variables
+        )
+    except TemplateError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
+        )
+
     try:
-        logger.info(f"Creating template: {template_request.name}")
+        logger.info("Creating template: %s", template_request.name)
 
         # Save template to database
         template_id = await save_template(template_request, current_user)
+        template_cache.store(
+            template_id,
+            template_request.template_content,
+            template_request.variables,
+            compiled,
+        )
 
         # Create response
         response = TemplateResponse(
@@ -310,164 +981,727 @@ async def create_template(
             client_id=template_request.client_id,
         )
 
-        logger.info(f"Template created successfully: {template_id}")
+        logger.info("Template created successfully: %s", template_id)
         return response
 
+    except InvalidReferenceError as e:
+        raise invalid_reference_http_error(e)
     except Exception as e:
-        logger.error(f"Template creation error: {str(e)}")
+        logger.error("Template creation error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create template",
         )
 
 
-@app.get("/templates", response_model=List[TemplateResponse])
+@app.get("/templates", response_model=Union[TemplatePage, List[TemplateResponse]])
 async def list_templates(
     client_id: str,
     content_type: Optional[str] = None,
+    limit: int = Query(50, ge=1),
+    pagination: str = Query("all", pattern="^(all|cursor)$"),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
 ):
     """List templates with filters"""
     try:
+        # Cursor pagination is opt-in; the legacy response lists every template
+        if pagination == "cursor" or cursor is not None:
+            page = await list_templates_page_from_db(
+                client_id,
+                content_type,
+                min(limit, LIST_MAX_PAGE_SIZE),
+                cursor,
+                current_user,
+            )
+            with STAGE_SECONDS.time("serialize"):
+                return TrustedJSONResponse(page)
+
         # Retrieve templates from database
         templates = await list_templates_from_db(client_id, content_type, current_user)
 
-        return templates
+        with STAGE_SECONDS.time("serialize"):
+            return TrustedJSONResponse(templates)
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
-        logger.error(f"List templates error: {str(e)}")
+        logger.error("List templates error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve templates",
         )
 
 
+@app.post("/templates/{template_id}/render", response_model=TemplateRenderResponse)
+async def render_template(
+    template_id: str,
+    render_request: TemplateRenderRequest,
+    current_user: dict = Depends(get_current_user),
+):
+    """Render a template with one or many sets of variables"""
+    try:
+        template = await retrieve_template(template_id, current_user)
+
+        if not template:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Template not found",
+            )
+
+        compiled = template_cache.get_or_compile(
+            template.id, template.template_content, template.variables
+        )
+
+        if render_request.variables is not None:
+            try:
+                content = compiled.render(render_request.variables)
+            except TemplateError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=str(e),
+                )
+            return TemplateRenderResponse(template_id=template.id, content=content)
+
+        results = []
+        for index, values in enumerate(render_request.items):
+            try:
+                results.append(
+                    TemplateRenderResult(
+                        index=index, success=True, content=compiled.render(values)
+                    )
+                )
+            except TemplateError as e:
+                results.append(
+                    TemplateRenderResult(index=index, success=False, error=str(e))
+                )
+
+        logger.info("Template rendered: %s (%s items)", template.id, len(results))
+        return TemplateRenderResponse(template_id=template.id, results=results)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Render template error: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to render template",
+        )
+
+
+def build_content_response(
+    content_id: str, content_request: ContentRequest, content: str
+) -> ContentResponse:
+    """Build the response for newly created draft content"""
+    now = datetime.utcnow()
+    return ContentResponse(
+        id=content_id,
+        title=content_request.title,
+        content_type=content_request.content_type,
+        topic=content_request.topic,
+        target_audience=content_request.target_audience,
+        tone=content_request.tone,
+        length=content_request.length,
+        content=content,
+        status="draft",
+        created_at=now,
+        updated_at=now,
+        client_id=content_request.client_id,
+        meeting_id=content_request.meeting_id,
+        template_id=content_request.template_id,
+        metadata=content_request.metadata,
+    )
+
+
+def admission_http_error(error: AdmissionError) -> HTTPException:
+    """Map a scheduler rejection to 429 or 503 with Retry-After"""
+    logger.warning("Generation request rejected: %s", error)
+    return HTTPException(
+        status_code=error.status_code,
+        detail=str(error),
+        headers={"Retry-After": error.retry_after_header},
+    )
+
+
+def invalid_reference_http_error(error: InvalidReferenceError) -> HTTPException:
+    """Map a malformed or unknown client, meeting or template id to 422"""
+    logger.warning("Invalid reference rejected: %s", error)
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail=INVALID_REFERENCE_DETAIL,
+    )
+
+
+def variant_cost(content_request: ContentRequest) -> float:
+    """Relative cost of generating one variant of a request"""
+    return MAX_TOKENS_BY_LENGTH[content_request.length] / MAX_TOKENS_BY_LENGTH["short"]
+
+
+def generation_cost(content_request: ContentRequest) -> float:
+    """Relative cost of a generation, used to share capacity fairly"""
+    return variant_cost(content_request) * content_request.variants
+
+
+def require_single_variant(content_requests: List[ContentRequest]) -> None:
+    """Reject variants on endpoints that create one piece of content per request"""
+    if any(content_request.variants > 1 for content_request in content_requests):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Variants are only supported by POST /content",
+        )
+
+
+def format_sse_event(event: str, data: str) -> str:
+    """Format a server-sent event frame"""
+    lines = "".join(f"data: {line}\n" for line in data.splitlines() or [""])
+    return f"event: {event}\n{lines}\n"
+
+
 # AI Content Generation
+async def generate_content(content_request: ContentRequest, current_user: dict) -> str:
+    """Generate content, serving repeated requests from the generation cache"""
+    cache_key = generation_cache.key_for(content_request)
+    if not content_request.bypass_cache:
+        cached_content = await generation_cache.get(cache_key)
+        if cached_content is not None:
+            logger.info("Generation cache hit: %s", cache_key)
+            return cached_content
+
+    async def generate_and_cache() -> str:
+        async with generation_scheduler.slot(
+            content_request.client_id, generation_cost(content_request)
+        ):
+            content = await generate_ai_content(content_request, current_user)
+        await generation_cache.set(cache_key, content)
+        return content
+
+    return await generation_flights.do(cache_key, generate_and_cache)
+
+
+async def generate_variants(
+    content_request: ContentRequest, current_user: dict
+) -> List[str]:
+    """Generate alternative versions of the content for a request
+
+    Meeting content summarizes the transcript once and varies only the
+    write-up. Long-form content and the mock backend generate each variant in
+    full. Variants are not cached, since a repeated request asks for fresh
+    alternatives.
+    """
+    provider = get_llm_provider()
+    if is_meeting_request(content_request):
+        return await generate_meeting_variants(content_request, provider)
+    if provider is not None and long_form_generator(content_request, provider) is None:
+        return await generate_ai_variants(
+            content_request, provider, build_prompt(content_request)
+        )
+
+    async def generate_variant() -> str:
+        async with generation_scheduler.slot(
+            content_request.client_id, variant_cost(content_request)
+        ):
+            return await generate_ai_content(content_request, current_user)
+
+    return await gather_variants(content_request.variants, generate_variant)
+
+
+async def generate_meeting_variants(
+    content_request: ContentRequest, provider: Any
+) -> List[str]:
+    """Write alternatives of meeting content from one summary of the meeting"""
+    try:
+        async with generation_scheduler.slot(
+            content_request.client_id, variant_cost(content_request)
+        ):
+            with STAGE_SECONDS.time("generate"):
+                notes = await summarize_meeting(content_request)
+    except TranscriptNotFoundError:
+        raise
+    except Exception as e:
+        logger.error("Meeting summarization error: %s", e)
+        raise Exception("Failed to generate content")
+
+    if provider is None:
+        return ["\n\n".join([content_request.title] + notes)] * content_request.variants
+    return await generate_ai_variants(
+        content_request, provider, build_meeting_prompt(content_request, notes)
+    )
+
+
+async def gather_variants(
+    variants: int, generate: Callable[[], Awaitable[str]]
+) -> List[str]:
+    """Run generate once per variant concurrently, cancelling all if one fails"""
+    tasks = [asyncio.ensure_future(generate()) for _ in range(variants)]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def stream_content(
+    content_request: ContentRequest, current_user: dict
+) -> AsyncIterator[str]:
+    """Stream content, serving repeated requests from the generation cache"""
+    cache_key = generation_cache.key_for(content_request)
+    if not content_request.bypass_cache:
+        cached_content = await generation_cache.get(cache_key)
+        if cached_content is not None:
+            logger.info("Generation cache hit: %s", cache_key)
+            yield cached_content
+            return
+
+    chunks: List[str] = []
+    async with generation_scheduler.slot(
+        content_request.client_id, generation_cost(content_request)
+    ):
+        async for chunk in stream_ai_content(content_request, current_user):
+            chunks.append(chunk)
+            yield chunk
+
+    await generation_cache.set(cache_key, "".join(chunks).strip())
+
+
 async def generate_ai_content(
     content_request: ContentRequest, current_user: dict
 ) -> str:
     """Generate content using AI"""
     try:
-        # This would integrate with OpenAI, Claude, or other AI services
-        # For now, we'll simulate content generation
-
-        # prompt = f"""
-        # Create a {content_request.length} {content_request.content_type}
-        # about {content_request.topic}.
-        #
-        # Target audience: {content_request.target_audience}
-        # Tone: {content_request.tone}
-        # Keywords: {', '.join(content_request.keywords)
-        # if content_request.keywords else 'None'}
-        #
-        # Please write engaging, informative content that meets these
-        # requirements.
-        # """
-
-        # Simulate AI content generation
-        import asyncio
-
-        await asyncio.sleep(2)  # Simulate processing time
-
-        # Mock content based on type
-        if content_request.content_type == "article":
-            content = f"""
-            # {content_request.title}
-
-            ## Introduction
-            In today's fast-paced world, {content_request.topic} has become
-            increasingly important for {content_request.target_audience}.
-            This comprehensive guide will explore the key aspects and
-            provide actionable insights.
-
-            ## Key Points
-            1. Understanding the fundamentals of {content_request.topic}
-            2. Best practices for implementation
-            3. Common challenges and solutions
-            4. Future trends and opportunities
-
-            ## Conclusion
-            {content_request.topic} represents a significant opportunity for
-            {content_request.target_audience}. By following the guidelines
-            outlined in this article, you can achieve better results and
-            drive meaningful impact.
-            """
-        elif content_request.content_type == "email":
-            content = f"""
-            Subject: {content_request.title}
-
-            Dear {content_request.target_audience},
-
-            I hope this email finds you well. I wanted to share some insights
-            about {content_request.topic} that I believe will be valuable for
-            your organization.
-
-            Key highlights:
-            • Important update regarding {content_request.topic}
-            • Action items for your team
-            • Next steps and timeline
-
-            Please let me know if you have any questions or need additional
-            information.
-
-            Best regards,
-            [Your Name]
-            """
-        else:
-            content = f"""
-            {content_request.title}
+        with STAGE_SECONDS.time("generate"):
+            provider = get_llm_provider()
+            if is_meeting_request(content_request):
+                notes = await summarize_meeting(content_request)
+                if provider is None:
+                    return "\n\n".join([content_request.title] + notes)
+                content = await provider.complete(
+                    build_meeting_prompt(content_request, notes),
+                    max_tokens=MAX_TOKENS_BY_LENGTH[content_request.length],
+                )
+                return content.strip()
+
+            if provider is not None:
+                longform = long_form_generator(content_request, provider)
+                if longform is not None:
+                    content = await longform.generate(
+                        content_request, MAX_TOKENS_BY_LENGTH[content_request.length]
+                    )
+                    return content.strip()
+
+                content = await provider.complete(
+                    build_prompt(content_request),
+                    max_tokens=MAX_TOKENS_BY_LENGTH[content_request.length],
+                )
+                return content.strip()
+
+            # Simulate AI content generation
+            await asyncio.sleep(MOCK_GENERATION_SECONDS)  # Simulate processing time
+
+            return build_fallback_content(content_request)
+
+    except TranscriptNotFoundError:
+        raise
+    except Exception as e:
+        logger.error("AI content generation error: %s", e)
+        raise Exception("Failed to generate content")
+
+
+async def generate_ai_variants(
+    content_request: ContentRequest, provider: Any, prompt: str
+) -> List[str]:
+    """Complete a prompt once per variant
+
+    A batching provider answers every variant in one call, which holds one
+    scheduler slot charged for all of them. Otherwise each call queues for a
+    slot of its own.
+    """
+    max_tokens = MAX_TOKENS_BY_LENGTH[content_request.length]
+
+    async def complete_variant() -> str:
+        async with generation_scheduler.slot(
+            content_request.client_id, variant_cost(content_request)
+        ):
+            return await provider.complete(prompt, max_tokens=max_tokens)
+
+    try:
+        with STAGE_SECONDS.time("generate"):
+            if isinstance(provider, BatchingProvider):
+                async with generation_scheduler.slot(
+                    content_request.client_id, generation_cost(content_request)
+                ):
+                    contents = await provider.complete_many(
+                        prompt, content_request.variants, max_tokens=max_tokens
+                    )
+            else:
+                contents = await gather_variants(
+                    content_request.variants, complete_variant
+                )
+        return [content.strip() for content in contents]
+
+    except Exception as e:
+        logger.error("AI content variants generation error: %s", e)
+        raise Exception("Failed to generate content")
+
+
+def build_prompt(content_request: ContentRequest) -> str:
+    """Build the generation prompt for a content request"""
+    keywords = (
+        ", ".join(content_request.keywords) if content_request.keywords else "None"
+    )
+    return (
+        f"Create a {content_request.length} {content_request.content_type} "
+        f'titled "{content_request.title}" about {content_request.topic}.\n\n'
+        f"Target audience: {content_request.target_audience}\n"
+        f"Tone: {content_request.tone}\n"
+        f"Keywords: {keywords}\n\n"
+        "Please write engaging, informative content that meets these requirements."
+    )
+
+
+async def complete_text(prompt: str, max_tokens: int) -> str:
+    """Complete an intermediate prompt with the provider, or the mock backend"""
+    provider = get_llm_provider()
+    if provider is not None:
+        return (await provider.complete(prompt, max_tokens=max_tokens)).strip()
 
-            {content_request.topic} is a crucial topic for
-            {content_request.target_audience}.
-            This {content_request.content_type} provides insights and
-            recommendations in a {content_request.tone} tone.
+    # The mock backend condenses the material after the instructions
+    material = prompt.split("\n\n", 1)[-1]
+    return " ".join(material.split()[:max_tokens])
 
-            Key points to consider:
-            - Understanding the current landscape
-            - Identifying opportunities
-            - Implementing best practices
-            - Measuring success
 
-            For more information, please contact us.
-            """
+def long_form_generator(
+    content_request: ContentRequest, provider: Any
+) -> Optional[LongFormGenerator]:
+    """Section-wise generator for long articles and reports, when enabled"""
+    if (
+        content_request.length != "long"
+        or content_request.content_type not in LONG_FORM_CONTENT_TYPES
+    ):
+        return None
+    return create_longform_generator(provider.complete, provider.stream)
+
+
+def is_meeting_request(content_request: ContentRequest) -> bool:
+    """Whether content is generated from its meeting's transcript"""
+    return bool(content_request.meeting_id) and (
+        content_request.content_type in MEETING_CONTENT_TYPES
+    )
+
+
+async def summarize_meeting(content_request: ContentRequest) -> List[str]:
+    """Summarize a meeting's transcript into notes to write content from"""
+    summarizer = create_meeting_summarizer(
+        content_store, complete_text, transcript_compressor
+    )
+    return await summarizer.summarize(
+        content_request.meeting_id, content_request.client_id
+    )
+
+
+def build_meeting_prompt(content_request: ContentRequest, notes: List[str]) -> str:
+    """Build the prompt that writes a summary or report from meeting notes"""
+    keywords = (
+        ", ".join(content_request.keywords) if content_request.keywords else "None"
+    )
+    joined_notes = "\n\n".join(notes)
+    return (
+        f"Write a {content_request.length} meeting {content_request.content_type} "
+        f'titled "{content_request.title}" about {content_request.topic}, '
+        "using only the meeting notes below.\n\n"
+        f"Target audience: {content_request.target_audience}\n"
+        f"Tone: {content_request.tone}\n"
+        f"Keywords: {keywords}\n\n"
+        f"Meeting notes:\n{joined_notes}"
+    )
 
-        return content.strip()
 
+def build_fallback_content(content_request: ContentRequest) -> str:
+    """Build template-based content for the content type
+
+    Used as the mock backend's output and as the degraded-mode fallback.
+    """
+    if content_request.content_type == "article":
+        content = f"""
+        # {content_request.title}
+
+        ## Introduction
+        In today's fast-paced world, {content_request.topic} has become
+        increasingly important for {content_request.target_audience}.
+        This comprehensive guide will explore the key aspects and
+        provide actionable insights.
+
+        ## Key Points
+        1. Understanding the fundamentals of {content_request.topic}
+        2. Best practices for implementation
+        3. Common challenges and solutions
+        4. Future trends and opportunities
+
+        ## Conclusion
+        {content_request.topic} represents a significant opportunity for
+        {content_request.target_audience}. By following the guidelines
+        outlined in this article, you can achieve better results and
+        drive meaningful impact.
+        """
+    elif content_request.content_type == "email":
+        content = f"""
+        Subject: {content_request.title}
+
+        Dear {content_request.target_audience},
+
+        I hope this email finds you well. I wanted to share some insights
+        about {content_request.topic} that I believe will be valuable for
+        your organization.
+
+        Key highlights:
+        • Important update regarding {content_request.topic}
+        • Action items for your team
+        • Next steps and timeline
+
+        Please let me know if you have any questions or need additional
+        information.
+
+        Best regards,
+        [Your Name]
+        """
+    else:
+        content = f"""
+        {content_request.title}
+
+        {content_request.topic} is a crucial topic for
+        {content_request.target_audience}.
+        This {content_request.content_type} provides insights and
+        recommendations in a {content_request.tone} tone.
+
+        Key points to consider:
+        - Understanding the current landscape
+        - Identifying opportunities
+        - Implementing best practices
+        - Measuring success
+
+        For more information, please contact us.
+        """
+
+    return content.strip()
+
+
+async def stream_ai_content(
+    content_request: ContentRequest, current_user: dict
+) -> AsyncIterator[str]:
+    """Generate content using AI, yielding text chunks as they are produced"""
+    try:
+        provider = get_llm_provider()
+        if is_meeting_request(content_request):
+            # Only the final write-up streams; the map-reduce runs first
+            notes = await summarize_meeting(content_request)
+            if provider is None:
+                yield "\n\n".join([content_request.title] + notes)
+                return
+            async for chunk in provider.stream(
+                build_meeting_prompt(content_request, notes),
+                max_tokens=MAX_TOKENS_BY_LENGTH[content_request.length],
+            ):
+                yield chunk
+            return
+
+        if provider is not None:
+            longform = long_form_generator(content_request, provider)
+            if longform is not None:
+                # Sections stream in order while later ones generate
+                async for chunk in longform.stream(
+                    content_request, MAX_TOKENS_BY_LENGTH[content_request.length]
+                ):
+                    yield chunk
+                return
+
+            async for chunk in provider.stream(
+                build_prompt(content_request),
+                max_tokens=MAX_TOKENS_BY_LENGTH[content_request.length],
+            ):
+                yield chunk
+            return
+
+        # Simulate streaming the mock content line by line
+        chunks = build_fallback_content(content_request).splitlines(keepends=True)
+        delay = MOCK_GENERATION_SECONDS / max(len(chunks), 1)
+
+        for chunk in chunks:
+            await asyncio.sleep(delay)  # Simulate token latency
+            yield chunk
+
+    except TranscriptNotFoundError:
+        raise
     except Exception as e:
-        logger.error(f"AI content generation error: {str(e)}")
+        logger.error("AI content streaming error: %s", e)
         raise Exception("Failed to generate content")
 
 
-# Database operations (mock implementations)
+# Degraded mode
+def degraded_request(content_request: ContentRequest) -> Optional[ContentRequest]:
+    """Flag an opted-in request for fallback content while degraded"""
+    if not content_request.allow_degraded:
+        return None
+    reason = degradation_policy.reason()
+    if reason is None:
+        return None
+
+    DEGRADED_RESPONSES.inc(reason)
+    logger.warning("Serving degraded content (%s): %s", reason, content_request.title)
+    metadata = {
+        **(content_request.metadata or {}),
+        "degraded": True,
+        "degraded_reason": reason,
+    }
+    return content_request.model_copy(update={"metadata": metadata})
+
+
+async def stream_fallback_content(
+    content_request: ContentRequest,
+) -> AsyncIterator[str]:
+    """Stream the fallback draft as a single chunk"""
+    yield build_fallback_content(content_request)
+
+
+def schedule_upgrade(
+    content_id: str, content_request: ContentRequest, draft: str, current_user: dict
+) -> None:
+    """Queue regeneration of a degraded draft for when the service recovers"""
+    try:
+        upgrade_queue.submit(
+            current_user["id"],
+            lambda: upgrade_degraded_content(
+                content_id, content_request, draft, current_user
+            ),
+        )
+    except QueueFullError:
+        DEGRADED_UPGRADES.inc("dropped")
+        logger.warning("Upgrade queue is full, keeping draft: %s", content_id)
+
+
+async def upgrade_degraded_content(
+    content_id: str, content_request: ContentRequest, draft: str, current_user: dict
+) -> None:
+    """Replace a degraded draft with generated content
+
+    Content that was edited in the meantime is left alone: the update only
+    applies to the version of the row that still holds the draft. It goes
+    through the content store, so the cached row is invalidated.
+    """
+    while degradation_policy.reason() is not None:
+        await asyncio.sleep(DEGRADED_UPGRADE_RETRY_SECONDS)
+
+    try:
+        row = await content_store.get_content(content_id)
+        if row is None or row["content"] != draft:
+            DEGRADED_UPGRADES.inc("skipped")
+            return
+        content = await generate_content(content_request, current_user)
+
+        row = await content_store.get_content(content_id)
+        if row is None or row["content"] != draft:
+            DEGRADED_UPGRADES.inc("skipped")
+            return
+        metadata = {**(row["metadata"] or {}), "degraded": False}
+        updated = await finish_before_cancel(
+            content_store.update_content(
+                content_id,
+                {"content": content, "metadata": metadata},
+                expected_version=row["version"],
+            )
+        )
+        if updated is None:
+            DEGRADED_UPGRADES.inc("skipped")
+            return
+    except Exception:
+        DEGRADED_UPGRADES.inc("failed")
+        raise
+
+    DEGRADED_UPGRADES.inc("upgraded")
+    logger.info("Degraded content upgraded: %s", content_id)
+
+
+# Database operations
+def build_content_row(
+    content_id: str, content_request: ContentRequest, content: str, current_user: dict
+) -> Dict[str, Any]:
+    """Build the database row for newly created draft content"""
+    now = datetime.now(timezone.utc)
+    return {
+        "id": content_id,
+        "client_id": content_request.client_id,
+        "created_by": current_user["id"],
+        "meeting_id": content_request.meeting_id,
+        "template_id": content_request.template_id,
+        "title": content_request.title,
+        "content_type": content_request.content_type,
+        "topic": content_request.topic,
+        "target_audience": content_request.target_audience,
+        "tone": content_request.tone,
+        "length": content_request.length,
+        "keywords": content_request.keywords or [],
+        "content": content,
+        "status": "draft",
+        "metadata": content_request.metadata,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
 async def save_content(
     content_request: ContentRequest, content: str, current_user: dict
 ) -> str:
     """Save content to database"""
-    # This would integrate with Supabase
-    content_id = (
-        f"content_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_"
-        f"{current_user['id']}"
-    )
-    logger.info(f"Content saved to database: {content_id}")
+    content_id = id_generator.prefixed("content")
+    with STAGE_SECONDS.time("save"):
+        await finish_before_cancel(
+            content_store.insert_content(
+                build_content_row(content_id, content_request, content, current_user)
+            )
+        )
+    logger.info("Content saved to database: %s", content_id)
     return content_id
 
 
+async def save_content_batch(
+    items: List[Tuple[ContentRequest, str]], current_user: dict
+) -> List[str]:
+    """Save several pieces of content to database in one round-trip"""
+    content_ids = id_generator.prefixed_many("content", len(items))
+    with STAGE_SECONDS.time("save_batch"):
+        await finish_before_cancel(
+            content_store.insert_contents(
+                [
+                    build_content_row(
+                        content_id, content_request, content, current_user
+                    )
+                    for content_id, (content_request, content) in zip(
+                        content_ids, items
+                    )
+                ]
+            )
+        )
+    logger.info("Content batch saved to database: %s items", len(content_ids))
+    return content_ids
+
+
 async def retrieve_content(
     content_id: str, current_user: dict
 ) -> Optional[ContentResponse]:
     """Retrieve content from database"""
-    # This would integrate with Supabase
-    # For now, return None to simulate not found
-    return None
+    row = await content_store.get_content(content_id)
+    return ContentResponse(**row) if row else None
 
 
 async def update_content_in_db(
     content_id: str, update_request: ContentUpdateRequest, current_user: dict
 ) -> Optional[ContentResponse]:
     """Update content in database"""
-    # This would integrate with Supabase
-    # For now, return None to simulate not found
-    return None
+    row = await finish_before_cancel(
+        content_store.update_content(
+            content_id, update_request.model_dump(exclude_unset=True)
+        )
+    )
+    return ContentResponse(**row) if row else None
 
 
 async def list_content_from_db(
@@ -477,32 +1711,93 @@ async def list_content_from_db(
     limit: int,
     offset: int,
     current_user: dict,
-) -> List[ContentResponse]:
-    """List content from database"""
-    # This would integrate with Supabase
-    return []
+) -> List[Dict[str, Any]]:
+    """List content from database as trusted ContentResponse rows"""
+    rows = await content_store.list_content(
+        client_id, content_type, status, limit, offset
+    )
+    return project_rows(rows, ContentResponse)
+
+
+async def list_content_page_from_db(
+    client_id: str,
+    content_type: Optional[str],
+    status: Optional[str],
+    limit: int,
+    cursor: Optional[str],
+    current_user: dict,
+) -> Dict[str, Any]:
+    """List one keyset page of content from database as a trusted ContentPage"""
+    after = decode_cursor(cursor) if cursor else None
+    # One extra row tells whether another page follows
+    rows = await content_store.list_content(
+        client_id, content_type, status, limit + 1, after=after
+    )
+    return {
+        "items": project_rows(rows[:limit], ContentResponse),
+        "next_cursor": next_cursor(rows, limit),
+    }
 
 
 async def save_template(template_request: TemplateRequest, current_user: dict) -> str:
     """Save template to database"""
-    # This would integrate with Supabase
-    template_id = (
-        f"template_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_"
-        f"{current_user['id']}"
+    template_id = id_generator.prefixed("template")
+    now = datetime.now(timezone.utc)
+    await content_store.insert_template(
+        {
+            "id": template_id,
+            "client_id": template_request.client_id,
+            "created_by": current_user["id"],
+            "name": template_request.name,
+            "content_type": template_request.content_type,
+            "template_content": template_request.template_content,
+            "variables": template_request.variables,
+            "description": template_request.description,
+            "created_at": now,
+            "updated_at": now,
+        }
     )
-    logger.info(f"Template saved to database: {template_id}")
+    logger.info("Template saved to database: %s", template_id)
     return template_id
 
 
+async def retrieve_template(
+    template_id: str, current_user: dict
+) -> Optional[TemplateResponse]:
+    """Retrieve template from database"""
+    row = await content_store.get_template(template_id)
+    return TemplateResponse(**row) if row else None
+
+
 async def list_templates_from_db(
     client_id: str, content_type: Optional[str], current_user: dict
-) -> List[TemplateResponse]:
-    """List templates from database"""
-    # This would integrate with Supabase
-    return []
+) -> List[Dict[str, Any]]:
+    """List templates from database as trusted TemplateResponse rows"""
+    rows = await content_store.list_templates(client_id, content_type)
+    return project_rows(rows, TemplateResponse)
+
+
+async def list_templates_page_from_db(
+    client_id: str,
+    content_type: Optional[str],
+    limit: int,
+    cursor: Optional[str],
+    current_user: dict,
+) -> Dict[str, Any]:
+    """List one keyset page of templates from database as a trusted TemplatePage"""
+    after = decode_cursor(cursor) if cursor else None
+    rows = await content_store.list_templates(
+        client_id, content_type, limit + 1, after=after
+    )
+    return {
+        "items": project_rows(rows[:limit], TemplateResponse),
+        "next_cursor": next_cursor(rows, limit),
+    }
 
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
         "index:app",
         host="0.0.0.0",
@@ -0,0 +1,140 @@
+"""
+In-process background job queue for the Content Creation Service.
+
+Jobs are accepted into a bounded queue and executed by a fixed pool of
+worker tasks, so HTTP handlers can return immediately while slow generation
+happens in the background. Finished jobs are kept for a limited time so their
+status can be polled.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+
+@dataclass
+class Job:
+    id: str
+    owner_id: str
+    status: str = JOB_QUEUED
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    finished_at: Optional[float] = None
+
+
+class JobQueue:
+    """Bounded queue of jobs executed by a pool of asyncio worker tasks"""
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_queue_size: int = 1000,
+        result_ttl: float = 3600,
+    ):
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.result_ttl = result_ttl
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Optional["asyncio.Queue[Any]"] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+
+    @property
+    def depth(self) -> int:
+        """Number of jobs waiting for a worker"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def submit(self, owner_id: str, fn: Callable[[], Awaitable[Any]]) -> Job:
+        """Queue fn() for background execution and return its job record"""
+        self._ensure_workers()
+        self._purge_expired()
+
+        job = Job(id=uuid.uuid4().hex, owner_id=owner_id)
+        try:
+            self._queue.put_nowait((job, fn))
+        except asyncio.QueueFull:
+            raise QueueFullError("Job queue is full")
+
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return the job record if it is still known"""
+        self._purge_expired()
+        return self._jobs.get(job_id)
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if any(not task.done() and task.get_loop() is loop for task in self._tasks):
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._tasks = [
+            asyncio.ensure_future(self._worker(self._queue))
+            for _ in range(self.workers)
+        ]
+
+    async def _worker(self, queue: "asyncio.Queue[Any]") -> None:
+        while True:
+            job, fn = await queue.get()
+            job.status = JOB_RUNNING
+            job.updated_at = datetime.utcnow()
+            try:
+                job.result = await fn()
+                job.status = JOB_SUCCEEDED
+            except asyncio.CancelledError:
+                job.status = JOB_FAILED
+                job.error = "Job cancelled"
+                raise
+            except Exception as e:
+                logger.error("Job %s failed: %s", job.id, e)
+                job.status = JOB_FAILED
+                job.error = str(e)
+            finally:
+                job.updated_at = datetime.utcnow()
+                job.finished_at = time.monotonic()
+                queue.task_done()
+
+    def _purge_expired(self) -> None:
+        cutoff = time.monotonic() - self.result_ttl
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at <= cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+def create_job_queue() -> JobQueue:
+    """Create the job queue configured through environment variables"""
+    return JobQueue(
+        workers=int(os.getenv("CONTENT_JOB_WORKERS", 4)),
+        max_queue_size=int(os.getenv("CONTENT_JOB_QUEUE_SIZE", 1000)),
+        result_ttl=float(os.getenv("CONTENT_JOB_RESULT_TTL_SECONDS", 3600)),
+    )
@@ -0,0 +1,571 @@
+"""
+LLM provider abstraction for the Content Creation Service.
+
+All HTTP providers share one long-lived pooled httpx client (keep-alive and
+HTTP/2 when available), so connection setup and TLS handshakes are paid once
+per process rather than once per generation. Each provider limits its own
+concurrency and retries rate limits and server errors with jittered
+exponential backoff. A local fake provider makes the whole path runnable and
+benchmarkable offline. httpx is only imported once an HTTP provider is used,
+which keeps it out of the service's cold start. A circuit breaker stops calls
+to a provider that keeps failing, and recent call latency is tracked, so the
+service can tell when to fall back to degraded content. Providers whose API
+can return several completions for one prompt produce variants in a single
+call; the others run one call per variant within their concurrency limit.
+"""
+
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, TypeVar
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+class LLMError(Exception):
+    """Raised when a provider cannot produce a completion"""
+
+
+class CircuitOpenError(LLMError):
+    """Raised without calling the provider while its circuit is open"""
+
+
+class CircuitBreaker:
+    """Stop calling a provider after repeated failures
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    fail fast. Once reset_timeout has passed a single trial call is let
+    through; its success closes the circuit and its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are refused without waiting for a trial"""
+        return (
+            self.opened_at is not None
+            and time.monotonic() - self.opened_at < self.reset_timeout
+        )
+
+    def allow(self) -> bool:
+        """Return whether a call may go ahead, claiming the trial if half-open"""
+        if self.opened_at is None:
+            return True
+        if self.is_open or self._trial_running:
+            return False
+        self._trial_running = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_running = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning("LLM circuit opened after %s failures", self.failures)
+            self.opened_at = time.monotonic()
+
+    def record_abandoned(self) -> None:
+        """Forget a call that was cancelled before it succeeded or failed"""
+        self._trial_running = False
+
+
+class LatencyTracker:
+    """Exponentially weighted moving average of recent call latency
+
+    The average is only reported while observations are recent, so a provider
+    that stopped being called is not judged by an old incident.
+    """
+
+    def __init__(self, weight: float = 0.2, max_age: float = 60.0):
+        self.weight = weight
+        self.max_age = max_age
+        self._average: Optional[float] = None
+        self._observed_at = 0.0
+
+    def observe(self, seconds: float) -> None:
+        if self._average is None or self.value is None:
+            self._average = seconds
+        else:
+            self._average += self.weight * (seconds - self._average)
+        self._observed_at = time.monotonic()
+
+    @property
+    def value(self) -> Optional[float]:
+        if time.monotonic() - self._observed_at > self.max_age:
+            return None
+        return self._average
+
+
+class LLMProvider(ABC):
+    """Text generation backend with a per-provider concurrency limit"""
+
+    name = "base"
+
+    def __init__(self, max_concurrency: int = 16):
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.circuit = CircuitBreaker()
+        self.call_latency = LatencyTracker()
+
+    async def complete(
+        self, prompt: str, max_tokens: int = 800, temperature: float = 0.7
+    ) -> str:
+        """Return the full completion for a prompt"""
+        return await self._call(lambda: self._complete(prompt, max_tokens, temperature))
+
+    async def complete_many(
+        self, prompt: str, n: int, max_tokens: int = 800, temperature: float = 0.7
+    ) -> List[str]:
+        """Return n alternative completions for a prompt
+
+        Batching providers answer with a single call. Otherwise the n calls
+        run concurrently within the provider's concurrency limit.
+        """
+        tasks = [
+            asyncio.ensure_future(self.complete(prompt, max_tokens, temperature))
+            for _ in range(n)
+        ]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def stream(
+        self, prompt: str, max_tokens: int = 800, temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        """Yield the completion for a prompt as text chunks"""
+        async with self._semaphore:
+            self._check_circuit()
+            started = time.monotonic()
+            try:
+                async for chunk in self._stream(prompt, max_tokens, temperature):
+                    yield chunk
+            except Exception:
+                self.circuit.record_failure()
+                raise
+            except BaseException:
+                self.circuit.record_abandoned()
+                raise
+            self.circuit.record_success()
+            self.call_latency.observe(time.monotonic() - started)
+
+    async def _call(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Run a provider call within the concurrency limit and the circuit"""
+        async with self._semaphore:
+            self._check_circuit()
+            started = time.monotonic()
+            try:
+                result = await call()
+            except Exception:
+                self.circuit.record_failure()
+                raise
+            except BaseException:
+                self.circuit.record_abandoned()
+                raise
+            self.circuit.record_success()
+            self.call_latency.observe(time.monotonic() - started)
+            return result
+
+    def _check_circuit(self) -> None:
+        if not self.circuit.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+    async def close(self) -> None:
+        """Release resources held by the provider"""
+
+    @abstractmethod
+    async def _complete(self, prompt: str, max_tokens: int, temperature: float) -> str:
+        """Provider-specific completion"""
+
+    @abstractmethod
+    def _stream(
+        self, prompt: str, max_tokens: int, temperature: float
+    ) -> AsyncIterator[str]:
+        """Provider-specific streaming completion"""
+
+
+class BatchingProvider(LLMProvider):
+    """Provider that can return several completions for a prompt in one call"""
+
+    async def complete_many(
+        self, prompt: str, n: int, max_tokens: int = 800, temperature: float = 0.7
+    ) -> List[str]:
+        if n == 1:
+            return [await self.complete(prompt, max_tokens, temperature)]
+        return await self._call(
+            lambda: self._complete_many(prompt, n, max_tokens, temperature)
+        )
+
+    @abstractmethod
+    async def _complete_many(
+        self, prompt: str, n: int, max_tokens: int, temperature: float
+    ) -> List[str]:
+        """Provider-specific completion of n alternatives in one call"""
+
+
+class FakeProvider(BatchingProvider):
+    """Offline provider with configurable latency and token rate"""
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency: float = 0.2,
+        tokens_per_second: float = 200.0,
+        max_concurrency: int = 64,
+    ):
+        super().__init__(max_concurrency)
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+
+    def _tokens(self, prompt: str, max_tokens: int, offset: int = 0) -> List[str]:
+        words = prompt.split() or ["content"]
+        return [
+            words[(index + offset) % len(words)] + " " for index in range(max_tokens)
+        ]
+
+    async def _complete(self, prompt: str, max_tokens: int, temperature: float) -> str:
+        tokens = self._tokens(prompt, max_tokens)
+        await asyncio.sleep(self.latency + len(tokens) / self.tokens_per_second)
+        return "".join(tokens).strip()
+
+    async def _complete_many(
+        self, prompt: str, n: int, max_tokens: int, temperature: float
+    ) -> List[str]:
+        # One round trip; the alternatives are sampled side by side
+        await asyncio.sleep(self.latency + max_tokens / self.tokens_per_second)
+        return [
+            "".join(self._tokens(prompt, max_tokens, offset)).strip()
+            for offset in range(n)
+        ]
+
+    async def _stream(
+        self, prompt: str, max_tokens: int, temperature: float
+    ) -> AsyncIterator[str]:
+        await asyncio.sleep(self.latency)
+        for token in self._tokens(prompt, max_tokens):
+            await asyncio.sleep(1 / self.tokens_per_second)
+            yield token
+
+
+class HTTPProvider(LLMProvider):
+    """Provider reached over HTTP through the shared pooled client"""
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        base_url: str,
+        client: Optional["httpx.AsyncClient"] = None,
+        max_concurrency: int = 16,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+    ):
+        super().__init__(max_concurrency)
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._client = client
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            self._client = get_http_client()
+        return self._client
+
+    @abstractmethod
+    def _request(
+        self, prompt: str, max_tokens: int, temperature: float, stream: bool
+    ) -> Dict[str, Any]:
+        """Return the url, headers and json body for a completion request"""
+
+    @abstractmethod
+    def _parse_completion(self, data: Dict[str, Any]) -> str:
+        """Extract the completion text from a response body"""
+
+    @abstractmethod
+    def _parse_stream_event(self, data: Dict[str, Any]) -> Optional[str]:
+        """Extract the text delta from a streamed event, if any"""
+
+    def _backoff(self, attempt: int, response: Optional["httpx.Response"]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+
+        # Full jitter keeps retrying clients from synchronising
+        return random.uniform(
+            0, min(self.backoff_max, self.backoff_base * 2**attempt)
+        )
+
+    async def _complete(self, prompt: str, max_tokens: int, temperature: float) -> str:
+        request = self._request(prompt, max_tokens, temperature, stream=False)
+        return self._parse_completion(await self._post(request))
+
+    async def _post(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a completion request, retrying, and return the response body"""
+        import httpx
+
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = await self.client.post(**request)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise LLMError(f"{self.name} request failed: {str(e)}")
+            else:
+                if response.status_code < 400:
+                    return response.json()
+                if (
+                    response.status_code not in RETRYABLE_STATUS_CODES
+                    or attempt >= self.max_retries
+                ):
+                    raise LLMError(
+                        f"{self.name} request failed: HTTP {response.status_code}"
+                    )
+
+            delay = self._backoff(attempt, response)
+            logger.warning("Retrying %s request in %.2fs", self.name, delay)
+            await asyncio.sleep(delay)
+
+        raise LLMError(f"{self.name} request failed")
+
+    async def _stream(
+        self, prompt: str, max_tokens: int, temperature: float
+    ) -> AsyncIterator[str]:
+        request = self._request(prompt, max_tokens, temperature, stream=True)
+
+        for attempt in range(self.max_retries + 1):
+            # Retries are only possible before the first chunk is forwarded
+            async with self.client.stream("POST", **request) as response:
+                if response.status_code < 400:
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        payload = line[len("data:") :].strip()
+                        if payload == "[DONE]":
+                            return
+                        text = self._parse_stream_event(json.loads(payload))
+                        if text:
+                            yield text
+                    return
+
+                await response.aread()
+                if (
+                    response.status_code not in RETRYABLE_STATUS_CODES
+                    or attempt >= self.max_retries
+                ):
+                    raise LLMError(
+                        f"{self.name} stream failed: HTTP {response.status_code}"
+                    )
+                delay = self._backoff(attempt, response)
+
+            logger.warning("Retrying %s stream in %.2fs", self.name, delay)
+            await asyncio.sleep(delay)
+
+
+class OpenAIProvider(HTTPProvider, BatchingProvider):
+    """OpenAI chat completions API"""
+
+    name = "openai"
+
+    def _request(
+        self, prompt: str, max_tokens: int, temperature: float, stream: bool
+    ) -> Dict[str, Any]:
+        return {
+            "url": f"{self.base_url}/chat/completions",
+            "headers": {"Authorization": f"Bearer {self.api_key}"},
+            "json": {
+                "model": self.model,
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "stream": stream,
+            },
+        }
+
+    def _parse_completion(self, data: Dict[str, Any]) -> str:
+        return data["choices"][0]["message"]["content"] or ""
+
+    async def _complete_many(
+        self, prompt: str, n: int, max_tokens: int, temperature: float
+    ) -> List[str]:
+        request = self._request(prompt, max_tokens, temperature, stream=False)
+        request["json"]["n"] = n
+        data = await self._post(request)
+        choices = sorted(data["choices"], key=lambda choice: choice.get("index", 0))
+        if len(choices) != n:
+            raise LLMError(f"{self.name} returned {len(choices)} of {n} completions")
+        return [choice["message"]["content"] or "" for choice in choices]
+
+    def _parse_stream_event(self, data: Dict[str, Any]) -> Optional[str]:
+        choices = data.get("choices") or [{}]
+        return choices[0].get("delta", {}).get("content")
+
+
+class AnthropicProvider(HTTPProvider):
+    """Anthropic messages API"""
+
+    name = "anthropic"
+
+    def _request(
+        self, prompt: str, max_tokens: int, temperature: float, stream: bool
+    ) -> Dict[str, Any]:
+        return {
+            "url": f"{self.base_url}/v1/messages",
+            "headers": {
+                "x-api-key": self.api_key,
+                "anthropic-version": "2023-06-01",
+            },
+            "json": {
+                "model": self.model,
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "stream": stream,
+            },
+        }
+
+    def _parse_completion(self, data: Dict[str, Any]) -> str:
+        return "".join(
+            block.get("text", "")
+            for block in data.get("content", [])
+            if block.get("type") == "text"
+        )
+
+    def _parse_stream_event(self, data: Dict[str, Any]) -> Optional[str]:
+        if data.get("type") == "content_block_delta":
+            return data.get("delta", {}).get("text")
+        return None
+
+
+_http_client: Optional["httpx.AsyncClient"] = None
+_provider: Optional[LLMProvider] = None
+_provider_loaded = False
+
+
+def create_http_client(
+    transport: Optional["httpx.AsyncBaseTransport"] = None,
+) -> "httpx.AsyncClient":
+    """Create a pooled HTTP client for provider traffic"""
+    import httpx
+
+    max_connections = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", 100))
+    http2 = os.getenv("LLM_HTTP2", "true").lower() == "true"
+
+    return httpx.AsyncClient(
+        http2=http2 and importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_SECONDS", 60)),
+        ),
+        timeout=httpx.Timeout(
+            float(os.getenv("LLM_TIMEOUT_SECONDS", 120)),
+            connect=float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", 10)),
+        ),
+        transport=transport,
+    )
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """Return the process-wide provider HTTP client"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = create_http_client()
+    return _http_client
+
+
+def create_llm_provider(name: str) -> Optional[LLMProvider]:
+    """Create a provider by name, configured through environment variables"""
+    name = name.lower()
+    max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", 16))
+    max_retries = int(os.getenv("LLM_MAX_RETRIES", 3))
+
+    if name == "mock":
+        return None
+    if name == "fake":
+        return FakeProvider(
+            latency=float(os.getenv("LLM_FAKE_LATENCY_MS", 200)) / 1000,
+            tokens_per_second=float(os.getenv("LLM_FAKE_TOKENS_PER_SECOND", 200)),
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", 64)),
+        )
+    if name == "openai":
+        return OpenAIProvider(
+            api_key=os.getenv("OPENAI_API_KEY", ""),
+            model=os.getenv("LLM_MODEL", "gpt-4o-mini"),
+            base_url=os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+        )
+    if name == "anthropic":
+        return AnthropicProvider(
+            api_key=os.getenv("ANTHROPIC_API_KEY", ""),
+            model=os.getenv("LLM_MODEL", "claude-3-5-haiku-latest"),
+            base_url=os.getenv("ANTHROPIC_BASE_URL", "https://api.anthropic.com"),
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+        )
+    raise ValueError(f"Unknown LLM_PROVIDER: {name}")
+
+
+def create_circuit_breaker() -> CircuitBreaker:
+    """Create a provider circuit breaker configured through environment variables"""
+    return CircuitBreaker(
+        failure_threshold=int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", 5)),
+        reset_timeout=float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", 30)),
+    )
+
+
+def get_llm_provider() -> Optional[LLMProvider]:
+    """Return the configured provider, or None for the built-in mock"""
+    global _provider, _provider_loaded
+    if not _provider_loaded:
+        _provider = create_llm_provider(os.getenv("LLM_PROVIDER", "mock"))
+        _provider_loaded = True
+        if _provider is not None:
+            _provider.circuit = create_circuit_breaker()
+            logger.info("Using LLM provider: %s", _provider.name)
+    return _provider
+
+
+async def close_llm_provider() -> None:
+    """Close the provider and the shared HTTP client"""
+    global _http_client, _provider, _provider_loaded
+    if _provider is not None:
+        await _provider.close()
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+    _provider = None
+    _provider_loaded = False
@@ -0,0 +1,228 @@
+"""
+Logging setup for the Content Creation Service.
+
+In the default plain mode records are written synchronously in the familiar
+text format. In structured mode the request path only puts records on a
+bounded in-memory queue; a QueueListener thread formats them as JSON and does
+the I/O, so a slow log sink never stalls the event loop. Messages use lazy
+%-style arguments, which are only formatted on that thread and not at all for
+records dropped by per-level sampling. Every record carries the id of the
+request that produced it.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+import orjson
+
+PLAIN_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Id of the request being handled by the current task, if any
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+REQUEST_ID_HEADER = "x-request-id"
+
+# Incoming request ids are echoed into logs, so only plain tokens are trusted
+VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+# Attributes every LogRecord has; anything else was passed through extra=
+STANDARD_RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None)).keys()
+) | {"message", "asctime", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request id while still on its task"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of the records at each sampled level
+
+    Warnings and errors are never sampled out.
+    """
+
+    def __init__(self, rates: Dict[int, float]):
+        super().__init__()
+        self.rates = {
+            level: rate for level, rate in rates.items() if level < logging.WARNING
+        }
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.levelno)
+        if rate is None or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Queue handler that never formats or waits on the calling thread
+
+    The stock handler formats each message before queuing it; here the record
+    is queued as it is and formatted by the listener. When the queue is full
+    the record is dropped and counted rather than blocking the caller.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[Any]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, with extra= fields kept as top-level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in STANDARD_RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str, option=orjson.OPT_UTC_Z).decode()
+
+
+def parse_sample_rates(value: str) -> Dict[int, float]:
+    """Parse sampling rates written as LEVEL=rate pairs, comma separated"""
+    rates: Dict[int, float] = {}
+    for pair in value.split(","):
+        if pair.strip():
+            level, _, rate = pair.partition("=")
+            rates[logging.getLevelName(level.strip().upper())] = float(rate)
+    return rates
+
+
+class LoggingSetup:
+    """Handles installed on the root logger, kept for stats and shutdown"""
+
+    def __init__(
+        self,
+        mode: str,
+        queue_handler: Optional[NonBlockingQueueHandler] = None,
+        sampling: Optional[SamplingFilter] = None,
+        listener: Optional[QueueListener] = None,
+    ):
+        self.mode = mode
+        self.queue_handler = queue_handler
+        self.sampling = sampling
+        self.listener = listener
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "dropped": self.queue_handler.dropped if self.queue_handler else 0,
+            "sampled_out": self.sampling.sampled_out if self.sampling else 0,
+        }
+
+    def stop(self) -> None:
+        """Flush queued records and stop the listener thread"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+
+def configure_logging() -> LoggingSetup:
+    """Configure the root logger through environment variables"""
+    mode = os.getenv("LOG_MODE", "plain").lower()
+    level = os.getenv("LOG_LEVEL", "INFO").upper()
+
+    if mode == "plain":
+        logging.basicConfig(format=PLAIN_FORMAT)
+        # basicConfig leaves the level alone if the root already has handlers
+        logging.getLogger().setLevel(level)
+        return LoggingSetup(mode)
+    if mode != "structured":
+        raise ValueError(f"Unknown LOG_MODE: {mode}")
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JSONFormatter())
+
+    queue_handler = NonBlockingQueueHandler(
+        queue.Queue(int(os.getenv("LOG_QUEUE_SIZE", 10000)))
+    )
+    sampling = SamplingFilter(parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", "")))
+    queue_handler.addFilter(sampling)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(level)
+
+    # Route the server's own logs, access log included, through the queue too
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        server_logger = logging.getLogger(name)
+        server_logger.handlers = []
+        server_logger.propagate = True
+
+    listener = QueueListener(queue_handler.queue, output, respect_handler_level=True)
+    listener.start()
+    setup = LoggingSetup(mode, queue_handler, sampling, listener)
+    atexit.register(setup.stop)
+    return setup
+
+
+class RequestIdMiddleware:
+    """ASGI middleware giving every HTTP request an id for log correlation
+
+    A well-formed X-Request-ID from the caller or a proxy is reused, otherwise
+    a new id is generated. The id is echoed in the response headers.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER.encode():
+                candidate = value.decode("latin-1")
+                if VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+
+        async def send_with_request_id(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER.encode(), request_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,203 @@
+"""
+Section-wise generation of long-form content for the Content Creation
+Service.
+
+A long article or report written in one completion takes as long as its
+whole token budget to produce. Long-form mode first asks for a short outline,
+then writes every section as its own completion, with a bounded number in
+flight, and stitches them together in outline order. The budget is split
+between the sections, so wall-clock time drops roughly by the number of
+sections. When streaming, the section at the head of the document streams
+token by token while the later ones are generated behind it, and each is
+forwarded as soon as everything before it has been.
+"""
+
+import asyncio
+import os
+import re
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any, List, Optional, Union
+
+# Generates text for a prompt, given a completion budget in tokens
+CompleteFn = Callable[[str, int], Awaitable[str]]
+
+# Streams text chunks for a prompt, given a completion budget in tokens
+StreamFn = Callable[[str, int], AsyncIterator[str]]
+
+# Used when the outline does not come back as a list of headings
+DEFAULT_OUTLINE = ("Introduction", "Key points", "Challenges", "Conclusion")
+
+MAX_HEADING_CHARS = 120
+
+# Bullets, heading marks and numbering in front of an outline line
+OUTLINE_PREFIX = re.compile(r"^\s*(?:[-*•#]+|\d+[.)]|section \d+:)\s*", re.I)
+
+
+def build_outline_prompt(request: Any, sections: int) -> str:
+    return (
+        f'Outline a {request.content_type} titled "{request.title}" about '
+        f"{request.topic} for {request.target_audience}. List at most "
+        f"{sections} section headings in reading order, one per line, with no "
+        "numbering or other text."
+    )
+
+
+def parse_outline(text: str, max_sections: int) -> List[str]:
+    """Extract up to max_sections distinct headings from an outline"""
+    headings: List[str] = []
+    for line in text.splitlines():
+        heading = OUTLINE_PREFIX.sub("", line).strip().strip("\"'*").strip()
+        if (
+            heading
+            and len(heading) <= MAX_HEADING_CHARS
+            and heading.lower() not in (known.lower() for known in headings)
+        ):
+            headings.append(heading)
+    if len(headings) < 2:
+        return list(DEFAULT_OUTLINE[:max_sections])
+    return headings[:max_sections]
+
+
+def build_section_prompt(request: Any, outline: List[str], number: int) -> str:
+    keywords = ", ".join(request.keywords) if request.keywords else "None"
+    headings = "\n".join(
+        f"{index}. {heading}" for index, heading in enumerate(outline, 1)
+    )
+    return (
+        f'You are writing the {request.content_type} "{request.title}" about '
+        f"{request.topic}.\n\n"
+        f"Target audience: {request.target_audience}\n"
+        f"Tone: {request.tone}\n"
+        f"Keywords: {keywords}\n\n"
+        f"Outline:\n{headings}\n\n"
+        f'Write only section {number}, "{outline[number - 1]}". Do not repeat '
+        "its heading and do not cover the other sections."
+    )
+
+
+def format_heading(heading: str) -> str:
+    return f"## {heading}\n\n"
+
+
+class LongFormGenerator:
+    """Outline-then-sections generation with bounded parallelism"""
+
+    def __init__(
+        self,
+        complete: CompleteFn,
+        stream: StreamFn,
+        max_sections: int = 6,
+        max_concurrency: int = 4,
+        outline_max_tokens: int = 200,
+        min_section_tokens: int = 200,
+    ):
+        if max_sections < 2:
+            raise ValueError("max_sections must be at least 2")
+        self.complete = complete
+        self.stream_fn = stream
+        self.max_sections = max_sections
+        self.max_concurrency = max_concurrency
+        self.outline_max_tokens = outline_max_tokens
+        self.min_section_tokens = min_section_tokens
+
+    async def outline(self, request: Any) -> List[str]:
+        text = await self.complete(
+            build_outline_prompt(request, self.max_sections), self.outline_max_tokens
+        )
+        return parse_outline(text, self.max_sections)
+
+    def section_tokens(self, max_tokens: int, sections: int) -> int:
+        """Share of the completion budget for each section"""
+        return max(self.min_section_tokens, max_tokens // sections)
+
+    async def generate(self, request: Any, max_tokens: int) -> str:
+        """Write the whole document, sections generated concurrently"""
+        outline = await self.outline(request)
+        tokens = self.section_tokens(max_tokens, len(outline))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def write_section(number: int) -> str:
+            async with semaphore:
+                return await self.complete(
+                    build_section_prompt(request, outline, number), tokens
+                )
+
+        tasks = [
+            asyncio.ensure_future(write_section(number))
+            for number in range(1, len(outline) + 1)
+        ]
+        try:
+            sections = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        body = "".join(
+            format_heading(heading) + section.strip() + "\n\n"
+            for heading, section in zip(outline, sections)
+        )
+        return f"# {request.title}\n\n{body}"
+
+    async def stream(self, request: Any, max_tokens: int) -> AsyncIterator[str]:
+        """Stream the document in order while its sections generate concurrently"""
+        outline = await self.outline(request)
+        tokens = self.section_tokens(max_tokens, len(outline))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Chunks of each section, then None, or the exception it failed with
+        queues: List["asyncio.Queue[Union[str, Exception, None]]"] = [
+            asyncio.Queue() for _ in outline
+        ]
+
+        async def write_section(number: int) -> None:
+            queue = queues[number - 1]
+            async with semaphore:
+                try:
+                    async for chunk in self.stream_fn(
+                        build_section_prompt(request, outline, number), tokens
+                    ):
+                        queue.put_nowait(chunk)
+                except Exception as e:
+                    queue.put_nowait(e)
+                    return
+            queue.put_nowait(None)
+
+        tasks = [
+            asyncio.ensure_future(write_section(number))
+            for number in range(1, len(outline) + 1)
+        ]
+        try:
+            yield f"# {request.title}\n\n"
+            for heading, queue in zip(outline, queues):
+                yield format_heading(heading)
+                while True:
+                    chunk = await queue.get()
+                    if chunk is None:
+                        break
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    yield chunk
+                yield "\n\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def create_longform_generator(
+    complete: CompleteFn, stream: StreamFn
+) -> Optional[LongFormGenerator]:
+    """Create a generator configured through environment variables
+
+    Returns None when long-form mode is disabled with LONGFORM_MAX_SECTIONS
+    below 2.
+    """
+    max_sections = int(os.getenv("LONGFORM_MAX_SECTIONS", 6))
+    if max_sections < 2:
+        return None
+    return LongFormGenerator(
+        complete,
+        stream,
+        max_sections=max_sections,
+        max_concurrency=int(os.getenv("LONGFORM_CONCURRENCY", 4)),
+        outline_max_tokens=int(os.getenv("LONGFORM_OUTLINE_MAX_TOKENS", 200)),
+    )
@@ -0,0 +1,202 @@
+"""
+Meeting-to-content pipeline for the Content Creation Service.
+
+Long transcripts are summarized map-reduce style instead of in one prompt:
+transcription segments are streamed from the store in batches and packed into
+chunks that fit comfortably in a prompt, each chunk is summarized as soon as
+it is read with at most a fixed number of summaries in flight, and the
+partial summaries are then merged in groups, level by level, until few enough
+remain to write the final summary or report from. With a compressor, the
+transcript is first cut down to its most representative sentences.
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from transcripts import TranscriptCompressor
+
+logger = logging.getLogger(__name__)
+
+# Generates text for a prompt, given a completion budget in tokens
+CompleteFn = Callable[[str, int], Awaitable[str]]
+
+
+class TranscriptNotFoundError(LookupError):
+    """Raised when a meeting has no transcript to generate content from"""
+
+
+def format_timestamp(milliseconds: int) -> str:
+    seconds = milliseconds // 1000
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def format_segment(segment: Dict[str, Any]) -> str:
+    """Render a transcription segment as one transcript line"""
+    speaker = segment.get("speaker_id") or "Speaker"
+    timestamp = format_timestamp(segment.get("start_time_ms") or 0)
+    return f"[{timestamp}] {speaker}: {segment['text'].strip()}"
+
+
+async def chunk_transcript(
+    batches: AsyncIterator[List[Dict[str, Any]]], max_chars: int
+) -> AsyncIterator[str]:
+    """Pack streamed segments into transcript chunks of at most max_chars
+
+    Chunks break between segments; a single segment longer than max_chars
+    becomes a chunk of its own rather than being cut mid-sentence.
+    """
+    lines: List[str] = []
+    size = 0
+    async for batch in batches:
+        for segment in batch:
+            line = format_segment(segment)
+            if lines and size + len(line) + 1 > max_chars:
+                yield "\n".join(lines)
+                lines, size = [], 0
+            lines.append(line)
+            size += len(line) + 1
+    if lines:
+        yield "\n".join(lines)
+
+
+def build_chunk_prompt(chunk: str, number: int) -> str:
+    return (
+        f"Summarize part {number} of a meeting transcript. Keep decisions, "
+        "action items with their owners, open questions and key figures. "
+        "Be concise and do not invent details.\n\n"
+        f"Transcript:\n{chunk}"
+    )
+
+
+def build_merge_prompt(summaries: List[str]) -> str:
+    parts = "\n\n".join(
+        f"Part {number}:\n{summary}" for number, summary in enumerate(summaries, 1)
+    )
+    return (
+        "Merge these consecutive partial summaries of one meeting into a single "
+        "summary. Keep every decision, action item and open question, remove "
+        "repetition and keep the chronological order.\n\n"
+        f"{parts}"
+    )
+
+
+class MeetingSummarizer:
+    """Map-reduce summarization of a meeting transcript"""
+
+    def __init__(
+        self,
+        store: Any,
+        complete: CompleteFn,
+        chunk_chars: int = 12000,
+        max_concurrency: int = 4,
+        reduce_fanout: int = 8,
+        segment_batch_size: int = 500,
+        partial_max_tokens: int = 400,
+        compressor: Optional[TranscriptCompressor] = None,
+    ):
+        if reduce_fanout < 2:
+            raise ValueError("reduce_fanout must be at least 2")
+        self.store = store
+        self.complete = complete
+        self.chunk_chars = chunk_chars
+        self.max_concurrency = max_concurrency
+        self.reduce_fanout = reduce_fanout
+        self.segment_batch_size = segment_batch_size
+        self.partial_max_tokens = partial_max_tokens
+        self.compressor = compressor
+
+    async def summarize(self, meeting_id: str, client_id: str) -> List[str]:
+        """Return at most reduce_fanout partial summaries covering the meeting
+
+        A meeting of another client is treated as having no transcript.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        summaries = await self._map(meeting_id, client_id, semaphore)
+        if not summaries:
+            raise TranscriptNotFoundError(f"No transcript for meeting {meeting_id}")
+
+        level = 0
+        while len(summaries) > self.reduce_fanout:
+            level += 1
+            groups = [
+                summaries[start : start + self.reduce_fanout]
+                for start in range(0, len(summaries), self.reduce_fanout)
+            ]
+            summaries = list(
+                await asyncio.gather(
+                    *(self._merge(semaphore, group) for group in groups)
+                )
+            )
+            logger.info(
+                "Meeting %s reduce level %s: %s merged summaries",
+                meeting_id,
+                level,
+                len(groups),
+            )
+        return summaries
+
+    async def _map(
+        self, meeting_id: str, client_id: str, semaphore: asyncio.Semaphore
+    ) -> List[str]:
+        """Summarize chunks as they are read, with bounded parallelism"""
+        tasks: List["asyncio.Task[str]"] = []
+        batches = self.store.iter_transcript_segments(
+            meeting_id, client_id, self.segment_batch_size
+        )
+        if self.compressor is not None:
+            batches = self.compressor.compress(meeting_id, client_id, batches)
+        try:
+            async for chunk in chunk_transcript(batches, self.chunk_chars):
+                # Waiting for a free slot before reading on keeps at most
+                # max_concurrency chunks in memory
+                await semaphore.acquire()
+                tasks.append(
+                    asyncio.ensure_future(
+                        self._summarize_chunk(
+                            semaphore, build_chunk_prompt(chunk, len(tasks) + 1)
+                        )
+                    )
+                )
+            summaries = list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        logger.info("Meeting %s map: %s chunk summaries", meeting_id, len(summaries))
+        return summaries
+
+    async def _summarize_chunk(self, semaphore: asyncio.Semaphore, prompt: str) -> str:
+        try:
+            return await self.complete(prompt, self.partial_max_tokens)
+        finally:
+            semaphore.release()
+
+    async def _merge(self, semaphore: asyncio.Semaphore, group: List[str]) -> str:
+        if len(group) == 1:
+            return group[0]
+        async with semaphore:
+            return await self.complete(
+                build_merge_prompt(group), self.partial_max_tokens
+            )
+
+
+def create_meeting_summarizer(
+    store: Any,
+    complete: CompleteFn,
+    compressor: Optional[TranscriptCompressor] = None,
+) -> MeetingSummarizer:
+    """Create a summarizer configured through environment variables"""
+    return MeetingSummarizer(
+        store,
+        complete,
+        chunk_chars=int(os.getenv("MEETING_CHUNK_CHARS", 12000)),
+        max_concurrency=int(os.getenv("MEETING_SUMMARY_CONCURRENCY", 4)),
+        reduce_fanout=int(os.getenv("MEETING_REDUCE_FANOUT", 8)),
+        segment_batch_size=int(os.getenv("MEETING_SEGMENT_BATCH_SIZE", 500)),
+        partial_max_tokens=int(os.getenv("MEETING_PARTIAL_MAX_TOKENS", 400)),
+        compressor=compressor,
+    )
@@ -0,0 +1,47 @@
+"""
+Keyset pagination cursors for the Content Creation Service.
+
+A cursor encodes the (created_at, id) sort key of the last row on a page.
+The next page continues strictly after that key, which an index on
+(..., created_at DESC, id DESC) answers without scanning skipped rows the
+way a large OFFSET does.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+Keyset = Tuple[datetime, str]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Encode a row's sort key as an opaque cursor"""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Keyset:
+    """Decode a cursor back into the (created_at, id) sort key"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        key = datetime.fromisoformat(created_at), str(row_id)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {str(e)}")
+    if key[0].tzinfo is None:
+        raise InvalidCursorError("Invalid cursor: timestamp has no timezone")
+    return key
+
+
+def next_cursor(rows: list, limit: int) -> Optional[str]:
+    """Return the cursor after a page fetched with limit + 1 rows, if any"""
+    if len(rows) <= limit:
+        return None
+    last: Dict[str, Any] = rows[limit - 1]
+    return encode_cursor(last["created_at"], last["id"])
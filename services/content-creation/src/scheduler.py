@@ -0,0 +1,261 @@
+"""
+Admission control and fair scheduling of AI generation for the Content
+Creation Service.
+
+Each client draws from its own token bucket, so one tenant cannot flood the
+service. Generation itself runs under a global concurrency cap; when every
+slot is busy, waiting requests are ordered by weighted fair queuing (the
+self-clocked variant), so a client with a deep backlog is interleaved with
+everyone else instead of being served first-come-first-served.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+
+class AdmissionError(Exception):
+    """Base class for generation requests the scheduler turns away"""
+
+    # HTTP status a rejected request is answered with
+    status_code = 503
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class RateLimitedError(AdmissionError):
+    """Raised when a client has used up its request rate"""
+
+    status_code = 429
+
+
+class SchedulerFullError(AdmissionError):
+    """Raised when the generation queue is full or a request waited too long"""
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at rate tokens per second
+
+    A request costing more than the burst, such as a large batch, needs a
+    full bucket and empties it, so it is slowed down but never rejected
+    forever.
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "updated_at")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+
+    def wait(self, cost: float = 1.0) -> float:
+        """Seconds until cost tokens exist, or 0 when they do now"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        cost = min(cost, self.burst)
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+    def take(self, cost: float = 1.0) -> float:
+        """Take cost tokens, returning 0, or the seconds until they would exist"""
+        wait = self.wait(cost)
+        if wait == 0:
+            self.tokens -= min(cost, self.burst)
+        return wait
+
+
+class _Waiter:
+    __slots__ = ("client_id", "future")
+
+    def __init__(self, client_id: str, future: "asyncio.Future[None]"):
+        self.client_id = client_id
+        self.future = future
+
+
+class GenerationScheduler:
+    """Per-client rate limits, a global concurrency cap and weighted fair queuing"""
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        max_queue_size: int = 256,
+        rate_per_client: float = 5.0,
+        burst_per_client: float = 50.0,
+        queue_timeout: float = 30.0,
+        retry_after: float = 5.0,
+        weights: Optional[Dict[str, float]] = None,
+        max_clients: int = 10000,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.rate_per_client = rate_per_client
+        self.burst_per_client = burst_per_client
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.weights = weights or {}
+        self.max_clients = max_clients
+
+        self.running = 0
+        self.queued = 0
+        self.rate_limited = 0
+        self.rejected = 0
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._heap: List[Tuple[float, int, _Waiter]] = []
+        self._sequence = itertools.count()
+        self._virtual_time = 0.0
+        self._finish_tags: Dict[str, float] = {}
+        self._queued_by_client: Dict[str, int] = {}
+
+    def admit(self, client_id: str, cost: float = 1.0) -> None:
+        """Charge a client's bucket, rejecting early if it is empty or we are full"""
+        self.admit_many({client_id: cost})
+
+    def admit_many(self, costs: Dict[str, float]) -> None:
+        """Charge several clients' buckets for one request, all or none"""
+        if self.queued >= self.max_queue_size:
+            self.rejected += 1
+            raise SchedulerFullError("Generation queue is full", self.retry_after)
+
+        buckets = {client_id: self._bucket(client_id) for client_id in costs}
+        for client_id, cost in costs.items():
+            wait = buckets[client_id].wait(cost)
+            if wait > 0:
+                self.rate_limited += 1
+                raise RateLimitedError(
+                    f"Rate limit exceeded for client {client_id}", wait
+                )
+        for client_id, cost in costs.items():
+            buckets[client_id].take(cost)
+
+    def _bucket(self, client_id: str) -> TokenBucket:
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            bucket = TokenBucket(self.rate_per_client, self.burst_per_client)
+            self._buckets[client_id] = bucket
+            # Forgetting an idle client only hands it a full bucket again
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        self._buckets.move_to_end(client_id)
+        return bucket
+
+    @asynccontextmanager
+    async def slot(self, client_id: str, cost: float = 1.0) -> AsyncIterator[None]:
+        """Hold one of the global generation slots, queuing fairly for it"""
+        await self._acquire(client_id, cost)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, client_id: str, cost: float) -> None:
+        if self.running < self.max_concurrency and not self.queued:
+            self.running += 1
+            return
+
+        if self.queued >= self.max_queue_size:
+            self.rejected += 1
+            raise SchedulerFullError("Generation queue is full", self.retry_after)
+
+        # Virtual finish tag: the client's previous tag or the current virtual
+        # time, whichever is later, plus the request's weighted cost
+        weight = self.weights.get(client_id, 1.0)
+        start = max(self._virtual_time, self._finish_tags.get(client_id, 0.0))
+        finish = start + cost / weight
+        self._finish_tags[client_id] = finish
+
+        waiter = _Waiter(client_id, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._heap, (finish, next(self._sequence), waiter))
+        self.queued += 1
+        self._queued_by_client[client_id] = self._queued_by_client.get(client_id, 0) + 1
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.queue_timeout)
+        except BaseException as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was handed over just as we gave up: pass it on
+                self._release()
+            else:
+                waiter.future.cancel()
+                self.queued -= 1
+                # With nothing else queued, the abandoned request's tag would
+                # only hold back the client's next one
+                if not self._dequeued(client_id):
+                    self._finish_tags.pop(client_id, None)
+            if isinstance(e, asyncio.TimeoutError):
+                self.rejected += 1
+                raise SchedulerFullError(
+                    "Timed out waiting for generation capacity", self.retry_after
+                )
+            raise
+
+    def _release(self) -> None:
+        self.running -= 1
+        while self._heap and self.running < self.max_concurrency:
+            finish, _, waiter = heapq.heappop(self._heap)
+            if waiter.future.done():
+                continue  # Abandoned while queued
+            self._virtual_time = finish
+            if self._finish_tags.get(waiter.client_id) == finish:
+                del self._finish_tags[waiter.client_id]
+            self.queued -= 1
+            self._dequeued(waiter.client_id)
+            self.running += 1
+            waiter.future.set_result(None)
+
+    def _dequeued(self, client_id: str) -> int:
+        """Count a client's request as no longer queued, returning how many are"""
+        remaining = self._queued_by_client[client_id] - 1
+        if remaining:
+            self._queued_by_client[client_id] = remaining
+        else:
+            del self._queued_by_client[client_id]
+        return remaining
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "max_concurrency": self.max_concurrency,
+            "rate_limited": self.rate_limited,
+            "rejected": self.rejected,
+        }
+
+
+def parse_weights(value: str) -> Dict[str, float]:
+    """Parse client weights written as client_id=weight pairs, comma separated"""
+    weights: Dict[str, float] = {}
+    for pair in value.split(","):
+        if pair.strip():
+            client_id, _, weight = pair.partition("=")
+            weights[client_id.strip()] = float(weight)
+    return weights
+
+
+def create_generation_scheduler() -> GenerationScheduler:
+    """Create the generation scheduler configured through environment variables"""
+    return GenerationScheduler(
+        max_concurrency=int(os.getenv("GENERATION_MAX_CONCURRENCY", 32)),
+        max_queue_size=int(os.getenv("GENERATION_QUEUE_SIZE", 256)),
+        rate_per_client=float(os.getenv("GENERATION_RATE_PER_CLIENT", 5)),
+        burst_per_client=float(os.getenv("GENERATION_BURST_PER_CLIENT", 50)),
+        queue_timeout=float(os.getenv("GENERATION_QUEUE_TIMEOUT_SECONDS", 30)),
+        retry_after=float(os.getenv("GENERATION_RETRY_AFTER_SECONDS", 5)),
+        weights=parse_weights(os.getenv("GENERATION_CLIENT_WEIGHTS", "")),
+    )
@@ -0,0 +1,56 @@
+"""
+Coalescing of identical concurrent work for the Content Creation Service.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Run at most one call per key at a time, sharing its result with all callers
+
+    Calls are tracked only while in flight, so nothing is retained once the
+    shared call finishes. Each caller awaits the call through a shield, which
+    means cancelling one caller never cancels the call the others wait on;
+    the call itself is cancelled only when the last of its callers is, and is
+    forgotten at that moment, so later callers never join a dying call.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, "asyncio.Future[Any]"] = {}
+        self._waiters: Dict["asyncio.Future[Any]", int] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fn() for key, joining an identical call already in flight"""
+        call = self._calls.get(key)
+        if call is None or call.done():
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.add_done_callback(lambda done: self._forget(key, done))
+
+        self._waiters[call] = self._waiters.get(call, 0) + 1
+        try:
+            return await asyncio.shield(call)
+        finally:
+            self._waiters[call] -= 1
+            if not self._waiters[call]:
+                del self._waiters[call]
+                if not call.done():
+                    # Nobody is left to receive the result. Forget the call
+                    # now, so a caller arriving before it unwinds starts afresh
+                    self._drop(key, call)
+                    call.cancel()
+
+    def _drop(self, key: str, call: "asyncio.Future[Any]") -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def _forget(self, key: str, call: "asyncio.Future[Any]") -> None:
+        self._drop(key, call)
+
+        # Mark the outcome as retrieved even if every caller has gone away
+        if not call.cancelled():
+            call.exception()
@@ -0,0 +1,131 @@
+"""
+Template rendering for the Content Creation Service.
+
+Templates use ``{variable}`` placeholders (``{{`` and ``}}`` for literal
+braces). A template is parsed and validated against its declared variables
+once, and the compiled form is cached by template id and content hash so
+bulk mail-merge renders only pay for string joins.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from string import Formatter
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+
+class TemplateError(ValueError):
+    """Raised when a template is invalid or cannot be rendered"""
+
+
+class CompiledTemplate:
+    """Pre-parsed template that renders by joining literals and values"""
+
+    __slots__ = ("literals", "fields", "variables")
+
+    def __init__(self, literals: List[str], fields: List[Optional[str]]):
+        self.literals = literals
+        self.fields = fields
+        self.variables = frozenset(field for field in fields if field is not None)
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """Render the template with the given variable values"""
+        missing = self.variables.difference(values)
+        if missing:
+            raise TemplateError(
+                f"Missing template variables: {', '.join(sorted(missing))}"
+            )
+
+        parts: List[str] = []
+        for literal, field in zip(self.literals, self.fields):
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(values[field]))
+        return "".join(parts)
+
+
+def compile_template(
+    template_content: str, variables: Sequence[str]
+) -> CompiledTemplate:
+    """Parse a template and check its placeholders against declared variables"""
+    literals: List[str] = []
+    fields: List[Optional[str]] = []
+
+    try:
+        parsed = list(Formatter().parse(template_content))
+    except ValueError as e:
+        raise TemplateError(f"Invalid template syntax: {str(e)}")
+
+    for literal, field, format_spec, conversion in parsed:
+        if field is not None:
+            if not field.isidentifier() or format_spec or conversion:
+                raise TemplateError(f"Invalid template placeholder: {{{field}}}")
+        literals.append(literal)
+        fields.append(field)
+
+    undeclared = {field for field in fields if field is not None} - set(variables)
+    if undeclared:
+        raise TemplateError(
+            f"Undeclared template variables: {', '.join(sorted(undeclared))}"
+        )
+
+    return CompiledTemplate(literals, fields)
+
+
+class TemplateCache:
+    """LRU cache of compiled templates keyed on template id and content hash"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], CompiledTemplate]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key_for(
+        template_id: str, template_content: str, variables: Sequence[str]
+    ) -> Tuple[str, str]:
+        digest = hashlib.sha256(template_content.encode("utf-8"))
+        digest.update("\0".join(sorted(variables)).encode("utf-8"))
+        return template_id, digest.hexdigest()
+
+    def get_or_compile(
+        self, template_id: str, template_content: str, variables: Sequence[str]
+    ) -> CompiledTemplate:
+        """Return the compiled template, compiling it on first use"""
+        key = self.key_for(template_id, template_content, variables)
+        compiled = self._entries.get(key)
+        if compiled is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return compiled
+
+        self.misses += 1
+        compiled = compile_template(template_content, variables)
+        self.store(template_id, template_content, variables, compiled)
+        return compiled
+
+    def store(
+        self,
+        template_id: str,
+        template_content: str,
+        variables: Sequence[str],
+        compiled: CompiledTemplate,
+    ) -> None:
+        """Cache an already compiled template"""
+        key = self.key_for(template_id, template_content, variables)
+        self._entries[key] = compiled
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+
+def create_template_cache() -> TemplateCache:
+    """Create the template cache configured through environment variables"""
+    return TemplateCache(max_entries=int(os.getenv("TEMPLATE_CACHE_MAX_ENTRIES", 512)))
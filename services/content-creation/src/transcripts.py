@@ -0,0 +1,203 @@
+"""
+Extractive compression of meeting transcripts for the Content Creation Service.
+
+Before a transcript is summarized it is cut down to a token budget locally:
+sentences are scored by the cosine similarity of their TF-IDF vector to the
+transcript's centroid, the best ones are kept within the budget and put back
+in their original order. Scoring works on flat NumPy arrays of (sentence,
+term) pairs, so it stays linear in the transcript length and needs no
+network. Compressed transcripts are cached per meeting. NumPy is imported on
+the first compression rather than at startup.
+"""
+
+import asyncio
+import os
+import re
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+
+from cache import CacheBackend, create_cache_backend
+
+if TYPE_CHECKING:
+    import numpy as np
+
+TERM_PATTERN = re.compile(r"[a-z0-9][a-z0-9']*")
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+# Filler that carries no topic in spoken transcripts
+STOP_WORDS = frozenset(
+    """
+    a about all also am an and any are as at be because been but by can could
+    did do does doing don't for from get got had has have he her here him his
+    how i i'm if in into is it it's its just know like me my no not now of
+    oh ok okay on one or our out really right so some than that that's the
+    their them then there these they think this to too uh um up us was we
+    we're well were what when where which who will with would yeah yes you
+    you're your
+    """.split()
+)
+
+# Transcript fields kept in the compressed copy
+SEGMENT_FIELDS = ("segment_sequence", "start_time_ms", "end_time_ms", "speaker_id")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate LLM token count, at about four characters per token"""
+    return (len(text) + 3) // 4
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence for sentence in SENTENCE_BOUNDARY.split(text.strip()) if sentence]
+
+
+def score_sentences(sentences: List[str]) -> "np.ndarray":
+    """TF-IDF centroid similarity of each sentence, in [0, 1]"""
+    import numpy as np
+
+    count = len(sentences)
+    vocabulary: Dict[str, int] = {}
+    rows: List[int] = []
+    columns: List[int] = []
+    for index, sentence in enumerate(sentences):
+        for term in TERM_PATTERN.findall(sentence.lower()):
+            if term not in STOP_WORDS:
+                rows.append(index)
+                columns.append(vocabulary.setdefault(term, len(vocabulary)))
+    if not rows:
+        return np.zeros(count)
+
+    # Distinct (sentence, term) pairs with their counts: a sparse matrix
+    # as three parallel arrays
+    terms = len(vocabulary)
+    pairs, counts = np.unique(
+        np.array(rows, dtype=np.int64) * terms + np.array(columns, dtype=np.int64),
+        return_counts=True,
+    )
+    rows_array, columns_array = np.divmod(pairs, terms)
+
+    document_frequency = np.bincount(columns_array, minlength=terms)
+    idf = np.log((1 + count) / (1 + document_frequency)) + 1
+    weights = (1 + np.log(counts)) * idf[columns_array]
+
+    norms = np.sqrt(np.bincount(rows_array, weights * weights, minlength=count))
+    weights /= norms[rows_array]
+
+    centroid = np.bincount(columns_array, weights, minlength=terms) / count
+    centroid_norm = np.linalg.norm(centroid)
+    return (
+        np.bincount(rows_array, weights * centroid[columns_array], minlength=count)
+        / centroid_norm
+    )
+
+
+def compress_segments(
+    segments: List[Dict[str, Any]], token_budget: int
+) -> List[Dict[str, Any]]:
+    """Keep the most representative sentences of a transcript within a budget
+
+    Segments keep their order, timing and speaker; segments left without a
+    sentence are dropped. A transcript already within the budget is returned
+    as it is.
+    """
+    import numpy as np
+
+    owners: List[int] = []
+    sentences: List[str] = []
+    for index, segment in enumerate(segments):
+        for sentence in split_sentences(segment["text"]):
+            owners.append(index)
+            sentences.append(sentence)
+
+    costs = np.array([estimate_tokens(sentence) for sentence in sentences])
+    if costs.sum() <= token_budget:
+        return segments
+
+    # Best sentences first, as many as fit; ties keep transcript order
+    order = np.argsort(-score_sentences(sentences), kind="stable")
+    kept = order[np.cumsum(costs[order]) <= token_budget]
+    if not len(kept):
+        kept = order[:1]
+
+    texts: Dict[int, List[str]] = {}
+    for index in np.sort(kept):
+        texts.setdefault(owners[index], []).append(sentences[index])
+    return [
+        {
+            **{field: segments[index].get(field) for field in SEGMENT_FIELDS},
+            "text": " ".join(texts[index]),
+        }
+        for index in sorted(texts)
+    ]
+
+
+class TranscriptCompressor:
+    """Compresses meeting transcripts to a token budget, cached per meeting
+
+    Entries are keyed on the requesting client as well, so a hit never skips
+    the store's check that the meeting belongs to that client.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        token_budget: int = 6000,
+        ttl: Optional[float] = None,
+    ):
+        self.backend = backend
+        self.token_budget = token_budget
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, meeting_id: str, client_id: str) -> str:
+        return f"transcript:{client_id}:{meeting_id}:{self.token_budget}"
+
+    async def compress(
+        self,
+        meeting_id: str,
+        client_id: str,
+        batches: AsyncIterator[List[Dict[str, Any]]],
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the compressed transcript, reading batches only on a miss"""
+        key = self.key_for(meeting_id, client_id)
+        segments = await self.backend.get(key)
+        if segments is None:
+            self.misses += 1
+            transcript = [segment async for batch in batches for segment in batch]
+            if not transcript:
+                return
+            # Scoring is CPU-bound, so keep it off the event loop
+            segments = await asyncio.to_thread(
+                compress_segments, transcript, self.token_budget
+            )
+            await self.backend.set(key, segments, self.ttl)
+        else:
+            self.hits += 1
+        yield segments
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def create_transcript_compressor() -> Optional[TranscriptCompressor]:
+    """Create the compressor configured through environment variables
+
+    A token budget of 0 turns compression off.
+    """
+    token_budget = int(os.getenv("MEETING_TRANSCRIPT_TOKEN_BUDGET", 6000))
+    if token_budget <= 0:
+        return None
+
+    return TranscriptCompressor(
+        create_cache_backend(
+            os.getenv("MEETING_TRANSCRIPT_CACHE_BACKEND", "memory"),
+            max_entries=int(os.getenv("MEETING_TRANSCRIPT_CACHE_MAX_ENTRIES", 256)),
+            prefix="content-creation:transcripts:",
+        ),
+        token_budget=token_budget,
+        ttl=float(os.getenv("MEETING_TRANSCRIPT_CACHE_TTL_SECONDS", 3600)),
+    )